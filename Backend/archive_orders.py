@@ -0,0 +1,62 @@
+"""
+Order Archival Script
+Moves orders sent for delivery more than N days ago, with their responses,
+from fetched_orders / order_responses into the archive tables.
+
+Usage:
+    python archive_orders.py                          # ORDER_ARCHIVE_AFTER_DAYS, until done
+    python archive_orders.py --older-than-days 60 --batch-size 5000
+    python archive_orders.py --max-batches 10 --report archive.json
+
+Requires Docs/create_order_archive.sql. Set ORDER_ARCHIVE_ENABLED=true on the
+backend before archiving, so history and exports include archived orders.
+"""
+
+import argparse
+import json
+import sys
+
+from config import settings
+from utils.archive import archive_sent_orders
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move old sent orders to the archive tables")
+    parser.add_argument("--older-than-days", type=int, default=settings.ORDER_ARCHIVE_AFTER_DAYS,
+                        help=f"Archive orders sent more than this many days ago (default: {settings.ORDER_ARCHIVE_AFTER_DAYS})")
+    parser.add_argument("--batch-size", type=int, default=settings.ORDER_ARCHIVE_BATCH_SIZE,
+                        help=f"Orders moved per transaction (default: {settings.ORDER_ARCHIVE_BATCH_SIZE})")
+    parser.add_argument("--max-batches", type=int, default=None, help="Stop after this many batches")
+    parser.add_argument("--report", help="Write the archival report as JSON to this file")
+    args = parser.parse_args()
+
+    if not settings.ORDER_ARCHIVE_ENABLED:
+        print("⚠️  ORDER_ARCHIVE_ENABLED is false: archived orders will not appear in history until it is enabled")
+
+    try:
+        report = archive_sent_orders(
+            older_than_days=args.older_than_days,
+            batch_size=args.batch_size,
+            max_batches=args.max_batches
+        )
+    except Exception as e:
+        print(f"❌ Archival failed: {str(e)}")
+        sys.exit(1)
+
+    print("\n" + "="*60)
+    print("ORDER ARCHIVAL")
+    print("="*60)
+    print(f"Sent more than:   {report['older_than_days']} day(s) ago")
+    print(f"Archived orders:  {report['archived_orders']}")
+    print(f"Batches:          {report['batches']}")
+    print(f"Duration:         {report['duration_seconds']}s")
+    print("="*60 + "\n")
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Report written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Order Line Items Backfill Script
+Expands fetched_orders.items (hot and archive tiers) into order_line_items for
+orders stored before Docs/create_order_line_items.sql was applied. New orders
+get their line items from the ingestion trigger. Safe to re-run: existing
+line items are left alone.
+
+Usage:
+    python backfill_line_items.py
+    python backfill_line_items.py --batch-size 5000
+    python backfill_line_items.py --start-after <order_id>   # resume
+"""
+
+import argparse
+import sys
+import time
+
+from database import get_dbb
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill order_line_items from fetched_orders.items")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Orders per batch (default: 1000)")
+    parser.add_argument("--start-after", default=None, help="Resume after this order_id")
+    parser.add_argument("--max-batches", type=int, default=None, help="Stop after this many batches")
+    args = parser.parse_args()
+
+    dbb = get_dbb()
+    started = time.monotonic()
+    last_order_id = args.start_after
+    batches = orders = line_items = 0
+    done = False
+
+    while args.max_batches is None or batches < args.max_batches:
+        try:
+            result = dbb.rpc("backfill_order_line_items", {
+                "p_after_order_id": last_order_id,
+                "p_batch_size": args.batch_size
+            }).execute()
+        except Exception as e:
+            print(f"❌ Backfill failed after order_id {last_order_id}: {str(e)}")
+            print(f"   Resume with: python backfill_line_items.py --start-after {last_order_id}")
+            sys.exit(1)
+
+        batch = result.data or {}
+        batches += 1
+        orders += batch.get("orders", 0)
+        line_items += batch.get("line_items", 0)
+        last_order_id = batch.get("last_order_id") or last_order_id
+        print(f"📦 Batch {batches}: {orders} orders scanned, {line_items} line items written (last order_id {last_order_id})")
+
+        done = batch.get("done", True)
+        if done:
+            break
+
+    print("\n" + "="*60)
+    print("ORDER LINE ITEMS BACKFILL")
+    print("="*60)
+    print(f"Orders scanned:      {orders}")
+    print(f"Line items written:  {line_items}")
+    print(f"Batches:             {batches}")
+    print(f"Duration:            {round(time.monotonic() - started, 3)}s")
+    print("="*60 + "\n")
+    if done:
+        print("✅ Backfill complete")
+    else:
+        print(f"⏸️  Stopped early; resume with: python backfill_line_items.py --start-after {last_order_id}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -22,7 +23,76 @@ class Settings(BaseSettings):
     # Application Configuration
     BACKEND_PORT: int = int(os.getenv("BACKEND_PORT", "8000"))
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
-    
+
+    # Logging (json: one JSON object per line; text: human-readable)
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text" if os.getenv("ENVIRONMENT", "development") == "development" else "json")
+
+    # Database A Sync Worker (drains dba_sync_outbox)
+    DBA_SYNC_ENABLED: bool = os.getenv("DBA_SYNC_ENABLED", "true").lower() == "true"
+    DBA_SYNC_INTERVAL_SECONDS: float = float(os.getenv("DBA_SYNC_INTERVAL_SECONDS", "2"))
+    DBA_SYNC_BATCH_SIZE: int = int(os.getenv("DBA_SYNC_BATCH_SIZE", "200"))
+    DBA_SYNC_MAX_BACKOFF_SECONDS: int = int(os.getenv("DBA_SYNC_MAX_BACKOFF_SECONDS", "300"))
+
+    # DBB/DBA Status Reconciliation (0 disables the scheduled job; run it on one worker only)
+    RECONCILE_INTERVAL_MINUTES: int = int(os.getenv("RECONCILE_INTERVAL_MINUTES", "0"))
+    RECONCILE_CHUNK_SIZE: int = int(os.getenv("RECONCILE_CHUNK_SIZE", "500"))
+
+    # Order archival (Docs/create_order_archive.sql). ENABLED makes history, exports and
+    # earnings read across hot and archive tiers; keep it on once anything was archived.
+    # INTERVAL 0 disables the scheduled job (python archive_orders.py still works); run it on one worker only.
+    ORDER_ARCHIVE_ENABLED: bool = os.getenv("ORDER_ARCHIVE_ENABLED", "false").lower() == "true"
+    ORDER_ARCHIVE_INTERVAL_MINUTES: int = int(os.getenv("ORDER_ARCHIVE_INTERVAL_MINUTES", "0"))
+    ORDER_ARCHIVE_AFTER_DAYS: int = int(os.getenv("ORDER_ARCHIVE_AFTER_DAYS", "30"))
+    ORDER_ARCHIVE_BATCH_SIZE: int = int(os.getenv("ORDER_ARCHIVE_BATCH_SIZE", "1000"))
+    ORDER_ARCHIVE_MAX_BATCHES: int = int(os.getenv("ORDER_ARCHIVE_MAX_BATCHES", "0"))  # 0 = until done
+
+    # Restaurant Catalog (Database A restaurants cached for admin UID assignment)
+    RESTAURANT_CATALOG_TTL_SECONDS: int = int(os.getenv("RESTAURANT_CATALOG_TTL_SECONDS", "300"))
+    # After a failed load, requests skip Database A for this long (serving the last snapshot)
+    RESTAURANT_CATALOG_RETRY_SECONDS: int = int(os.getenv("RESTAURANT_CATALOG_RETRY_SECONDS", "30"))
+
+    # Admin Dashboard Stats ("today" starts at local midnight in STATS_TIMEZONE)
+    ADMIN_STATS_CACHE_SECONDS: int = int(os.getenv("ADMIN_STATS_CACHE_SECONDS", "5"))
+    STATS_TIMEZONE: str = os.getenv("STATS_TIMEZONE", "Asia/Kolkata")
+
+    # Metrics (Prometheus text format on GET /metrics)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+    # Per-request DB accounting (X-DB-* headers outside production); warn when
+    # one query shape repeats this many times in a request (likely N+1)
+    DB_N_PLUS_ONE_THRESHOLD: int = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", "20"))
+
+    # Readiness probes (GET /ready); a failing critical dependency returns 503
+    READY_PROBE_TIMEOUT_SECONDS: float = float(os.getenv("READY_PROBE_TIMEOUT_SECONDS", "1.5"))
+    READY_CACHE_SECONDS: float = float(os.getenv("READY_CACHE_SECONDS", "5"))
+    READY_CRITICAL_DEPENDENCIES: str = os.getenv("READY_CRITICAL_DEPENDENCIES", "dbb,dba")
+
+    # Slow-query log (queries slower than the threshold are logged and buffered for GET /api/admin/slow-queries)
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+    SLOW_QUERY_BUFFER_SIZE: int = int(os.getenv("SLOW_QUERY_BUFFER_SIZE", "1000"))
+
+    # Opt-in request profiling (send X-Profile: <admin access token>)
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "true").lower() == "true"
+    PROFILE_SAMPLE_INTERVAL_MS: float = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "1"))
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "restaurant-api-profiles"))
+    PROFILE_MAX_STORED: int = int(os.getenv("PROFILE_MAX_STORED", "50"))
+
+    # Response compression (brotli if the package is installed, else gzip); levels favour CPU over ratio
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "5"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+    # Item analytics (rollups cached per owner while their rollup version is unchanged; TTL bounds memory)
+    ITEM_ANALYTICS_CACHE_SECONDS: int = int(os.getenv("ITEM_ANALYTICS_CACHE_SECONDS", "600"))
+    ITEM_ANALYTICS_MAX_DAYS: int = int(os.getenv("ITEM_ANALYTICS_MAX_DAYS", "90"))
+    ITEM_ANALYTICS_FORECAST_WEEKS: int = int(os.getenv("ITEM_ANALYTICS_FORECAST_WEEKS", "4"))
+    ITEM_ANALYTICS_FORECAST_HOURS: int = int(os.getenv("ITEM_ANALYTICS_FORECAST_HOURS", "3"))
+
+    # Order/transaction exports (rows per keyset page; bounds memory per download)
+    EXPORT_PAGE_SIZE: int = int(os.getenv("EXPORT_PAGE_SIZE", "500"))
+
     # CORS Configuration
     CORS_ORIGINS: str = os.getenv("CORS_ORIGINS", "http://localhost:5173,http://localhost:3000,https://3c4b0b7b5988.ngrok-free.app")
     
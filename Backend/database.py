@@ -1,17 +1,21 @@
-from supabase import create_client, Client
+from supabase import create_client
 from config import settings
+from utils.db_instrumentation import InstrumentedClient
+
+# Clients are wrapped so every query is timed and reported to the query
+# observers (metrics, request accounting, slow-query log)
 
 # Database B (Backend Management) - Full Access
-supabase_dbb: Client = create_client(
+supabase_dbb = InstrumentedClient(create_client(
     settings.SUPABASE_URL_DBB,
     settings.SUPABASE_SERVICE_KEY_DBB
-)
+), "dbb")
 
 # Database A (Production Orders) - Read Only
-supabase_dba: Client = create_client(
+supabase_dba = InstrumentedClient(create_client(
     settings.SUPABASE_URL_DBA,
     settings.SUPABASE_SERVICE_KEY_DBA
-)
+), "dba")
 
 def get_dbb():
     """Get Database B client (Backend Management - Full Access)"""
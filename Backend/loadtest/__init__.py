@@ -0,0 +1 @@
+"""Offline load-test harness (run with `python -m loadtest.run`)."""
@@ -0,0 +1,365 @@
+"""
+Micro-benchmarks for owner order shaping and response serialization.
+
+Times the CPU-only stages behind the heaviest owner endpoints at several
+payload sizes, with no database or HTTP in the loop:
+
+    aggregate   cumulative item totals for fetch-orders
+    shape       building the payload (utils/order_shaping.py)
+    render      encoding the body with the route's response class
+    total       shape + render, i.e. the cost of one response
+
+Each endpoint also has validated.* variants timing the Pydantic model +
+response_model validation + JSONResponse path, so the fast path's gain is
+visible side by side.
+
+Results can be saved as a baseline and later checked against it. The whole
+suite runs --repeat times; in each repeat every benchmark's fastest round is
+divided by its baseline, and the ratios are normalised by that repeat's
+median ratio, so a faster or busier machine shifts every benchmark together
+and cancels out. A benchmark fails the run (exit code 1) only when it is
+slower than baseline * (1 + tolerance) in every repeat, so one noisy round
+cannot fail CI but a real regression in a few stages still does. A slowdown
+that hits every benchmark equally looks like a slower machine and is not
+flagged.
+
+Usage (from Backend/):
+    python -m loadtest.bench                              # print results
+    python -m loadtest.bench --check                      # compare with loadtest/bench_baseline.json
+    python -m loadtest.bench --save-baseline              # re-record the baseline (best of --repeat runs)
+    python -m loadtest.bench --sizes 50,200 --only fetch-orders
+
+tests/test_bench.py runs a reduced check (the .total benchmarks at 200
+orders) with the pytest suite.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Tuple
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "bench_baseline.json")
+
+
+def make_order_rows(size: int, items_per_order: int, seed: int = 7) -> Tuple[List[Dict], Dict[str, str]]:
+    """fetched_orders rows as PostgREST returns them, plus an order_id -> decision map"""
+    from loadtest.scenarios import MENU
+
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    rows, responses = [], {}
+    for _ in range(size):
+        items = []
+        for name, price in rng.sample(MENU, min(items_per_order, len(MENU))):
+            quantity = rng.randint(1, 3)
+            items.append({
+                "menu_item_id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "name": name,
+                "quantity": quantity,
+                "unit_price": price,
+                "subtotal": price * quantity,
+            })
+        subtotal = sum(item["subtotal"] for item in items)
+        fetched_at = now - timedelta(minutes=rng.uniform(0, 9))
+        order_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        rows.append({
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "order_id": order_id,
+            "customer_name": f"Customer {rng.randint(1, 9999)}",
+            "customer_phone": f"9{rng.randint(100000000, 999999999)}",
+            "items": items,
+            "subtotal": subtotal,
+            "total_amount": subtotal + 3000,
+            "payment_status": "paid",
+            "order_status": "pending",
+            "created_at": (fetched_at - timedelta(minutes=5)).isoformat(),
+            "fetched_at": fetched_at.isoformat(),
+        })
+        if rng.random() < 0.5:
+            responses[order_id] = rng.choice(("accepted", "rejected"))
+    return rows, responses
+
+
+def _route(path: str):
+    from routes.owner import router
+
+    for route in router.routes:
+        if route.path == path:
+            return route
+    raise LookupError(path)
+
+
+def _renderer(route) -> Callable:
+    """The response class FastAPI encodes the body with (resolving the app default)"""
+    from fastapi.datastructures import DefaultPlaceholder
+
+    response_class = route.response_class
+    if isinstance(response_class, DefaultPlaceholder):
+        response_class = response_class.value
+    return lambda content: response_class(content).body
+
+
+def _serializer(route, loop: asyncio.AbstractEventLoop) -> Callable:
+    """The response_model pass FastAPI runs on whatever an endpoint returns"""
+    from fastapi.routing import serialize_response
+
+    field = route.secure_cloned_response_field
+
+    def serialize(content):
+        return loop.run_until_complete(serialize_response(field=field, response_content=content))
+    return serialize
+
+
+def _validated_pipeline(route, loop: asyncio.AbstractEventLoop) -> Tuple[Callable, Callable]:
+    """
+    (serialize, render) for the pre-fast-path route: Pydantic models returned
+    to FastAPI, validated against response_model and encoded by JSONResponse.
+    Kept as the reference the fast path is measured against.
+    """
+    from fastapi.responses import JSONResponse
+
+    return _serializer(route, loop), lambda content: JSONResponse(content).body
+
+
+def build_benchmarks(size: int, items_per_order: int, loop: asyncio.AbstractEventLoop) -> Dict[str, Callable]:
+    """
+    name -> zero-argument callable for one payload size.
+
+    <endpoint>.* is what the route does today (trusted dict payload rendered
+    by the route's response class); <endpoint>.validated.* is the model +
+    response_model + JSONResponse path it replaced.
+    """
+    from models.schemas import EarningsTransactionsResponse, PendingEarnings
+    from utils.order_shaping import (
+        aggregate_cumulative_items,
+        build_order_transaction,
+        fetch_orders_payload,
+        order_transaction_payload,
+        shape_fetch_orders,
+        shape_history_order,
+    )
+
+    rows, responses = make_order_rows(size, items_per_order)
+    history_responses = {
+        order_id: {"overall_status": decision, "responded_at": datetime.now(timezone.utc).isoformat()}
+        for order_id, decision in responses.items()
+    }
+    restaurant_id = str(uuid.uuid4())
+
+    benchmarks: Dict[str, Callable] = {}
+
+    def add(endpoint: str, route, shape: Callable, validated_shape: Callable) -> None:
+        render = _renderer(route)
+        serialize, validated_render = _validated_pipeline(route, loop)
+        payload = shape()
+        validated = validated_shape()
+        validated_content = serialize(validated)
+        benchmarks[f"{endpoint}.shape"] = shape
+        benchmarks[f"{endpoint}.render"] = lambda: render(payload)
+        benchmarks[f"{endpoint}.total"] = lambda: render(shape())
+        benchmarks[f"{endpoint}.validated.shape"] = validated_shape
+        benchmarks[f"{endpoint}.validated.serialize"] = lambda: serialize(validated)
+        benchmarks[f"{endpoint}.validated.render"] = lambda: validated_render(validated_content)
+        benchmarks[f"{endpoint}.validated.total"] = lambda: validated_render(serialize(validated_shape()))
+
+    # POST /api/owner/fetch-orders
+    benchmarks["fetch-orders.aggregate"] = lambda: aggregate_cumulative_items(rows)
+    add(
+        "fetch-orders",
+        _route("/api/owner/fetch-orders"),
+        lambda: fetch_orders_payload(rows, responses),
+        lambda: shape_fetch_orders(rows, responses),
+    )
+
+    # GET /api/owner/order-history (no response_model: the validated path is jsonable_encoder)
+    def history_shape():
+        orders = [shape_history_order(order, history_responses.get(order["order_id"])) for order in rows]
+        return {"orders": orders, "total_count": len(orders)}
+
+    add("order-history", _route("/api/owner/order-history"), history_shape, history_shape)
+
+    # GET /api/owner/earnings-transactions
+    def earnings_payload():
+        transactions = [order_transaction_payload(order, restaurant_id, 0.2) for order in rows]
+        return {
+            "transactions": transactions,
+            "total_count": len(transactions),
+            "pending_earnings": {"pending_amount": 0.0, "pending_orders": len(transactions)},
+        }
+
+    def earnings_models():
+        transactions = [build_order_transaction(order, restaurant_id, 0.2) for order in rows]
+        return EarningsTransactionsResponse(
+            transactions=transactions,
+            total_count=len(transactions),
+            pending_earnings=PendingEarnings(pending_amount=0.0, pending_orders=len(transactions)),
+        )
+
+    add("earnings-transactions", _route("/api/owner/earnings-transactions"), earnings_payload, earnings_models)
+
+    return benchmarks
+
+
+def measure(fn: Callable, rounds: int, min_round_seconds: float) -> Dict:
+    """pytest-benchmark style: calibrate iterations per round, report per-call stats in microseconds"""
+    fn()  # warm up
+    iterations = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_round_seconds:
+            break
+        iterations *= 2 if elapsed == 0 else max(2, min(int(min_round_seconds / elapsed) + 1, 10))
+
+    per_call = []
+    for _ in range(rounds):
+        gc.collect()
+        started = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        per_call.append((time.perf_counter() - started) / iterations * 1e6)
+    return {
+        "min_us": round(min(per_call), 2),
+        "median_us": round(statistics.median(per_call), 2),
+        "max_us": round(max(per_call), 2),
+        "iterations": iterations,
+        "rounds": rounds,
+    }
+
+
+def run(sizes: List[int], items_per_order: int, only: List[str], rounds: int, min_round_seconds: float) -> Dict[str, Dict]:
+    loop = asyncio.new_event_loop()
+    results: Dict[str, Dict] = {}
+    try:
+        for size in sizes:
+            for name, fn in build_benchmarks(size, items_per_order, loop).items():
+                if only and not any(name.startswith(prefix) for prefix in only):
+                    continue
+                results[f"{name}[{size}]"] = measure(fn, rounds, min_round_seconds)
+    finally:
+        loop.close()
+    return results
+
+
+def best_of(repeats: List[Dict[str, Dict]]) -> Dict[str, Dict]:
+    """Per benchmark, the repeat with the fastest round"""
+    return {
+        name: min((results[name] for results in repeats), key=lambda result: result["min_us"])
+        for name in repeats[0]
+    }
+
+
+def normalized_ratios(results: Dict[str, Dict], baseline: Dict[str, Dict]) -> Dict[str, float]:
+    """
+    min_us / baseline min_us per benchmark, divided by the median of those
+    ratios (this run's machine speed relative to the baseline run)
+    """
+    ratios = {
+        name: result["min_us"] / baseline[name]["min_us"]
+        for name, result in results.items() if name in baseline
+    }
+    if not ratios:
+        return {}
+    speed = statistics.median(ratios.values())
+    return {name: ratio / speed for name, ratio in ratios.items()}
+
+
+def compare(repeats: List[Dict[str, Dict]], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """
+    Regression messages for benchmarks slower than baseline * (1 + tolerance)
+    (after machine-speed normalisation) in every repeat.
+    """
+    per_repeat = [normalized_ratios(results, baseline) for results in repeats]
+    regressions = []
+    for name in per_repeat[0]:
+        ratios = [ratios[name] for ratios in per_repeat]
+        if min(ratios) > 1 + tolerance:
+            regressions.append(
+                f"{name}: +{min(ratios) - 1:.0%} to +{max(ratios) - 1:.0%} vs baseline "
+                f"in all {len(ratios)} repeat(s)"
+            )
+    return regressions
+
+
+def _print_table(repeats: List[Dict[str, Dict]], baseline: Dict[str, Dict]) -> None:
+    results = best_of(repeats)
+    per_repeat = [normalized_ratios(run_results, baseline) for run_results in repeats]
+    print(f"{'benchmark':<48} {'min':>12} {'median':>12} {'vs baseline (per repeat)':>28}")
+    for name, result in results.items():
+        deltas = " ".join(f"{ratios[name] - 1:+.0%}" for ratios in per_repeat if name in ratios) or "-"
+        print(f"{name:<48} {result['min_us']:>10.1f}µs {result['median_us']:>10.1f}µs {deltas:>28}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for owner order shaping and serialization")
+    parser.add_argument("--sizes", default="10,200,1000", help="Comma-separated orders per payload")
+    parser.add_argument("--items-per-order", type=int, default=5)
+    parser.add_argument("--only", default="", help="Comma-separated benchmark name prefixes, e.g. fetch-orders")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3, help="Run the suite this many times; --check fails only on regressions seen in every run")
+    parser.add_argument("--min-round-ms", type=float, default=50.0, help="Calibrate iterations so a round takes at least this long")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--check", action="store_true", help="Exit 1 if any benchmark regressed past --tolerance")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed normalised slowdown vs baseline (0.5 = 50%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="Write these results as the new baseline")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    from loadtest.run import bootstrap_env
+    bootstrap_env()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    only = [prefix for prefix in args.only.split(",") if prefix]
+    repeats = [
+        run(sizes, args.items_per_order, only, args.rounds, args.min_round_ms / 1000)
+        for _ in range(max(args.repeat, 1))
+    ]
+    results = best_of(repeats)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["benchmarks"]
+
+    if args.json:
+        print(json.dumps({"benchmarks": results, "repeats": repeats}, indent=2))
+    else:
+        _print_table(repeats, baseline)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "items_per_order": args.items_per_order,
+                "repeat": len(repeats),
+                "benchmarks": results,
+            }, f, indent=2)
+            f.write("\n")
+        print(f"✅ Baseline written to {args.baseline}")
+
+    if args.check:
+        if not baseline:
+            print(f"❌ No baseline at {args.baseline}; run with --save-baseline first")
+            sys.exit(1)
+        regressions = compare(repeats, baseline, args.tolerance)
+        if regressions:
+            print(f"❌ {len(regressions)} benchmark(s) regressed more than {args.tolerance:.0%} in every repeat:")
+            for message in regressions:
+                print(f"   {message}")
+            sys.exit(1)
+        print(f"✅ No regressions beyond {args.tolerance:.0%} of baseline")
+
+
+if __name__ == "__main__":
+    main()
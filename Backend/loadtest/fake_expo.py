@@ -0,0 +1,61 @@
+"""
+Local stand-in for the Expo push API.
+
+Runs a threaded HTTP server on 127.0.0.1 that accepts push/send requests,
+waits a configurable latency and answers with one "ok" ticket per message,
+so notification fan-out is exercised over a real socket.
+"""
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeExpoServer:
+    def __init__(self, latency_ms: float = 50.0):
+        self.latency = latency_ms / 1000
+        self.requests = 0
+        self.messages = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-expo", daemon=True)
+
+    @property
+    def push_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/--/api/v2/push/send"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"[]")
+                messages = payload if isinstance(payload, list) else [payload]
+                with server._lock:
+                    server.requests += 1
+                    server.messages += len(messages)
+                if server.latency:
+                    time.sleep(server.latency)
+                body = json.dumps({"data": [{"status": "ok", "id": str(uuid.uuid4())} for _ in messages]}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "FakeExpoServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,502 @@
+"""
+In-memory stand-in for the supabase-py sync client.
+
+Implements the subset of the PostgREST query builder the app uses
+(select/insert/upsert/update/delete, the usual filters, `or_` logic trees,
+order/limit/range, exact counts) plus the Database B RPC functions, so
+`main:app` can run with no network. An optional per-query latency
+simulates the round trip to Supabase; like the real sync client it blocks
+the calling thread.
+"""
+import copy
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from postgrest.exceptions import APIError
+
+# Columns with a hash index (equality and in_ filters use it)
+INDEXED_COLUMNS = ("id", "order_id", "restaurant_owner_id", "email", "restaurant_uid", "restaurant_phone")
+
+# Unique keys used to resolve upserts / reject duplicate inserts
+UNIQUE_KEYS = {
+    "fetched_orders": ("order_id",),
+    "order_responses": ("order_id",),
+    "restaurant_owners": ("email",),
+    "admin_users": ("email",),
+}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+# Column defaults applied on insert
+DEFAULTS: Dict[str, Dict[str, Callable[[], Any]]] = {
+    "fetched_orders": {"fetched_at": _now, "sent_for_delivery": lambda: False},
+    "order_responses": {"responded_at": _now, "synced_to_dba": lambda: False},
+    "restaurant_owners": {"created_at": _now, "approval_status": lambda: "pending"},
+    "dba_sync_outbox": {"created_at": _now, "attempts": lambda: 0, "next_attempt_at": _now, "synced_at": lambda: None},
+}
+
+
+def _text(value: Any) -> str:
+    """Compare values the way they travel over PostgREST (as text)"""
+    if isinstance(value, bool):
+        return str(value).lower()
+    return "" if value is None else str(value)
+
+
+class FakeResponse:
+    def __init__(self, data: Any, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+class _Table:
+    """Rows of one table plus hash indexes on INDEXED_COLUMNS"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.rows: List[Dict] = []
+        self.indexes: Dict[str, Dict[str, List[Dict]]] = {column: {} for column in INDEXED_COLUMNS}
+        self.sequence = 0
+
+    def add(self, row: Dict) -> None:
+        self.rows.append(row)
+        for column, index in self.indexes.items():
+            if column in row:
+                index.setdefault(_text(row[column]), []).append(row)
+
+    def reindex(self) -> None:
+        self.indexes = {column: {} for column in INDEXED_COLUMNS}
+        rows, self.rows = self.rows, []
+        for row in rows:
+            self.add(row)
+
+    def candidates(self, filters: List[tuple]) -> List[Dict]:
+        """Narrow the scan with the first indexed eq/in filter"""
+        for kind, column, value in filters:
+            if column in self.indexes and kind == "eq":
+                return self.indexes[column].get(_text(value), [])
+            if column in self.indexes and kind == "in":
+                rows = []
+                for item in value:
+                    rows.extend(self.indexes[column].get(_text(item), []))
+                return rows
+        return self.rows
+
+
+def _split_logic(expr: str) -> List[str]:
+    parts, depth, current, quoted = [], 0, "", False
+    for char in expr:
+        if char == "," and depth == 0 and not quoted:
+            parts.append(current)
+            current = ""
+            continue
+        if char == '"':
+            quoted = not quoted
+        elif not quoted:
+            depth += {"(": 1, ")": -1}.get(char, 0)
+        current += char
+    if current:
+        parts.append(current)
+    return parts
+
+
+def _like(pattern: str) -> re.Pattern:
+    return re.compile("^" + re.escape(pattern).replace("%", ".*").replace(r"\*", ".*") + "$", re.I)
+
+
+def _matcher(kind: str, column: str, value: Any) -> Callable[[Dict], bool]:
+    if kind == "eq":
+        return lambda row: _text(row.get(column)) == _text(value)
+    if kind == "neq":
+        return lambda row: _text(row.get(column)) != _text(value)
+    if kind == "in":
+        values = {_text(item) for item in value}
+        return lambda row: _text(row.get(column)) in values
+    if kind in ("gt", "gte", "lt", "lte"):
+        compare = {
+            "gt": lambda a, b: a > b, "gte": lambda a, b: a >= b,
+            "lt": lambda a, b: a < b, "lte": lambda a, b: a <= b,
+        }[kind]
+        return lambda row: row.get(column) is not None and compare(_text(row.get(column)), _text(value))
+    if kind == "is":
+        if value in (None, "null"):
+            return lambda row: row.get(column) is None
+        return lambda row: row.get(column) is (value in (True, "true"))
+    if kind in ("like", "ilike"):
+        pattern = _like(str(value))
+        return lambda row: row.get(column) is not None and bool(pattern.match(str(row.get(column))))
+    raise ValueError(f"Unsupported filter: {kind}")
+
+
+def _parse_logic(part: str) -> Callable[[Dict], bool]:
+    if part.startswith("and(") or part.startswith("or("):
+        combine = all if part.startswith("and(") else any
+        inner = [_parse_logic(p) for p in _split_logic(part[part.index("(") + 1:-1])]
+        return lambda row: combine(f(row) for f in inner)
+    column, kind, value = part.split(".", 2)
+    value = value.strip('"')
+    if kind == "in":
+        return _matcher("in", column, [v.strip('"') for v in value.strip("()").split(",")])
+    return _matcher(kind, column, value)
+
+
+class FakeQuery:
+    def __init__(self, client: "FakeSupabaseClient", table: str):
+        self._client = client
+        self._table = table
+        self._operation = "select"
+        self._filters: List[tuple] = []
+        self._predicates: List[Callable[[Dict], bool]] = []
+        self._orders: List[tuple] = []
+        self._limit: Optional[int] = None
+        self._offset = 0
+        self._columns = "*"
+        self._count = None
+        self._payload: Any = None
+        self._on_conflict = ""
+        self._ignore_duplicates = False
+        self._negate_next = False
+
+    # Operations
+    def select(self, *columns, count=None, head=None):
+        self._operation = "select"
+        self._columns = ",".join(columns) or "*"
+        self._count = count
+        return self
+
+    def insert(self, payload, **kwargs):
+        self._operation, self._payload = "insert", payload
+        return self
+
+    def upsert(self, payload, on_conflict: str = "", ignore_duplicates: bool = False, **kwargs):
+        self._operation, self._payload = "upsert", payload
+        self._on_conflict, self._ignore_duplicates = on_conflict, ignore_duplicates
+        return self
+
+    def update(self, payload, **kwargs):
+        self._operation, self._payload = "update", payload
+        return self
+
+    def delete(self, **kwargs):
+        self._operation = "delete"
+        return self
+
+    # Filters
+    def _filter(self, kind: str, column: str, value: Any):
+        matcher = _matcher(kind, column, value)
+        if self._negate_next:
+            self._negate_next = False
+            self._predicates.append(lambda row: not matcher(row))
+        else:
+            self._filters.append((kind, column, value))
+            self._predicates.append(matcher)
+        return self
+
+    def eq(self, column, value): return self._filter("eq", column, value)
+    def neq(self, column, value): return self._filter("neq", column, value)
+    def gt(self, column, value): return self._filter("gt", column, value)
+    def gte(self, column, value): return self._filter("gte", column, value)
+    def lt(self, column, value): return self._filter("lt", column, value)
+    def lte(self, column, value): return self._filter("lte", column, value)
+    def in_(self, column, values): return self._filter("in", column, list(values))
+    def is_(self, column, value): return self._filter("is", column, value)
+    def like(self, column, pattern): return self._filter("like", column, pattern)
+    def ilike(self, column, pattern): return self._filter("ilike", column, pattern)
+
+    @property
+    def not_(self):
+        self._negate_next = True
+        return self
+
+    def or_(self, expr: str, reference_table=None):
+        predicates = [_parse_logic(part) for part in _split_logic(expr)]
+        self._predicates.append(lambda row: any(p(row) for p in predicates))
+        return self
+
+    # Modifiers
+    def order(self, column: str, desc: bool = False, nullsfirst: bool = False, foreign_table=None):
+        self._orders.append((column, desc))
+        return self
+
+    def limit(self, size: int, foreign_table=None):
+        self._limit = size
+        return self
+
+    def range(self, start: int, end: int, foreign_table=None):
+        self._offset, self._limit = start, end - start + 1
+        return self
+
+    def execute(self) -> FakeResponse:
+        self._client.simulate_latency()
+        with self._client.lock:
+            return getattr(self, f"_execute_{self._operation}")(self._client.table_data(self._table))
+
+    def _matching(self, table: _Table) -> List[Dict]:
+        return [row for row in table.candidates(self._filters) if all(p(row) for p in self._predicates)]
+
+    def _execute_select(self, table: _Table) -> FakeResponse:
+        rows = self._matching(table)
+        for column, desc in reversed(self._orders):
+            rows.sort(key=lambda row: (row.get(column) is None, _text(row.get(column))), reverse=desc)
+        total = len(rows)
+        rows = rows[self._offset:]
+        if self._limit is not None:
+            rows = rows[:self._limit]
+        columns = [c.strip() for c in self._columns.split(",") if c.strip()]
+        if "*" in columns:
+            data = copy.deepcopy(rows)
+        else:
+            data = [{column: copy.deepcopy(row.get(column)) for column in columns} for row in rows]
+        return FakeResponse(data, total if self._count else None)
+
+    def _execute_insert(self, table: _Table) -> FakeResponse:
+        return self._write(table, upsert=False)
+
+    def _execute_upsert(self, table: _Table) -> FakeResponse:
+        return self._write(table, upsert=True)
+
+    def _write(self, table: _Table, upsert: bool) -> FakeResponse:
+        payload = self._payload if isinstance(self._payload, list) else [self._payload]
+        keys = [k for k in [self._on_conflict] + list(UNIQUE_KEYS.get(table.name, ())) if k]
+        written, reindex = [], False
+        for item in payload:
+            row = dict(item)
+            existing = None
+            for key in keys:
+                if key in row:
+                    matches = table.candidates([("eq", key, row[key])]) if key in INDEXED_COLUMNS else table.rows
+                    existing = next((r for r in matches if _text(r.get(key)) == _text(row[key])), None)
+                if existing is not None:
+                    break
+            if existing is not None:
+                if not upsert:
+                    raise APIError({"code": "23505", "message": f"duplicate key value violates unique constraint on {table.name}"})
+                if not self._ignore_duplicates:
+                    existing.update(row)
+                    reindex = True
+                    written.append(copy.deepcopy(existing))
+                continue
+            for column, default in DEFAULTS.get(table.name, {}).items():
+                row.setdefault(column, default())
+            if "id" not in row:
+                table.sequence += 1
+                row["id"] = table.sequence if table.name == "dba_sync_outbox" else str(uuid.uuid4())
+            table.add(row)
+            written.append(copy.deepcopy(row))
+        if reindex:
+            table.reindex()
+        return FakeResponse(written)
+
+    def _execute_update(self, table: _Table) -> FakeResponse:
+        rows = self._matching(table)
+        for row in rows:
+            row.update(self._payload)
+        if any(column in INDEXED_COLUMNS for column in self._payload):
+            table.reindex()
+        return FakeResponse(copy.deepcopy(rows))
+
+    def _execute_delete(self, table: _Table) -> FakeResponse:
+        deleted = self._matching(table)
+        deleted_ids = {id(row) for row in deleted}
+        table.rows = [row for row in table.rows if id(row) not in deleted_ids]
+        table.reindex()
+        return FakeResponse(copy.deepcopy(deleted))
+
+
+class _FakeRpc:
+    def __init__(self, client: "FakeSupabaseClient", fn: str, params: Dict):
+        self._client, self._fn, self._params = client, fn, params
+
+    def execute(self) -> FakeResponse:
+        self._client.simulate_latency()
+        function = self._client.rpcs.get(self._fn)
+        if function is None:
+            raise APIError({"code": "PGRST202", "message": f"Could not find the function public.{self._fn}"})
+        with self._client.lock:
+            return FakeResponse(function(self._client, **self._params))
+
+
+class FakeSupabaseClient:
+    """Drop-in replacement for supabase.Client backed by in-memory tables"""
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency = latency_ms / 1000
+        self.tables: Dict[str, _Table] = {}
+        self.rpcs: Dict[str, Callable] = dict(DEFAULT_RPCS)
+        # Sync endpoints run on worker threads; one query at a time keeps rows consistent
+        self.lock = threading.RLock()
+
+    def simulate_latency(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+
+    def table_data(self, name: str) -> _Table:
+        if name not in self.tables:
+            self.tables[name] = _Table(name)
+        return self.tables[name]
+
+    def rows(self, name: str) -> List[Dict]:
+        return self.table_data(name).rows
+
+    def seed(self, name: str, rows: List[Dict]) -> None:
+        table = self.table_data(name)
+        for row in rows:
+            table.add(dict(row))
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def from_(self, name: str) -> FakeQuery:
+        return self.table(name)
+
+    def rpc(self, fn: str, params: Optional[Dict] = None, **kwargs) -> _FakeRpc:
+        return _FakeRpc(self, fn, params or {})
+
+
+# ============================================
+# Database B RPC functions (see Docs/*.sql)
+# ============================================
+
+def _submit_order_decision(client: FakeSupabaseClient, p_owner_id, p_order_id, p_decision):
+    orders = [
+        row for row in client.table_data("fetched_orders").candidates([("eq", "order_id", p_order_id)])
+        if _text(row.get("restaurant_owner_id")) == _text(p_owner_id)
+    ]
+    if not orders:
+        raise APIError({"code": "P0002", "message": "Order not found"})
+    order = orders[0]
+    responses = client.table_data("order_responses").candidates([("eq", "order_id", p_order_id)])
+    previous = responses[0]["overall_status"] if responses else None
+    if order.get("sent_for_delivery") or previous == "auto_rejected":
+        raise APIError({"code": "55000", "message": "Order is already closed"})
+    if previous == p_decision:
+        return {"order_id": p_order_id, "overall_status": p_decision, "previous_status": previous}
+    if responses:
+        responses[0].update({"overall_status": p_decision, "responded_at": _now(), "synced_to_dba": False})
+    else:
+        client.table_data("order_responses").add({
+            "id": str(uuid.uuid4()), "restaurant_owner_id": p_owner_id, "order_id": p_order_id,
+            "overall_status": p_decision, "responded_at": _now(), "synced_to_dba": False,
+        })
+    order["order_status"] = p_decision
+    outbox = client.table_data("dba_sync_outbox")
+    outbox.sequence += 1
+    outbox.add({"id": outbox.sequence, "order_id": p_order_id, "status": p_decision, "created_at": _now(),
+                "attempts": 0, "next_attempt_at": _now(), "synced_at": None})
+    return {"order_id": p_order_id, "overall_status": p_decision, "previous_status": previous}
+
+
+def _submit_order_decisions(client: FakeSupabaseClient, p_owner_id, p_decisions):
+    latest = {decision["order_id"]: decision["decision"] for decision in p_decisions}
+    outcomes = []
+    for order_id in sorted(latest):
+        try:
+            result = _submit_order_decision(client, p_owner_id, order_id, latest[order_id])
+            outcome = "unchanged" if result["previous_status"] == latest[order_id] else "applied"
+        except APIError as e:
+            outcome = "not_found" if e.code == "P0002" else "closed"
+        outcomes.append({"order_id": order_id, "decision": latest[order_id], "outcome": outcome})
+    return outcomes
+
+
+def _claim_dba_sync_batch(client: FakeSupabaseClient, p_limit=200, p_lease_seconds=60):
+    now = datetime.now(timezone.utc)
+    pending = sorted(
+        (row for row in client.rows("dba_sync_outbox") if row.get("synced_at") is None),
+        key=lambda row: row["id"],
+    )
+    newest = {row["order_id"]: row for row in pending}
+    in_flight = {
+        row["order_id"] for row in pending
+        if row.get("leased_until") and row["leased_until"] > now.isoformat()
+    }
+    due = [
+        row for row in newest.values()
+        if row.get("next_attempt_at", "") <= now.isoformat() and row["order_id"] not in in_flight
+    ]
+    due = sorted(due, key=lambda row: row["id"])[:p_limit]
+    for row in due:
+        lease = (now + timedelta(seconds=p_lease_seconds)).isoformat()
+        row.update({"next_attempt_at": lease, "leased_until": lease})
+        for older in pending:
+            if older["order_id"] == row["order_id"] and older["id"] < row["id"]:
+                older.update({"synced_at": now.isoformat(), "superseded_by": row["id"]})
+    return copy.deepcopy(due)
+
+
+def _repair_order_status_drift(client: FakeSupabaseClient, p_repairs):
+    repaired = queued = 0
+    outbox = client.table_data("dba_sync_outbox")
+    for repair in sorted(p_repairs, key=lambda repair: repair["order_id"]):
+        order_id = repair["order_id"]
+        responses = client.table_data("order_responses").candidates([("eq", "order_id", order_id)])
+        if not responses or responses[0]["overall_status"] != repair["expected"]:
+            continue
+        status = responses[0]["overall_status"]
+        if repair.get("fix_dbb"):
+            for order in client.table_data("fetched_orders").candidates([("eq", "order_id", order_id)]):
+                if order.get("order_status") != status:
+                    order["order_status"] = status
+                    repaired += 1
+        pending = [row for row in outbox.candidates([("eq", "order_id", order_id)]) if row.get("synced_at") is None]
+        if repair.get("fix_dba") and not pending:
+            outbox.sequence += 1
+            outbox.add({"id": outbox.sequence, "order_id": order_id, "status": status, "created_at": _now(),
+                        "attempts": 0, "next_attempt_at": _now(), "synced_at": None})
+            queued += 1
+    return {"repaired_dbb": repaired, "queued_dba": queued}
+
+
+def _admin_dashboard_stats(client: FakeSupabaseClient, p_since):
+    owners: Dict[str, int] = {}
+    for owner in client.rows("restaurant_owners"):
+        owners[owner.get("approval_status")] = owners.get(owner.get("approval_status"), 0) + 1
+    responded = {row["order_id"] for row in client.rows("order_responses")}
+    decisions: Dict[str, int] = {}
+    for response in client.rows("order_responses"):
+        if _text(response.get("responded_at")) >= _text(p_since):
+            decisions[response["overall_status"]] = decisions.get(response["overall_status"], 0) + 1
+    pending: Dict[str, int] = {}
+    for order in client.rows("fetched_orders"):
+        if not order.get("sent_for_delivery") and order["order_id"] not in responded and order.get("restaurant_owner_id"):
+            pending[order["restaurant_owner_id"]] = pending.get(order["restaurant_owner_id"], 0) + 1
+    return {
+        "owners_by_status": owners,
+        "orders_ingested_today": sum(1 for o in client.rows("fetched_orders") if _text(o.get("fetched_at")) >= _text(p_since)),
+        "decisions_today": decisions,
+        "pending_by_restaurant": [
+            {"restaurant_owner_id": owner_id, "restaurant_name": None, "pending_orders": count}
+            for owner_id, count in sorted(pending.items(), key=lambda item: -item[1])
+        ],
+    }
+
+
+def _bulk_assign_restaurant_uids(client: FakeSupabaseClient, p_assignments, p_approved_by, p_approve):
+    updated = []
+    owners = client.table_data("restaurant_owners")
+    for assignment in p_assignments:
+        for owner in owners.candidates([("eq", "id", assignment["owner_id"])]):
+            if p_approve or owner.get("approval_status") == "approved":
+                owner["restaurant_uid"] = assignment["restaurant_uid"]
+                if p_approve:
+                    owner.update({"approval_status": "approved", "approved_at": _now(), "approved_by": p_approved_by})
+                updated.append({"owner_id": owner["id"]})
+    owners.reindex()
+    return updated
+
+
+DEFAULT_RPCS: Dict[str, Callable] = {
+    "submit_order_decision": _submit_order_decision,
+    "submit_order_decisions": _submit_order_decisions,
+    "claim_dba_sync_batch": _claim_dba_sync_batch,
+    "repair_order_status_drift": _repair_order_status_drift,
+    "admin_dashboard_stats": _admin_dashboard_stats,
+    "bulk_assign_restaurant_uids": _bulk_assign_restaurant_uids,
+}
@@ -0,0 +1,214 @@
+"""
+Offline load test for the API.
+
+Boots main:app in-process (httpx ASGI transport) against in-memory
+stand-ins for Database A/B and a local fake Expo push server, drives a
+weighted request mix with N concurrent clients and prints (or writes)
+per-endpoint throughput and latency percentiles as JSON.
+
+Usage (from Backend/):
+    python -m loadtest.run --scenario mix --duration 30 --concurrency 50
+    python -m loadtest.run --scenario pool_close --requests 200 --output results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List
+
+
+def bootstrap_env(log_level: str = "WARNING") -> None:
+    """Settings are read at import time; give the app harmless values before importing it"""
+    dummy_key = "loadtest.dummy.key"
+    os.environ.setdefault("SUPABASE_URL_DBB", "http://dbb.loadtest.invalid")
+    os.environ.setdefault("SUPABASE_SERVICE_KEY_DBB", dummy_key)
+    os.environ.setdefault("SUPABASE_URL_DBA", "http://dba.loadtest.invalid")
+    os.environ.setdefault("SUPABASE_SERVICE_KEY_DBA", dummy_key)
+    os.environ.setdefault("JWT_SECRET_KEY", "loadtest-secret-key-with-enough-length-for-hs256")
+    os.environ.setdefault("ENVIRONMENT", "loadtest")
+    os.environ["LOG_LEVEL"] = log_level
+    os.environ.pop("WEBHOOK_API_KEY", None)
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(q / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(samples: Dict[str, List], elapsed: float) -> Dict:
+    endpoints = {}
+    for label, entries in sorted(samples.items()):
+        latencies = sorted(entry[0] for entry in entries)
+        statuses = Counter(str(entry[1]) for entry in entries)
+        db_queries = [entry[2] for entry in entries if entry[2] is not None]
+        endpoints[label] = {
+            "requests": len(entries),
+            "errors": sum(count for status, count in statuses.items() if not status.startswith("2")),
+            "status_codes": dict(statuses),
+            "throughput_rps": round(len(entries) / elapsed, 2),
+            "latency_ms": {
+                "p50": round(percentile(latencies, 50), 2),
+                "p95": round(percentile(latencies, 95), 2),
+                "p99": round(percentile(latencies, 99), 2),
+                "mean": round(sum(latencies) / len(latencies), 2),
+                "max": round(latencies[-1], 2),
+            },
+            "db_queries_per_request": round(sum(db_queries) / len(db_queries), 2) if db_queries else None,
+        }
+    all_latencies = sorted(entry[0] for entries in samples.values() for entry in entries)
+    total = len(all_latencies)
+    return {
+        "endpoints": endpoints,
+        "total": {
+            "requests": total,
+            "errors": sum(endpoint["errors"] for endpoint in endpoints.values()),
+            "throughput_rps": round(total / elapsed, 2) if elapsed else 0,
+            "latency_ms": {
+                "p50": round(percentile(all_latencies, 50), 2),
+                "p95": round(percentile(all_latencies, 95), 2),
+                "p99": round(percentile(all_latencies, 99), 2),
+            },
+        },
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return "unknown"
+
+
+async def _worker(ctx, actions, weights, rng: random.Random, deadline: float, budget: List[int], samples: Dict[str, List]) -> None:
+    while time.perf_counter() < deadline:
+        if budget[0] <= 0:
+            return
+        budget[0] -= 1
+        action = rng.choices(actions, weights)[0]
+        started = time.perf_counter()
+        try:
+            label, response = await action(ctx, rng)
+            status_code = response.status_code
+            db_queries = response.headers.get("x-db-queries")
+        except Exception as e:
+            label, status_code, db_queries = action.__name__, f"exception:{type(e).__name__}", None
+        samples[label].append((
+            (time.perf_counter() - started) * 1000,
+            status_code,
+            int(db_queries) if db_queries is not None else None,
+        ))
+
+
+async def run(args) -> Dict:
+    import httpx
+
+    import database
+    import main
+    import utils.notifications as notifications
+    from utils.db_instrumentation import InstrumentedClient
+    from loadtest.fake_expo import FakeExpoServer
+    from loadtest.fake_supabase import FakeSupabaseClient
+    from loadtest.scenarios import SCENARIOS, LoadTestContext, seed
+
+    rng = random.Random(args.seed)
+    fake_dbb = FakeSupabaseClient(latency_ms=args.db_latency_ms)
+    fake_dba = FakeSupabaseClient(latency_ms=args.db_latency_ms)
+    database.supabase_dbb = InstrumentedClient(fake_dbb, "dbb")
+    database.supabase_dba = InstrumentedClient(fake_dba, "dba")
+
+    expo = FakeExpoServer(latency_ms=args.push_latency_ms).start()
+    notifications.EXPO_PUSH_URL = expo.push_url
+
+    seed_started = time.perf_counter()
+    owners, admin_token = seed(fake_dbb, fake_dba, rng, args.owners, args.orders_per_owner, args.items_per_order)
+    seed_seconds = time.perf_counter() - seed_started
+
+    mix = SCENARIOS[args.scenario]
+    actions, weights = list(mix), list(mix.values())
+    samples: Dict[str, List] = defaultdict(list)
+    budget = [args.requests if args.requests else sys.maxsize]
+
+    transport = httpx.ASGITransport(app=main.app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=60) as client:
+            ctx = LoadTestContext(client, fake_dbb, owners, admin_token, args.batch_size, args.items_per_order)
+            started = time.perf_counter()
+            deadline = started + args.duration if args.duration else float("inf")
+            await asyncio.gather(*(
+                _worker(ctx, actions, weights, random.Random(rng.random()), deadline, budget, samples)
+                for _ in range(args.concurrency)
+            ))
+            elapsed = time.perf_counter() - started
+    finally:
+        expo.stop()
+
+    return {
+        "commit": _git_commit(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "config": {
+            "scenario": args.scenario,
+            "duration_s": args.duration,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "owners": args.owners,
+            "orders_per_owner": args.orders_per_owner,
+            "items_per_order": args.items_per_order,
+            "webhook_batch_size": args.batch_size,
+            "db_latency_ms": args.db_latency_ms,
+            "push_latency_ms": args.push_latency_ms,
+            "seed": args.seed,
+        },
+        "seed_seconds": round(seed_seconds, 2),
+        "elapsed_s": round(elapsed, 2),
+        "push": {"requests": expo.requests, "messages": expo.messages},
+        **summarize(samples, elapsed),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline load test for the restaurant API")
+    parser.add_argument("--scenario", default="mix", choices=("mix", "pool_close", "polling", "login_storm"))
+    parser.add_argument("--duration", type=float, default=20, help="Seconds to run (0 = until --requests is reached)")
+    parser.add_argument("--requests", type=int, default=0, help="Stop after this many requests (0 = no limit)")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent clients")
+    parser.add_argument("--owners", type=int, default=200)
+    parser.add_argument("--orders-per-owner", type=int, default=20, help="Active orders seeded per owner")
+    parser.add_argument("--items-per-order", type=int, default=5, help="Maximum items per order")
+    parser.add_argument("--batch-size", type=int, default=100, help="Orders per pool-close webhook call")
+    parser.add_argument("--db-latency-ms", type=float, default=3.0, help="Simulated Supabase round trip")
+    parser.add_argument("--push-latency-ms", type=float, default=50.0, help="Simulated Expo API latency")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    if not args.duration and not args.requests:
+        parser.error("Set --duration and/or --requests")
+
+    bootstrap_env(args.log_level)
+    report = asyncio.run(run(args))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"✅ Load test report written to {args.output}")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Load-test dataset seeding and request mixes.
+
+Each action picks a random owner (or batch of orders), issues one request
+and returns the endpoint label it should be reported under.
+"""
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List
+
+import bcrypt
+
+from loadtest.fake_supabase import FakeSupabaseClient
+from utils.auth import create_access_token
+
+PASSWORD = "loadtest-password"
+
+MENU = [
+    ("Paneer Butter Masala", 22000), ("Veg Biryani", 18000), ("Chicken Biryani", 24000),
+    ("Butter Naan", 4500), ("Dal Makhani", 16000), ("Masala Dosa", 9000),
+    ("Cold Coffee", 8000), ("Gulab Jamun", 6000), ("Chole Bhature", 12000), ("Veg Thali", 20000),
+]
+
+
+class LoadTestContext:
+    def __init__(self, client, dbb: FakeSupabaseClient, owners: List[Dict], admin_token: str, batch_size: int, items_per_order: int):
+        self.client = client
+        self.dbb = dbb
+        self.owners = owners
+        self.admin_headers = {"Authorization": f"Bearer {admin_token}"}
+        self.batch_size = batch_size
+        self.items_per_order = items_per_order
+
+
+def make_items(rng: random.Random, max_items: int) -> List[Dict]:
+    items = []
+    for name, price in rng.sample(MENU, rng.randint(1, max_items)):
+        quantity = rng.randint(1, 3)
+        items.append({
+            "menu_item_id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "name": name,
+            "quantity": quantity,
+            "unit_price": price,
+            "subtotal": price * quantity,
+        })
+    return items
+
+
+def make_webhook_order(rng: random.Random, owner: Dict, max_items: int) -> Dict:
+    items = make_items(rng, max_items)
+    subtotal = sum(item["subtotal"] for item in items)
+    return {
+        "order_id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "restaurant_id": owner["restaurant_uid"],
+        "restaurant_phone": owner["restaurant_phone"],
+        "customer_name": f"Customer {rng.randint(1, 9999)}",
+        "customer_phone": f"9{rng.randint(100000000, 999999999)}",
+        "items": items,
+        "total_amount": subtotal + 3000,
+        "payment_status": "paid",
+        "order_status": "pending",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "subtotal": subtotal,
+        "delivery_fee": 2000,
+        "platform_fee": 1000,
+        "total_customer_paid": subtotal + 3000,
+        "amount_to_collect": subtotal,
+    }
+
+
+def seed(dbb: FakeSupabaseClient, dba: FakeSupabaseClient, rng: random.Random, owners: int, orders_per_owner: int, items_per_order: int):
+    """Create approved owners with push tokens, an admin and active orders per owner"""
+    # One real bcrypt hash (default cost) so logins pay the production price
+    password_hash = bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    now = datetime.now(timezone.utc)
+
+    admin_id = str(uuid.UUID(int=rng.getrandbits(128)))
+    dbb.seed("admin_users", [{"id": admin_id, "email": "admin@loadtest.khaogully.com", "full_name": "Load Test Admin", "password_hash": password_hash}])
+
+    owner_rows, restaurants, seeded = [], [], []
+    for number in range(owners):
+        owner_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        restaurant_uid = str(uuid.UUID(int=rng.getrandbits(128)))
+        phone = f"9{number:09d}"
+        owner_rows.append({
+            "id": owner_id,
+            "email": f"owner{number}@loadtest.khaogully.com",
+            "password_hash": password_hash,
+            "full_name": f"Owner {number}",
+            "phone": phone,
+            "restaurant_name": f"Restaurant {number}",
+            "restaurant_address": f"{number} Food Street",
+            "restaurant_phone": phone,
+            "restaurant_email": None,
+            "restaurant_uid": restaurant_uid,
+            "approval_status": "approved",
+            "created_at": (now - timedelta(days=30)).isoformat(),
+            "push_token": f"ExponentPushToken[loadtest-{number}]",
+        })
+        restaurants.append({"id": restaurant_uid, "name": f"Restaurant {number}", "address": f"{number} Food Street", "phone": phone})
+        seeded.append({
+            "id": owner_id,
+            "email": f"owner{number}@loadtest.khaogully.com",
+            "restaurant_uid": restaurant_uid,
+            "restaurant_phone": phone,
+            "headers": {"Authorization": "Bearer " + create_access_token({"sub": owner_id, "type": "restaurant_owner"})},
+        })
+    dbb.seed("restaurant_owners", owner_rows)
+    dba.seed("restaurants", restaurants)
+
+    orders = []
+    for owner in seeded:
+        for _ in range(orders_per_owner):
+            order = make_webhook_order(rng, owner, items_per_order)
+            order.pop("restaurant_id")
+            orders.append({
+                **order,
+                "restaurant_owner_id": owner["id"],
+                # Recent enough that polls don't auto-reject the whole backlog at once
+                "fetched_at": (now - timedelta(minutes=rng.uniform(0, 9))).isoformat(),
+                "sent_for_delivery": False,
+            })
+    dbb.seed("fetched_orders", orders)
+    dba.seed("customer_orders", [{"id": order["order_id"], "status": "pending"} for order in orders])
+
+    admin_token = create_access_token({"sub": admin_id, "type": "admin"})
+    return seeded, admin_token
+
+
+# ============================================
+# Actions
+# ============================================
+
+async def poll_orders(ctx: LoadTestContext, rng: random.Random):
+    owner = rng.choice(ctx.owners)
+    response = await ctx.client.post("/api/owner/fetch-orders", headers=owner["headers"])
+    return "POST /api/owner/fetch-orders", response
+
+
+async def order_history(ctx: LoadTestContext, rng: random.Random):
+    owner = rng.choice(ctx.owners)
+    response = await ctx.client.get("/api/owner/order-history", headers=owner["headers"])
+    return "GET /api/owner/order-history", response
+
+
+async def submit_decision(ctx: LoadTestContext, rng: random.Random):
+    owner = rng.choice(ctx.owners)
+    orders = ctx.dbb.table_data("fetched_orders").candidates([("eq", "restaurant_owner_id", owner["id"])])
+    order_id = rng.choice(orders)["order_id"] if orders else str(uuid.uuid4())
+    response = await ctx.client.post(
+        "/api/owner/submit-response",
+        headers=owner["headers"],
+        json={"order_id": order_id, "decision": rng.choice(("accepted", "accepted", "accepted", "rejected"))},
+    )
+    return "POST /api/owner/submit-response", response
+
+
+async def webhook_burst(ctx: LoadTestContext, rng: random.Random):
+    """One pool-close webhook call: a batch of orders spread over many owners"""
+    orders = [
+        make_webhook_order(rng, rng.choice(ctx.owners), ctx.items_per_order)
+        for _ in range(ctx.batch_size)
+    ]
+    response = await ctx.client.post("/api/webhook/receive-orders", json={"orders": orders})
+    return "POST /api/webhook/receive-orders", response
+
+
+async def login(ctx: LoadTestContext, rng: random.Random):
+    owner = rng.choice(ctx.owners)
+    response = await ctx.client.post("/api/auth/login", json={"email": owner["email"], "password": PASSWORD})
+    return "POST /api/auth/login", response
+
+
+async def admin_stats(ctx: LoadTestContext, rng: random.Random):
+    response = await ctx.client.get("/api/admin/stats", headers=ctx.admin_headers)
+    return "GET /api/admin/stats", response
+
+
+# Weighted request mixes
+SCENARIOS: Dict[str, Dict[Callable, int]] = {
+    "mix": {poll_orders: 55, order_history: 10, submit_decision: 15, login: 10, webhook_burst: 5, admin_stats: 5},
+    "pool_close": {webhook_burst: 70, poll_orders: 30},
+    "polling": {poll_orders: 100},
+    "login_storm": {login: 100},
+}
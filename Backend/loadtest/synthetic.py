@@ -0,0 +1,518 @@
+"""
+Synthetic Database B dataset for scale testing.
+
+Generates a deterministic, seedable dataset of owners, fetched_orders with
+JSONB items, order_responses and earnings/transaction rows (same --seed, --now
+and options give identical rows, apart from the password hash salt), and
+bulk-loads it with COPY into a Postgres laid out per Docs/setup_database_b.sql plus the migrations
+(add_pool_id_column, add_order_amount_breakdown_fields,
+add_order_responses_unique_order_id, setup_earnings_tables, migrate_to_uuid).
+
+Rows are streamed table by table, so memory stays flat at millions of orders.
+Loading straight into Postgres needs psycopg (3) or psycopg2; without a driver
+use --csv-dir and load the files with the generated load.sql (psql \\copy).
+
+Usage (from Backend/):
+    python -m loadtest.synthetic --dsn postgresql://postgres@localhost/khaogully --owners 2000 --orders 2000000
+    python -m loadtest.synthetic --csv-dir /tmp/synthetic --orders 100000 --decision-mix accepted=0.8,rejected=0.05,auto_rejected=0.1,pending=0.05
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import bcrypt
+
+PASSWORD = "synthetic-password"
+
+DECISIONS = ("accepted", "rejected", "auto_rejected", "pending")
+OWNER_STATUSES = ("approved", "pending", "rejected")
+COMMISSION_RATES = ("0.1000", "0.1200", "0.1500")
+
+DISHES = (
+    "Paneer Butter Masala", "Veg Biryani", "Chicken Biryani", "Butter Naan", "Dal Makhani",
+    "Masala Dosa", "Cold Coffee", "Gulab Jamun", "Chole Bhature", "Veg Thali", "Kadai Paneer",
+    "Egg Curry", "Jeera Rice", "Tandoori Roti", "Aloo Paratha", "Chicken 65", "Veg Manchurian",
+    "Hakka Noodles", "Fried Rice", "Mutton Rogan Josh", "Idli Sambar", "Pav Bhaji", "Lassi",
+    "Masala Chai", "Rasmalai", "Chicken Tikka", "Fish Curry", "Rajma Chawal", "Samosa", "Kulfi",
+)
+VARIANTS = ("", " (Half)", " (Full)", " Special", " Combo")
+FIRST_NAMES = ("Aarav", "Vivaan", "Aditya", "Ananya", "Diya", "Ishaan", "Kavya", "Rohan", "Saanvi", "Arjun", "Meera", "Kabir")
+LAST_NAMES = ("Sharma", "Verma", "Gupta", "Iyer", "Reddy", "Khan", "Singh", "Nair", "Das", "Patel", "Yadav", "Mehta")
+
+# Meal-time pool closes (hour, minute) in IST, most popular first
+POOL_SLOTS = ((13, 0), (20, 30), (12, 0), (21, 30), (19, 30), (14, 0), (9, 0), (16, 30))
+IST = timezone(timedelta(hours=5, minutes=30))
+
+# COPY column lists, in load (foreign key) order
+COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "admin_users": ("id", "email", "password_hash", "full_name", "created_at"),
+    "restaurant_owners": (
+        "id", "email", "password_hash", "full_name", "phone", "restaurant_name", "restaurant_address",
+        "restaurant_phone", "restaurant_email", "restaurant_uid", "approval_status", "created_at",
+        "approved_at", "approved_by", "push_token", "push_token_updated_at",
+    ),
+    "fetched_orders": (
+        "id", "restaurant_owner_id", "order_id", "customer_name", "customer_phone", "items",
+        "total_amount", "payment_status", "order_status", "fetched_at", "created_at", "pool_id",
+        "sent_for_delivery", "subtotal", "delivery_fee", "platform_fee", "total_customer_paid",
+        "amount_to_collect", "sent_for_delivery_at",
+    ),
+    "order_responses": (
+        "id", "restaurant_owner_id", "order_id", "item_responses", "overall_status", "responded_at", "synced_to_dba",
+    ),
+    "restaurant_earnings_data": (
+        "restaurant_id", "restaurant_name", "restaurant_phone", "restaurant_email", "total_lifetime_earnings",
+        "total_completed_orders", "commission_rate", "total_commission_paid", "has_bank_details",
+        "bank_account_number", "bank_ifsc_code", "bank_account_holder_name", "upi_id", "last_synced_at",
+        "data_sent_by", "sync_status",
+    ),
+    "restaurant_order_transactions": (
+        "transaction_id", "restaurant_id", "order_id", "order_date", "customer_name", "customer_phone",
+        "delivery_address", "order_total", "platform_commission", "delivery_fee", "net_amount", "is_paid",
+        "paid_at", "payout_cycle_id", "payout_reference",
+    ),
+}
+
+
+def parse_mix(text: str, allowed: Sequence[str]) -> Dict[str, float]:
+    """Parse "a=0.7,b=0.3" into normalised weights over the allowed keys"""
+    weights = {key: 0.0 for key in allowed}
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        key, _, value = part.partition("=")
+        if key not in weights:
+            raise ValueError(f"Unknown mix key '{key}' (expected one of: {', '.join(allowed)})")
+        weights[key] = float(value)
+    total = sum(weights.values())
+    if total <= 0 or any(weight < 0 for weight in weights.values()):
+        raise ValueError(f"Mix weights must be non-negative and sum to more than 0: {text}")
+    return {key: weight / total for key, weight in weights.items()}
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+def _paise_to_rupees(paise: int) -> str:
+    return f"{paise // 100}.{paise % 100:02d}"
+
+
+class SyntheticDataset:
+    """
+    Deterministic row generator.
+
+    Every owner gets its own random stream derived from the seed, so a table
+    can be regenerated independently (order_responses and transactions replay
+    the fetched_orders stream instead of holding millions of orders in memory).
+    """
+
+    def __init__(self, args):
+        self.seed = args.seed
+        self.days = args.days
+        self.pools_per_day = args.pools_per_day
+        self.items_min = args.items_min
+        self.items_max = args.items_max
+        self.menu_size = args.menu_size
+        self.decision_mix = parse_mix(args.decision_mix, DECISIONS)
+        self.owner_mix = parse_mix(args.owner_status_mix, OWNER_STATUSES)
+        self.now = datetime.now(timezone.utc).replace(second=0, microsecond=0) if args.now is None else args.now
+
+        rng = random.Random(f"{self.seed}:setup")
+        self.password_hash = bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt(rounds=args.bcrypt_rounds)).decode("utf-8")
+        self.admin_id = _uuid(rng)
+
+        statuses = list(self.owner_mix)
+        self.owners: List[Dict] = []
+        for number in range(args.owners):
+            approval_status = rng.choices(statuses, [self.owner_mix[s] for s in statuses])[0]
+            self.owners.append({
+                "number": number,
+                "id": _uuid(rng),
+                "restaurant_uid": _uuid(rng) if approval_status == "approved" else None,
+                "approval_status": approval_status,
+                "phone": f"9{number:09d}",
+            })
+
+        self.approved = [owner for owner in self.owners if owner["approval_status"] == "approved"]
+        self._allocate_orders(rng, args.orders, args.owner_skew)
+        self._pool_starts = self._pool_schedule()
+        if args.orders and not self._pool_starts:
+            raise ValueError("No pool has closed yet in the history window; increase --days")
+        # Per-owner (completed orders, net earnings, commission) in paise,
+        # filled while fetched_orders streams so earnings rows need no extra pass
+        self._totals: Dict[int, Tuple[int, int, int]] = {}
+
+    def _allocate_orders(self, rng: random.Random, total_orders: int, skew: float) -> None:
+        """Zipf-like split of orders over approved owners (a few busy restaurants, a long tail)"""
+        if not self.approved:
+            return
+        ranks = list(range(1, len(self.approved) + 1))
+        rng.shuffle(ranks)
+        weights = [1 / rank ** skew for rank in ranks]
+        scale = total_orders / sum(weights)
+        counts = [int(weight * scale) for weight in weights]
+        for index in sorted(range(len(counts)), key=lambda i: weights[i], reverse=True)[:total_orders - sum(counts)]:
+            counts[index] += 1
+        offset = 0
+        for owner, count in zip(self.approved, counts):
+            owner["orders"] = count
+            owner["order_offset"] = offset
+            offset += count
+
+    def _pool_schedule(self) -> List[Tuple[str, float]]:
+        """(pool_id, close timestamp) for every pool in the history window, oldest first"""
+        slots = sorted(POOL_SLOTS[:self.pools_per_day])
+        today = self.now.astimezone(IST).date()
+        pools = []
+        for day_offset in range(self.days - 1, -1, -1):
+            day = today - timedelta(days=day_offset)
+            for hour, minute in slots:
+                closes_at = datetime(day.year, day.month, day.day, hour, minute, tzinfo=IST)
+                if closes_at <= self.now:
+                    pools.append((f"pool-{day:%Y%m%d}-{hour:02d}{minute:02d}", closes_at.timestamp()))
+        return pools
+
+    def _menu(self, owner: Dict) -> List[Tuple[str, str, int]]:
+        rng = random.Random(f"{self.seed}:menu:{owner['number']}")
+        names = sorted({rng.choice(DISHES) + rng.choice(VARIANTS) for _ in range(self.menu_size * 2)})
+        names = rng.sample(names, min(self.menu_size, len(names)))
+        return [(_uuid(rng), name, rng.randrange(40, 450) * 100) for name in names]
+
+    def owner_orders(self, owner: Dict) -> Iterator[Dict]:
+        """Replayable order stream for one owner (fetched_orders plus the decision taken on it)"""
+        rng = random.Random(f"{self.seed}:orders:{owner['number']}")
+        menu = self._menu(owner)
+        decisions = list(self.decision_mix)
+        decision_weights = [self.decision_mix[d] for d in decisions]
+        latest_pool_close = self._pool_starts[-1][1] if self._pool_starts else None
+
+        for index in range(owner.get("orders", 0)):
+            pool_id, closes_at = rng.choice(self._pool_starts)
+            fetched_at = closes_at + rng.uniform(0, 90)
+            items = []
+            for item_id, name, price in rng.sample(menu, min(rng.randint(self.items_min, self.items_max), len(menu))):
+                quantity = rng.choices((1, 2, 3, 4), (70, 20, 7, 3))[0]
+                items.append({
+                    "menu_item_id": item_id,
+                    "name": name,
+                    "quantity": quantity,
+                    "unit_price": price,
+                    "subtotal": price * quantity,
+                })
+            subtotal = sum(item["subtotal"] for item in items)
+            delivery_fee = rng.choice((0, 1500, 2000, 3000))
+            platform_fee = 500 + subtotal // 50
+            decision = rng.choices(decisions, decision_weights)[0]
+            # Only the newest pool can still have undecided orders
+            if decision == "pending" and closes_at != latest_pool_close:
+                decision = "auto_rejected"
+            responded_at = fetched_at + (600 if decision == "auto_rejected" else rng.uniform(15, 540))
+            yield {
+                "id": _uuid(rng),
+                "order_id": _uuid(rng),
+                "number": owner["order_offset"] + index + 1,
+                "customer_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "customer_phone": f"{rng.choice('6789')}{rng.randrange(10 ** 8, 10 ** 9)}",
+                "items": items,
+                "subtotal": subtotal,
+                "delivery_fee": delivery_fee,
+                "platform_fee": platform_fee,
+                "created_at": fetched_at - rng.uniform(60, 1800),
+                "fetched_at": fetched_at,
+                "pool_id": pool_id,
+                "decision": decision,
+                "response_id": _uuid(rng),
+                "responded_at": responded_at,
+                "sent_for_delivery": decision == "accepted" and closes_at != latest_pool_close,
+                # Owners mark a pool sent about half an hour after it closes
+                "sent_for_delivery_at": closes_at + 1800,
+            }
+
+    # ============================================
+    # Table rows (tuples in COLUMNS order)
+    # ============================================
+
+    def admin_users(self) -> Iterator[tuple]:
+        created_at = _iso((self.now - timedelta(days=self.days + 30)).timestamp())
+        yield (self.admin_id, "admin@synthetic.khaogully.com", self.password_hash, "Synthetic Admin", created_at)
+
+    def restaurant_owners(self) -> Iterator[tuple]:
+        start = (self.now - timedelta(days=self.days + 7)).timestamp()
+        for owner in self.owners:
+            n = owner["number"]
+            created_at = start + n * 60
+            approved = owner["approval_status"] == "approved"
+            yield (
+                owner["id"], f"owner{n}@synthetic.khaogully.com", self.password_hash, f"Owner {n}", owner["phone"],
+                f"Restaurant {n}", f"{n} Food Street, Bengaluru", owner["phone"], f"restaurant{n}@synthetic.khaogully.com",
+                owner["restaurant_uid"], owner["approval_status"], _iso(created_at),
+                _iso(created_at + 3600) if approved else None, self.admin_id if approved else None,
+                f"ExponentPushToken[synthetic-{n}]" if approved else None, _iso(created_at + 7200) if approved else None,
+            )
+
+    def fetched_orders(self) -> Iterator[tuple]:
+        for owner in self.approved:
+            completed = earnings = commission_paid = 0
+            rate = self._rate_basis_points(owner)
+            for order in self.owner_orders(owner):
+                if order["sent_for_delivery"]:
+                    commission = order["subtotal"] * rate // 10000
+                    completed += 1
+                    earnings += order["subtotal"] - commission
+                    commission_paid += commission
+                total = order["subtotal"] + order["delivery_fee"] + order["platform_fee"]
+                yield (
+                    order["id"], owner["id"], order["order_id"], order["customer_name"], order["customer_phone"],
+                    json.dumps(order["items"], separators=(",", ":")), total, "paid", order["decision"],
+                    _iso(order["fetched_at"]), _iso(order["created_at"]), order["pool_id"], order["sent_for_delivery"],
+                    order["subtotal"], order["delivery_fee"], order["platform_fee"], total, order["subtotal"],
+                    _iso(order["sent_for_delivery_at"]) if order["sent_for_delivery"] else None,
+                )
+            self._totals[owner["number"]] = (completed, earnings, commission_paid)
+
+    def order_responses(self) -> Iterator[tuple]:
+        for owner in self.approved:
+            for order in self.owner_orders(owner):
+                if order["decision"] == "pending":
+                    continue
+                accepted = order["decision"] == "accepted"
+                item_responses = [
+                    {
+                        "item_name": item["name"],
+                        "requested_qty": item["quantity"],
+                        "accepted_qty": item["quantity"] if accepted else 0,
+                        "rejected_qty": 0 if accepted else item["quantity"],
+                        "status": "accepted" if accepted else "rejected",
+                    }
+                    for item in order["items"]
+                ]
+                yield (
+                    order["response_id"], owner["id"], order["order_id"], json.dumps(item_responses, separators=(",", ":")),
+                    order["decision"], _iso(order["responded_at"]), True,
+                )
+
+    def _commission_rate(self, owner: Dict) -> str:
+        return COMMISSION_RATES[owner["number"] % len(COMMISSION_RATES)]
+
+    def _rate_basis_points(self, owner: Dict) -> int:
+        return int(self._commission_rate(owner).replace(".", "")) // 10
+
+    def _transactions(self, owner: Dict) -> Iterator[Tuple[Dict, int, int]]:
+        """(order, commission, net) in paise for every delivered order"""
+        rate = self._rate_basis_points(owner)
+        for order in self.owner_orders(owner):
+            if order["sent_for_delivery"]:
+                commission = order["subtotal"] * rate // 10000
+                yield order, commission, order["subtotal"] - commission
+
+    def restaurant_earnings_data(self) -> Iterator[tuple]:
+        last_synced_at = _iso(self.now.timestamp())
+        for owner in self.approved:
+            rng = random.Random(f"{self.seed}:earnings:{owner['number']}")
+            if owner["number"] not in self._totals:
+                completed = earnings = commission_paid = 0
+                for _, commission, net in self._transactions(owner):
+                    completed += 1
+                    earnings += net
+                    commission_paid += commission
+                self._totals[owner["number"]] = (completed, earnings, commission_paid)
+            completed, earnings, commission_paid = self._totals[owner["number"]]
+            has_bank = rng.random() < 0.8
+            n = owner["number"]
+            yield (
+                owner["restaurant_uid"], f"Restaurant {n}", owner["phone"], f"restaurant{n}@synthetic.khaogully.com",
+                _paise_to_rupees(earnings), completed, self._commission_rate(owner), _paise_to_rupees(commission_paid),
+                has_bank, f"{rng.randrange(10 ** 11, 10 ** 12)}" if has_bank else None,
+                f"SBIN0{rng.randrange(10 ** 5, 10 ** 6)}" if has_bank else None, f"Owner {n}" if has_bank else None,
+                f"{owner['phone']}@upi" if has_bank and rng.random() < 0.5 else None,
+                last_synced_at, "synthetic", "success",
+            )
+
+    def restaurant_order_transactions(self) -> Iterator[tuple]:
+        paid_before = (self.now - timedelta(days=7)).timestamp()
+        for owner in self.approved:
+            for order, commission, net in self._transactions(owner):
+                paid = order["fetched_at"] < paid_before
+                # Weekly payout cycles counted from the start of the history window
+                cycle = int((order["fetched_at"] - self._pool_starts[0][1]) // (7 * 86400)) + 1
+                yield (
+                    f"TXN-{order['number']:09d}", owner["restaurant_uid"], order["number"], _iso(order["fetched_at"]),
+                    order["customer_name"], order["customer_phone"], f"{order['number'] % 500} Residency Road",
+                    _paise_to_rupees(order["subtotal"] + order["delivery_fee"] + order["platform_fee"]),
+                    _paise_to_rupees(commission), _paise_to_rupees(order["delivery_fee"]), _paise_to_rupees(net),
+                    paid, _iso(order["fetched_at"] + 7 * 86400) if paid else None, cycle if paid else None,
+                    f"PAYOUT-{owner['number']}-{cycle}" if paid else None,
+                )
+
+    def tables(self) -> Iterator[Tuple[str, Iterator[tuple]]]:
+        for table in COLUMNS:
+            yield table, getattr(self, table)()
+
+
+# ============================================
+# Writers
+# ============================================
+
+def _csv_chunks(rows: Iterator[tuple], chunk_bytes: int = 4 * 1024 * 1024) -> Iterator[str]:
+    """CSV text in roughly chunk_bytes pieces; None becomes an unquoted empty field (NULL)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= chunk_bytes:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _copy_sql(table: str, source: str) -> str:
+    return f"COPY public.{table} ({', '.join(COLUMNS[table])}) FROM {source} WITH (FORMAT csv)"
+
+
+def _connect(dsn: str):
+    """psycopg 3 if available, psycopg2 otherwise; both are optional dependencies"""
+    try:
+        import psycopg
+        return "psycopg", psycopg.connect(dsn)
+    except ImportError:
+        pass
+    try:
+        import psycopg2
+        return "psycopg2", psycopg2.connect(dsn)
+    except ImportError:
+        print("❌ Loading into Postgres needs psycopg: pip install 'psycopg[binary]'")
+        print("   (or pass --csv-dir and load the files with psql)")
+        sys.exit(1)
+
+
+def load_postgres(dataset: SyntheticDataset, dsn: str, truncate: bool) -> Dict[str, int]:
+    driver, conn = _connect(dsn)
+    counts = {}
+    try:
+        with conn.cursor() as cur:
+            if truncate:
+                cur.execute(f"TRUNCATE {', '.join('public.' + table for table in COLUMNS)} CASCADE")
+            for table, rows in dataset.tables():
+                counted = _counting(rows, counts, table)
+                started = time.perf_counter()
+                if driver == "psycopg":
+                    with cur.copy(_copy_sql(table, "STDIN")) as copy:
+                        for chunk in _csv_chunks(counted):
+                            copy.write(chunk)
+                else:
+                    cur.copy_expert(_copy_sql(table, "STDIN"), _ChunkReader(_csv_chunks(counted)))
+                print(f"   {table}: {counts[table]:,} rows in {time.perf_counter() - started:.1f}s")
+            # Fresh statistics so the planner sees the new volume straight away
+            for table in COLUMNS:
+                cur.execute(f"ANALYZE public.{table}")
+        conn.commit()
+    finally:
+        conn.close()
+    return counts
+
+
+def write_csv(dataset: SyntheticDataset, directory: str) -> Dict[str, int]:
+    os.makedirs(directory, exist_ok=True)
+    counts = {}
+    for table, rows in dataset.tables():
+        with open(os.path.join(directory, f"{table}.csv"), "w", encoding="utf-8", newline="") as f:
+            for chunk in _csv_chunks(_counting(rows, counts, table)):
+                f.write(chunk)
+        print(f"   {table}: {counts[table]:,} rows")
+
+    with open(os.path.join(directory, "load.sql"), "w", encoding="utf-8") as f:
+        f.write("-- Load with: psql \"$DATABASE_URL\" -f load.sql (run from this directory)\n")
+        f.write("BEGIN;\n")
+        for table in COLUMNS:
+            f.write("\\" + _copy_sql(table, f"'{table}.csv'").replace("COPY", "copy", 1) + "\n")
+        f.write("COMMIT;\n")
+        for table in COLUMNS:
+            f.write(f"ANALYZE public.{table};\n")
+    return counts
+
+
+def _counting(rows: Iterator[tuple], counts: Dict[str, int], table: str) -> Iterator[tuple]:
+    counts[table] = 0
+    for row in rows:
+        counts[table] += 1
+        yield row
+
+
+class _ChunkReader:
+    """File-like adapter over string chunks for psycopg2's copy_expert"""
+
+    def __init__(self, chunks: Iterator[str]):
+        self._chunks = chunks
+        self._pending = ""
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._pending) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._pending += chunk
+        if size < 0:
+            size = len(self._pending)
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic Database B dataset")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--dsn", help="Postgres connection string to COPY into (needs psycopg)")
+    target.add_argument("--csv-dir", help="Write one CSV per table plus load.sql instead of connecting")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--owners", type=int, default=2000)
+    parser.add_argument("--orders", type=int, default=1_000_000, help="Total fetched_orders rows")
+    parser.add_argument("--owner-skew", type=float, default=1.0, help="Zipf exponent of orders per restaurant (0 = uniform)")
+    parser.add_argument("--owner-status-mix", default="approved=0.9,pending=0.07,rejected=0.03")
+    parser.add_argument("--days", type=int, default=90, help="Days of order history")
+    parser.add_argument("--pools-per-day", type=int, default=4, choices=range(1, len(POOL_SLOTS) + 1))
+    parser.add_argument("--items-min", type=int, default=1)
+    parser.add_argument("--items-max", type=int, default=6)
+    parser.add_argument("--menu-size", type=int, default=25, help="Distinct menu items per restaurant")
+    parser.add_argument("--decision-mix", default="accepted=0.78,rejected=0.07,auto_rejected=0.12,pending=0.03",
+                        help="Owner decisions; pending only applies to the latest pool")
+    parser.add_argument("--now", type=datetime.fromisoformat, default=None,
+                        help="Reference time (ISO 8601 with offset); fix it for byte-identical reruns")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12, help="Cost of the shared password hash")
+    parser.add_argument("--truncate", action="store_true", help="TRUNCATE the tables before loading (--dsn only)")
+    args = parser.parse_args(argv)
+
+    if not 1 <= args.items_min <= args.items_max:
+        parser.error("--items-min must be between 1 and --items-max")
+    if args.days < 1:
+        parser.error("--days must be at least 1")
+    try:
+        dataset = SyntheticDataset(args)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(f"🧪 Generating {len(dataset.owners):,} owners ({len(dataset.approved):,} approved) "
+          f"and {args.orders:,} orders over {args.days} days (seed {args.seed})")
+    started = time.perf_counter()
+    if args.dsn:
+        load_postgres(dataset, args.dsn, args.truncate)
+    else:
+        write_csv(dataset, args.csv_dir)
+        print(f"📁 Load with: cd {args.csv_dir} && psql \"$DATABASE_URL\" -f load.sql")
+    print(f"✅ Done in {time.perf_counter() - started:.1f}s")
+    print(f"   Log in as owner0@synthetic.khaogully.com / admin@synthetic.khaogully.com with password '{PASSWORD}'")
+
+
+if __name__ == "__main__":
+    main()
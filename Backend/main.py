@@ -1,18 +1,29 @@
+import asyncio
 import logging
-import os
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from config import settings
+from database import get_dbb
 from routes import auth, admin_auth, owner, admin, webhook
+from utils.dba_sync import run_dba_sync_worker
+from utils.reconciliation import run_reconciliation_job
+from utils.archive import run_archive_job
+from utils.restaurant_catalog import run_catalog_refresher
+from utils.item_analytics import check_rollup_timezone
+from utils.metrics import MetricsMiddleware, render_metrics
+from utils.request_accounting import DbAccountingMiddleware
+from utils.profiling import ProfilingMiddleware
+from utils.compression import CompressionMiddleware, skip_compression
+from utils.logging_config import setup_logging
+from utils.readiness import check_readiness
 
 # Ensure app logs (logger.info, etc.) are visible in console.
 # Uvicorn config mainly wires up its own loggers; without this, root has no handlers and INFO logs are dropped.
-_LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
-logging.basicConfig(
-    level=_LOG_LEVEL,
-    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
-)
+# Records are written by a background listener thread so handlers never block on log I/O.
+_LOG_LEVEL = settings.LOG_LEVEL
+setup_logging(level=_LOG_LEVEL, log_format=settings.LOG_FORMAT)
 logger = logging.getLogger(__name__)
 
 # Create FastAPI app
@@ -24,8 +35,8 @@ app = FastAPI(
 
 # Configure CORS
 origins = settings.CORS_ORIGINS.split(",")
-print(f"CORS Origins: {origins}")  # Debug: show loaded origins
-logger.info(f"Logging configured: level={_LOG_LEVEL}")
+logger.info("CORS origins: %s", origins)
+logger.info("Logging configured: level=%s format=%s", _LOG_LEVEL, settings.LOG_FORMAT)
 
 app.add_middleware(
     CORSMiddleware,
@@ -33,8 +44,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Content-Disposition", "X-DB-Queries", "X-DB-Time-Ms", "X-DB-Tables", "X-Profile-Id", "X-Profile-Status"],
 )
 
+app.add_middleware(DbAccountingMiddleware)
+
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(admin_auth.router)
@@ -42,6 +65,29 @@ app.include_router(owner.router)
 app.include_router(admin.router)
 app.include_router(webhook.router)
 
+# Background tasks started with the app
+_background_tasks = []
+
+@app.on_event("startup")
+async def start_background_tasks():
+    """Start background workers"""
+    if settings.DBA_SYNC_ENABLED:
+        _background_tasks.append(asyncio.create_task(run_dba_sync_worker()))
+    _background_tasks.append(asyncio.create_task(run_catalog_refresher()))
+    if settings.RECONCILE_INTERVAL_MINUTES > 0:
+        _background_tasks.append(asyncio.create_task(run_reconciliation_job()))
+    if settings.ORDER_ARCHIVE_ENABLED and settings.ORDER_ARCHIVE_INTERVAL_MINUTES > 0:
+        _background_tasks.append(asyncio.create_task(run_archive_job()))
+    _background_tasks.append(asyncio.create_task(asyncio.to_thread(check_rollup_timezone, get_dbb())))
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    """Cancel background workers"""
+    for task in _background_tasks:
+        task.cancel()
+    await asyncio.gather(*_background_tasks, return_exceptions=True)
+    _background_tasks.clear()
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -52,10 +98,28 @@ async def root():
     }
 
 @app.get("/health")
+@skip_compression
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy"}
 
+@app.get("/ready")
+@skip_compression
+async def readiness_check():
+    """
+    Readiness check: probes DBB, DBA and the push service (cached for READY_CACHE_SECONDS)
+    Returns 503 when a critical dependency is down so the load balancer drains this worker
+    """
+    result = await check_readiness()
+    return JSONResponse(result, status_code=200 if result["ready"] else 503)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics endpoint"""
+    if not settings.METRICS_ENABLED:
+        return PlainTextResponse("Metrics disabled\n", status_code=404)
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
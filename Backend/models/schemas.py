@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 
 # ============================================
@@ -85,6 +85,21 @@ class SubmitOrderResponse(BaseModel):
     order_id: str
     decision: str  # 'accepted' or 'rejected'
 
+class BulkSubmitOrderResponse(BaseModel):
+    decisions: List[SubmitOrderResponse] = Field(min_length=1, max_length=500)
+
+class OrderDecisionResult(BaseModel):
+    order_id: str
+    decision: str
+    success: bool
+    message: str
+
+class BulkSubmitOrderResult(BaseModel):
+    success: bool
+    processed_count: int
+    failed_count: int
+    results: List[OrderDecisionResult]
+
 # ============================================
 # Admin Schemas
 # ============================================
@@ -114,6 +129,40 @@ class MessageResponse(BaseModel):
     success: bool
     message: str
 
+class OwnerUidAssignment(BaseModel):
+    owner_id: str
+    restaurant_uid: str
+
+class BulkApproveOwnersRequest(BaseModel):
+    owners: List[OwnerUidAssignment] = Field(min_length=1, max_length=500)
+
+class BulkRejectOwnersRequest(BaseModel):
+    owner_ids: List[str] = Field(min_length=1, max_length=500)
+
+class OwnerActionResult(BaseModel):
+    owner_id: str
+    success: bool
+    message: str
+
+class BulkOwnerActionResult(BaseModel):
+    success: bool
+    processed_count: int
+    failed_count: int
+    results: List[OwnerActionResult]
+
+class RestaurantPendingCount(BaseModel):
+    restaurant_owner_id: str
+    restaurant_name: Optional[str] = None
+    pending_orders: int
+
+class AdminStatsResponse(BaseModel):
+    owners_by_status: Dict[str, int]
+    orders_ingested_today: int
+    decisions_today: Dict[str, int]
+    pending_by_restaurant: List[RestaurantPendingCount]
+    since: datetime
+    generated_at: datetime
+
 # ============================================
 # Earnings Schemas
 # ============================================
@@ -190,3 +239,85 @@ class ProfileData(BaseModel):
     bank_account_holder_name: Optional[str]
     upi_id: Optional[str]
 
+
+# ============================================
+# Dashboard Schemas
+# ============================================
+
+class OwnerDashboardResponse(BaseModel):
+    status: OwnerStatusResponse
+    orders: FetchOrdersResponse
+    earnings: EarningsSummary
+    profile: ProfileData
+
+# ============================================
+# Item Analytics Schemas
+# ============================================
+
+class TopItem(BaseModel):
+    menu_item_id: str
+    item_name: str
+    total_quantity: int
+    total_revenue: int  # Paise
+    order_count: int
+
+class TopItemsResponse(BaseModel):
+    since: datetime
+    until: datetime
+    items: List[TopItem]
+
+class ItemDailyPoint(BaseModel):
+    day: str  # YYYY-MM-DD in STATS_TIMEZONE
+    menu_item_id: str
+    item_name: str
+    total_quantity: int
+    total_revenue: int  # Paise
+
+class ItemDailyResponse(BaseModel):
+    since: datetime
+    until: datetime
+    points: List[ItemDailyPoint]
+
+class PoolItem(BaseModel):
+    menu_item_id: str
+    item_name: str
+    total_quantity: int
+    order_count: int
+
+class PoolItemDemand(BaseModel):
+    pool_id: str
+    pool_started_at: datetime
+    items: List[PoolItem]
+
+class PoolItemDemandResponse(BaseModel):
+    pools: List[PoolItemDemand]
+
+class ItemTotals(BaseModel):
+    menu_item_id: str
+    item_name: str
+    total_quantity: int
+    total_revenue: int  # Paise
+
+class DemandSlot(BaseModel):
+    weekday: int  # 0 = Monday
+    hour: int
+    expected_quantity: float
+
+class ExpectedItem(BaseModel):
+    menu_item_id: str
+    item_name: str
+    expected_quantity: float
+
+class UpcomingDemand(BaseModel):
+    weekday: int
+    hour: int
+    items: List[ExpectedItem]
+
+class ItemAnalyticsResponse(BaseModel):
+    days: int
+    since: str  # First local day in the window (YYYY-MM-DD)
+    top_by_quantity: List[ItemTotals]
+    top_by_revenue: List[ItemTotals]
+    forecast_weeks: int
+    demand_by_slot: List[DemandSlot]
+    upcoming: List[UpcomingDemand]
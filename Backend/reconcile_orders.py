@@ -0,0 +1,64 @@
+"""
+Order Status Reconciliation Script
+Finds orders whose status differs between Database B (fetched_orders /
+order_responses) and Database A (customer_orders) and repairs them.
+
+Usage:
+    python reconcile_orders.py                  # Detect and repair
+    python reconcile_orders.py --dry-run        # Only report drift
+    python reconcile_orders.py --report drift.json --chunk-size 1000
+
+Database A repairs are queued in dba_sync_outbox and applied by the
+backend's sync worker. Repairs go through the repair_order_status_drift RPC
+(Docs/create_repair_order_status_drift_function.sql), which skips orders the
+owner changed while the scan was running.
+"""
+
+import argparse
+import json
+import sys
+
+from utils.reconciliation import reconcile_order_statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconcile order statuses between Database B and Database A")
+    parser.add_argument("--dry-run", action="store_true", help="Report drift without repairing it")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Orders scanned per keyset page (default: 500)")
+    parser.add_argument("--max-chunks", type=int, default=None, help="Stop after this many pages")
+    parser.add_argument("--report", help="Write the drift report as JSON to this file")
+    args = parser.parse_args()
+
+    try:
+        report = reconcile_order_statuses(
+            chunk_size=args.chunk_size,
+            repair=not args.dry_run,
+            max_chunks=args.max_chunks
+        )
+    except Exception as e:
+        print(f"❌ Reconciliation failed: {str(e)}")
+        sys.exit(1)
+
+    print("\n" + "="*60)
+    print("ORDER STATUS RECONCILIATION" + (" (dry run)" if args.dry_run else ""))
+    print("="*60)
+    print(f"Scanned orders:        {report['scanned_orders']}")
+    print(f"Orders with responses: {report['responded_orders']}")
+    print(f"fetched_orders drift:  {report['dbb_mismatches']}")
+    print(f"customer_orders drift: {report['dba_mismatches']}")
+    print(f"Missing in Database A: {report['missing_in_dba']}")
+    print(f"Awaiting DBA sync:     {report['pending_dba_sync']}")
+    if not args.dry_run:
+        print(f"Repaired in DBB:       {report['repaired_dbb']}")
+        print(f"Queued for DBA:        {report['queued_dba_repairs']}")
+    print(f"Duration:              {report['duration_seconds']}s")
+    print("="*60 + "\n")
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Report written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
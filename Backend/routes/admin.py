@@ -1,43 +1,222 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import FileResponse
+from typing import Dict, List, Optional, Tuple
 from models.schemas import (
     PendingOwner,
     Restaurant,
     ApproveOwnerRequest,
-    MessageResponse
+    MessageResponse,
+    AdminStatsResponse,
+    BulkApproveOwnersRequest,
+    BulkRejectOwnersRequest,
+    OwnerActionResult,
+    BulkOwnerActionResult
 )
+from utils.cache import TTLCache
 from utils.dependencies import get_current_admin
-from database import get_dbb, get_dba
-from datetime import datetime
+from utils.orders import chunked, quote_filter_value
+from utils.restaurant_catalog import restaurant_catalog
+from utils.profiling import list_profiles, profile_file
+from utils.slow_queries import SORT_KEYS, slow_query_report
+from config import settings
+from database import get_dbb
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+import base64
+import json
+import uuid
 
 router = APIRouter(prefix="/api/admin", tags=["Admin Management"])
 
-@router.get("/pending-owners", response_model=List[PendingOwner])
-async def get_pending_owners(current_admin: dict = Depends(get_current_admin)):
+MAX_OWNERS_PAGE_SIZE = 200
+
+# Columns needed to build PendingOwner (never select password_hash or bank data)
+PENDING_OWNER_COLUMNS = (
+    "id, email, full_name, phone, restaurant_name, restaurant_address, "
+    "restaurant_phone, restaurant_email, approval_status, created_at"
+)
+
+# Columns matched by the `search` query parameter
+OWNER_SEARCH_COLUMNS = ("full_name", "email", "phone", "restaurant_name", "restaurant_phone")
+
+# Dashboard stats are cached briefly; owner status changes invalidate them
+admin_stats_cache = TTLCache(ttl_seconds=settings.ADMIN_STATS_CACHE_SECONDS, max_entries=1)
+
+def _start_of_today() -> datetime:
+    """Local midnight in STATS_TIMEZONE, as a UTC timestamp"""
+    now = datetime.now(ZoneInfo(settings.STATS_TIMEZONE))
+    return now.replace(hour=0, minute=0, second=0, microsecond=0).astimezone(timezone.utc)
+
+def _load_admin_stats() -> AdminStatsResponse:
+    dbb = get_dbb()
+    since = _start_of_today()
+    result = dbb.rpc("admin_dashboard_stats", {"p_since": since.isoformat()}).execute()
+    stats = result.data or {}
+    
+    return AdminStatsResponse(
+        owners_by_status=stats.get("owners_by_status") or {},
+        orders_ingested_today=stats.get("orders_ingested_today") or 0,
+        decisions_today=stats.get("decisions_today") or {},
+        pending_by_restaurant=stats.get("pending_by_restaurant") or [],
+        since=since,
+        generated_at=datetime.now(timezone.utc)
+    )
+
+def _is_uuid(value: str) -> bool:
+    try:
+        uuid.UUID(value)
+        return True
+    except (ValueError, AttributeError, TypeError):
+        return False
+
+def _fetch_owner_statuses(dbb, owner_ids: List[str]) -> Dict[str, str]:
+    """Look up approval_status for many owners with chunked `in_` queries"""
+    statuses = {}
+    for chunk in chunked(owner_ids):
+        result = dbb.table("restaurant_owners").select("id, approval_status").in_("id", chunk).execute()
+        statuses.update({owner["id"]: owner["approval_status"] for owner in result.data or []})
+    return statuses
+
+def _assign_restaurant_uids(dbb, assignments: Dict[str, str], approved_by: str, approve: bool) -> set:
     """
-    Get all restaurant owners with pending approval status
+    Apply {owner_id: restaurant_uid} in batches via bulk_assign_restaurant_uids
+    Returns the ids of the owners that were updated
+    """
+    updated = set()
+    owner_ids = list(assignments)
+    for chunk in chunked(owner_ids):
+        result = dbb.rpc("bulk_assign_restaurant_uids", {
+            "p_assignments": [
+                {"owner_id": owner_id, "restaurant_uid": assignments[owner_id]}
+                for owner_id in chunk
+            ],
+            "p_approved_by": approved_by,
+            "p_approve": approve
+        }).execute()
+        updated.update(row["owner_id"] for row in result.data or [])
+    return updated
+
+def _bulk_owner_result(owner_ids: List[str], results: Dict[str, OwnerActionResult]) -> BulkOwnerActionResult:
+    """Build the bulk response in request order (one entry per distinct owner)"""
+    ordered_results = []
+    for owner_id in owner_ids:
+        result = results.pop(owner_id, None)
+        if result:
+            ordered_results.append(result)
+    
+    failed_count = sum(1 for result in ordered_results if not result.success)
+    
+    return BulkOwnerActionResult(
+        success=failed_count == 0,
+        processed_count=len(ordered_results) - failed_count,
+        failed_count=failed_count,
+        results=ordered_results
+    )
+
+def _validate_uid_assignments(assignments, results: Dict[str, OwnerActionResult]) -> Dict[str, str]:
+    """Return {owner_id: restaurant_uid}; the last entry for a repeated owner wins"""
+    valid = {}
+    for item in assignments:
+        if not _is_uuid(item.owner_id) or not _is_uuid(item.restaurant_uid):
+            results[item.owner_id] = OwnerActionResult(
+                owner_id=item.owner_id,
+                success=False,
+                message="Invalid owner id or restaurant UID"
+            )
+            valid.pop(item.owner_id, None)
+        else:
+            valid[item.owner_id] = item.restaurant_uid
+            results.pop(item.owner_id, None)
+    return valid
+
+def _encode_owner_cursor(owner: dict) -> str:
+    raw = json.dumps([owner["created_at"], owner["id"]]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+def _decode_owner_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        created_at, owner_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(created_at), str(owner_id)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+def _list_owners(
+    response: Response,
+    limit: int,
+    cursor: Optional[str],
+    search: Optional[str],
+    approval_status: Optional[str] = None
+) -> List[PendingOwner]:
+    """
+    Fetch one keyset page of restaurant owners ordered by (created_at, id)
+    The cursor for the next page is returned in the X-Next-Cursor header
     """
     dbb = get_dbb()
     
+    query = dbb.table("restaurant_owners").select(PENDING_OWNER_COLUMNS)
+    if approval_status:
+        query = query.eq("approval_status", approval_status)
+    
+    conditions = []
+    search_term = (search or "").strip().replace("*", "").replace("%", "")
+    if search_term:
+        pattern = quote_filter_value(f"*{search_term}*")
+        conditions.append("or(" + ",".join(f"{column}.ilike.{pattern}" for column in OWNER_SEARCH_COLUMNS) + ")")
+    
+    if cursor:
+        created_at, owner_id = _decode_owner_cursor(cursor)
+        created_at, owner_id = quote_filter_value(created_at), quote_filter_value(owner_id)
+        conditions.append(f"or(created_at.gt.{created_at},and(created_at.eq.{created_at},id.gt.{owner_id}))")
+    
+    if conditions:
+        query = query.or_(f"and({','.join(conditions)})")
+    
+    # Fetch one extra row to know whether another page exists
+    result = query.order("created_at").order("id").limit(limit + 1).execute()
+    rows = result.data or []
+    
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = _encode_owner_cursor(rows[-1])
+    
+    return [PendingOwner(**owner) for owner in rows]
+
+@router.get("/stats", response_model=AdminStatsResponse)
+async def get_admin_stats(current_admin: dict = Depends(get_current_admin)):
+    """
+    Get dashboard counts: owners by approval status, orders ingested today,
+    today's decision mix and pending orders per restaurant
+    Computed by a single aggregate RPC and cached for ADMIN_STATS_CACHE_SECONDS
+    """
     try:
-        result = dbb.table("restaurant_owners").select("*").eq("approval_status", "pending").order("created_at").execute()
-        
-        return [
-            PendingOwner(
-                id=owner["id"],
-                email=owner["email"],
-                full_name=owner["full_name"],
-                phone=owner["phone"],
-                restaurant_name=owner["restaurant_name"],
-                restaurant_address=owner["restaurant_address"],
-                restaurant_phone=owner["restaurant_phone"],
-                restaurant_email=owner.get("restaurant_email"),
-                approval_status=owner["approval_status"],
-                created_at=owner["created_at"]
-            )
-            for owner in result.data
-        ]
+        return admin_stats_cache.get_or_set("stats", _load_admin_stats)
     
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch admin stats: {str(e)}"
+        )
+
+@router.get("/pending-owners", response_model=List[PendingOwner])
+async def get_pending_owners(
+    response: Response,
+    limit: int = Query(50, ge=1, le=MAX_OWNERS_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    search: Optional[str] = Query(None, max_length=100),
+    current_admin: dict = Depends(get_current_admin)
+):
+    """
+    Get restaurant owners with pending approval status (keyset paginated)
+    Pass the X-Next-Cursor response header as `cursor` to get the next page
+    """
+    try:
+        return _list_owners(response, limit, cursor, search, approval_status="pending")
+    
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -45,31 +224,24 @@ async def get_pending_owners(current_admin: dict = Depends(get_current_admin)):
         )
 
 @router.get("/all-owners", response_model=List[PendingOwner])
-async def get_all_owners(current_admin: dict = Depends(get_current_admin)):
+async def get_all_owners(
+    response: Response,
+    limit: int = Query(50, ge=1, le=MAX_OWNERS_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    search: Optional[str] = Query(None, max_length=100),
+    approval_status: Optional[str] = Query(None, pattern="^(pending|approved|rejected)$"),
+    current_admin: dict = Depends(get_current_admin)
+):
     """
-    Get all restaurant owners (pending, approved, rejected)
+    Get restaurant owners (all statuses, or one `approval_status`), keyset paginated
+    Pass the X-Next-Cursor response header as `cursor` to get the next page
+    (with the same search and approval_status)
     """
-    dbb = get_dbb()
-    
     try:
-        result = dbb.table("restaurant_owners").select("*").order("created_at").execute()
-        
-        return [
-            PendingOwner(
-                id=owner["id"],
-                email=owner["email"],
-                full_name=owner["full_name"],
-                phone=owner["phone"],
-                restaurant_name=owner["restaurant_name"],
-                restaurant_address=owner["restaurant_address"],
-                restaurant_phone=owner["restaurant_phone"],
-                restaurant_email=owner.get("restaurant_email"),
-                approval_status=owner["approval_status"],
-                created_at=owner["created_at"]
-            )
-            for owner in result.data
-        ]
+        return _list_owners(response, limit, cursor, search, approval_status)
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -79,22 +251,12 @@ async def get_all_owners(current_admin: dict = Depends(get_current_admin)):
 @router.get("/all-restaurants", response_model=List[Restaurant])
 async def get_all_restaurants(current_admin: dict = Depends(get_current_admin)):
     """
-    Fetch all restaurants from Database A for UID assignment
+    Get all restaurants from Database A for UID assignment
+    Served from the in-memory restaurant catalog (refreshed every RESTAURANT_CATALOG_TTL_SECONDS)
     """
-    dba = get_dba()
-    
     try:
-        result = dba.table("restaurants").select("id, name, address, phone").execute()
-        
-        return [
-            Restaurant(
-                id=restaurant["id"],
-                name=restaurant["name"],
-                address=restaurant.get("address"),
-                phone=restaurant.get("phone")
-            )
-            for restaurant in result.data
-        ]
+        await restaurant_catalog.ensure_loaded_async()
+        return [Restaurant(**restaurant) for restaurant in restaurant_catalog.all()]
     
     except Exception as e:
         raise HTTPException(
@@ -102,6 +264,25 @@ async def get_all_restaurants(current_admin: dict = Depends(get_current_admin)):
             detail=f"Failed to fetch restaurants: {str(e)}"
         )
 
+@router.get("/restaurants/search", response_model=List[Restaurant])
+async def search_restaurants(
+    q: str = Query("", max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    current_admin: dict = Depends(get_current_admin)
+):
+    """
+    Typeahead search over restaurant name, phone and address
+    Matches token prefixes and falls back to fuzzy matching for typos
+    """
+    try:
+        return [Restaurant(**restaurant) for restaurant in await restaurant_catalog.search_async(q, limit)]
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search restaurants: {str(e)}"
+        )
+
 @router.put("/approve-owner/{owner_id}", response_model=MessageResponse)
 async def approve_owner(
     owner_id: str,
@@ -130,6 +311,7 @@ async def approve_owner(
             "approved_at": datetime.utcnow().isoformat(),
             "approved_by": current_admin["id"]
         }).eq("id", owner_id).execute()
+        admin_stats_cache.invalidate()
         
         return MessageResponse(
             success=True,
@@ -168,6 +350,7 @@ async def reject_owner(
         dbb.table("restaurant_owners").update({
             "approval_status": "rejected"
         }).eq("id", owner_id).execute()
+        admin_stats_cache.invalidate()
         
         return MessageResponse(
             success=True,
@@ -230,3 +413,179 @@ async def assign_restaurant_uid(
         )
 
 
+
+@router.post("/bulk-approve-owners", response_model=BulkOwnerActionResult)
+async def bulk_approve_owners(
+    request: BulkApproveOwnersRequest,
+    current_admin: dict = Depends(get_current_admin)
+):
+    """
+    Approve many restaurant owners and assign their restaurant UIDs in one call
+    """
+    dbb = get_dbb()
+    
+    try:
+        results = {}
+        assignments = _validate_uid_assignments(request.owners, results)
+        
+        # Check all owners exist with one (chunked) query
+        existing = _fetch_owner_statuses(dbb, list(assignments))
+        for owner_id in [owner_id for owner_id in assignments if owner_id not in existing]:
+            assignments.pop(owner_id)
+            results[owner_id] = OwnerActionResult(
+                owner_id=owner_id,
+                success=False,
+                message="Restaurant owner not found"
+            )
+        
+        updated = _assign_restaurant_uids(dbb, assignments, current_admin["id"], approve=True)
+        for owner_id in assignments:
+            results[owner_id] = OwnerActionResult(
+                owner_id=owner_id,
+                success=owner_id in updated,
+                message=(
+                    "Restaurant owner approved and UID assigned successfully"
+                    if owner_id in updated else "Restaurant owner not found"
+                )
+            )
+        
+        if updated:
+            admin_stats_cache.invalidate()
+        
+        return _bulk_owner_result([item.owner_id for item in request.owners], results)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to approve owners: {str(e)}"
+        )
+
+@router.post("/bulk-reject-owners", response_model=BulkOwnerActionResult)
+async def bulk_reject_owners(
+    request: BulkRejectOwnersRequest,
+    current_admin: dict = Depends(get_current_admin)
+):
+    """
+    Reject many restaurant owners' applications in one call
+    """
+    dbb = get_dbb()
+    
+    try:
+        results = {}
+        owner_ids = list(dict.fromkeys(owner_id for owner_id in request.owner_ids if _is_uuid(owner_id)))
+        
+        existing = _fetch_owner_statuses(dbb, owner_ids)
+        found_ids = [owner_id for owner_id in owner_ids if owner_id in existing]
+        
+        # One set-based update per chunk
+        for chunk in chunked(found_ids):
+            dbb.table("restaurant_owners").update({
+                "approval_status": "rejected"
+            }).in_("id", chunk).execute()
+        
+        for owner_id in request.owner_ids:
+            found = owner_id in existing
+            results[owner_id] = OwnerActionResult(
+                owner_id=owner_id,
+                success=found,
+                message="Restaurant owner application rejected" if found else "Restaurant owner not found"
+            )
+        
+        if found_ids:
+            admin_stats_cache.invalidate()
+        
+        return _bulk_owner_result(request.owner_ids, results)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to reject owners: {str(e)}"
+        )
+
+@router.post("/bulk-assign-uid", response_model=BulkOwnerActionResult)
+async def bulk_assign_restaurant_uids(
+    request: BulkApproveOwnersRequest,
+    current_admin: dict = Depends(get_current_admin)
+):
+    """
+    Assign or update restaurant UIDs for many approved owners in one call
+    """
+    dbb = get_dbb()
+    
+    try:
+        results = {}
+        assignments = _validate_uid_assignments(request.owners, results)
+        
+        existing = _fetch_owner_statuses(dbb, list(assignments))
+        for owner_id in list(assignments):
+            if owner_id not in existing:
+                message = "Restaurant owner not found"
+            elif existing[owner_id] != "approved":
+                message = "Can only assign UID to approved owners"
+            else:
+                continue
+            assignments.pop(owner_id)
+            results[owner_id] = OwnerActionResult(owner_id=owner_id, success=False, message=message)
+        
+        updated = _assign_restaurant_uids(dbb, assignments, current_admin["id"], approve=False)
+        for owner_id in assignments:
+            results[owner_id] = OwnerActionResult(
+                owner_id=owner_id,
+                success=owner_id in updated,
+                message=(
+                    "Restaurant UID assigned successfully"
+                    if owner_id in updated else "Can only assign UID to approved owners"
+                )
+            )
+        
+        return _bulk_owner_result([item.owner_id for item in request.owners], results)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to assign UIDs: {str(e)}"
+        )
+
+@router.get("/slow-queries")
+async def get_slow_queries(
+    limit: int = Query(20, ge=1, le=200),
+    sort_by: str = Query("total_ms", pattern=f"^({'|'.join(SORT_KEYS)})$"),
+    current_admin: dict = Depends(get_current_admin)
+):
+    """
+    Top slow-query fingerprints (db.table.operation(filter columns)) over the
+    most recent SLOW_QUERY_BUFFER_SIZE slow queries, plus the latest samples
+    """
+    return slow_query_report(limit=limit, sort_by=sort_by)
+
+@router.get("/profiles")
+async def get_profiles(current_admin: dict = Depends(get_current_admin)):
+    """
+    List stored request profiles (newest first)
+    Profile a request by sending it with the header X-Profile: <admin access token>
+    """
+    return {"profiles": list_profiles()}
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(
+    profile_id: str,
+    part: str = Query("report", pattern="^(report|stacks)$"),
+    current_admin: dict = Depends(get_current_admin)
+):
+    """
+    Download a profile: `report` (top frames + allocations) or
+    `stacks` (collapsed stacks for speedscope / flamegraph.pl)
+    """
+    path = profile_file(profile_id, part)
+    if not path:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return FileResponse(path, media_type="text/plain", filename=f"profile-{profile_id}.{'folded' if part == 'stacks' else 'txt'}")
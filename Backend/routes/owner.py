@@ -1,36 +1,66 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import List, Optional
 from pydantic import BaseModel
+from postgrest.exceptions import APIError
 from models.schemas import (
     OwnerStatusResponse,
     FetchOrdersResponse,
-    CumulativeItem,
-    IndividualOrder,
-    OrderItem,
     SubmitOrderResponse,
+    BulkSubmitOrderResponse,
+    OrderDecisionResult,
+    BulkSubmitOrderResult,
     MessageResponse,
     EarningsSummary,
-    OrderTransaction,
     EarningsTransactionsResponse,
-    PendingEarnings,
     MonthlyEarnings,
     UpdateBankDetailsRequest,
-    ProfileData
+    ProfileData,
+    OwnerDashboardResponse,
+    TopItem,
+    TopItemsResponse,
+    ItemDailyPoint,
+    ItemDailyResponse,
+    PoolItem,
+    PoolItemDemand,
+    PoolItemDemandResponse,
+    ItemAnalyticsResponse
 )
+from config import settings
+from utils.archive import history_table
 from utils.dependencies import get_current_user
-from database import get_dbb, get_dba
-from datetime import datetime
+from utils.item_analytics import item_analytics
+from utils.exports import (
+    MEDIA_TYPES,
+    export_filename,
+    export_window,
+    stream_order_history,
+    stream_transactions
+)
+from utils.order_shaping import (
+    fetch_orders_payload,
+    order_transaction_payload,
+    shape_history_order
+)
+from utils.orders import (
+    DECISION_OUTCOME_MESSAGES,
+    OWNER_DECISIONS,
+    chunked,
+    auto_reject_orders,
+    sweep_active_orders
+)
+from database import get_dbb
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+import asyncio
 import logging
+import uuid
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/owner", tags=["Restaurant Owner"])
 
-@router.get("/status", response_model=OwnerStatusResponse)
-async def get_owner_status(current_user: dict = Depends(get_current_user)):
-    """
-    Get current restaurant owner's status and restaurant UID
-    """
+def _owner_status(current_user: dict) -> OwnerStatusResponse:
     status_text = current_user["approval_status"]
     restaurant_uid = current_user.get("restaurant_uid")
     
@@ -48,156 +78,87 @@ async def get_owner_status(current_user: dict = Depends(get_current_user)):
         message=message
     )
 
-@router.post("/fetch-orders", response_model=FetchOrdersResponse)
+@router.get("/status", response_model=OwnerStatusResponse)
+async def get_owner_status(current_user: dict = Depends(get_current_user)):
+    """
+    Get current restaurant owner's status and restaurant UID
+    """
+    return _owner_status(current_user)
+
+def _load_active_orders(dbb, current_user: dict, auto_reject: bool = True) -> dict:
+    """
+    Active orders (not yet sent for delivery) with decisions, as the fetch-orders payload
+    With auto_reject, pending orders older than 10 minutes are auto-rejected on the way
+    (a write: order_responses, fetched_orders and the Database A outbox)
+    """
+    logger.info(
+        "📦 Fetch orders called: owner_id=%s restaurant_phone=%s restaurant_uid=%s",
+        current_user.get("id"),
+        current_user.get("restaurant_phone"),
+        current_user.get("restaurant_uid"),
+    )
+    # Fetch only active orders (not yet sent for delivery)
+    result = dbb.table("fetched_orders").select(
+        "order_id, customer_name, customer_phone, items, subtotal, total_amount, payment_status, order_status, created_at, fetched_at"
+    ).eq("restaurant_owner_id", current_user["id"]).eq("sent_for_delivery", False).order("fetched_at", desc=True).execute()
+
+    logger.info(
+        "📦 fetched_orders query result: owner_id=%s count=%s",
+        current_user.get("id"),
+        len(result.data) if result.data else 0,
+    )
+    
+    if not result.data:
+        return {"cumulative_orders": [], "individual_orders": []}
+    
+    # Get all orders (not just from the latest batch)
+    orders = result.data
+    
+    # Get responses for these orders
+    order_ids = [order["order_id"] for order in orders]
+    responses_map = {}
+    for chunk in chunked(order_ids):
+        responses_result = dbb.table("order_responses").select(
+            "order_id, overall_status"
+        ).in_("order_id", chunk).execute()
+        # Create a map of order_id -> response status
+        responses_map.update({resp["order_id"]: resp["overall_status"] for resp in responses_result.data})
+    
+    # Auto-reject any pending orders that have been pending for more than 10 minutes
+    current_time = datetime.now(timezone.utc)
+    auto_reject_threshold = timedelta(minutes=10)
+    
+    stale_order_ids = []
+    for order in orders:
+        fetched_at = order.get("fetched_at")
+        if fetched_at and order["order_id"] not in responses_map:
+            fetched_time = datetime.fromisoformat(fetched_at.replace('Z', '+00:00'))
+            if current_time - fetched_time > auto_reject_threshold:
+                stale_order_ids.append(order["order_id"])
+    
+    if stale_order_ids and auto_reject:
+        try:
+            for order_id in auto_reject_orders(dbb, current_user["id"], stale_order_ids):
+                responses_map[order_id] = "auto_rejected"
+        except Exception as e:
+            # Log error but still return the orders
+            logger.error("Error auto-rejecting %s stale order(s): %s", len(stale_order_ids), e)
+    
+    return fetch_orders_payload(orders, responses_map)
+
+# fetch-orders, order-history and earnings-transactions return ORJSONResponse
+# directly: payloads are shaped from trusted DB rows (utils/order_shaping.py),
+# so FastAPI skips the response_model re-validation and orjson does the encoding.
+@router.post("/fetch-orders", response_model=FetchOrdersResponse, response_class=ORJSONResponse)
 async def fetch_orders(current_user: dict = Depends(get_current_user)):
     """
     Fetch orders from Database B (fetched_orders table) for the restaurant owner
     Returns all orders from the current session (based on fetched_at timestamp)
     """
     dbb = get_dbb()
-    dba = get_dba()
     
     try:
-        logger.info(
-            "📦 Fetch orders called: owner_id=%s restaurant_phone=%s restaurant_uid=%s",
-            current_user.get("id"),
-            current_user.get("restaurant_phone"),
-            current_user.get("restaurant_uid"),
-        )
-        # Fetch only active orders (not yet sent for delivery)
-        result = dbb.table("fetched_orders").select(
-            "order_id, customer_name, customer_phone, items, subtotal, total_amount, payment_status, order_status, created_at, fetched_at"
-        ).eq("restaurant_owner_id", current_user["id"]).eq("sent_for_delivery", False).order("fetched_at", desc=True).execute()
-
-        logger.info(
-            "📦 fetched_orders query result: owner_id=%s count=%s",
-            current_user.get("id"),
-            len(result.data) if result.data else 0,
-        )
-        
-        if not result.data:
-            return FetchOrdersResponse(
-                cumulative_orders=[],
-                individual_orders=[]
-            )
-        
-        # Auto-reject any pending orders that have been pending for more than 10 minutes
-        from datetime import datetime, timedelta, timezone
-        current_time = datetime.now(timezone.utc)
-        auto_reject_threshold = timedelta(minutes=10)
-        
-        for order in result.data:
-            fetched_at = order.get("fetched_at")
-            if fetched_at:
-                try:
-                    # Parse the fetched_at timestamp
-                    fetched_time = datetime.fromisoformat(fetched_at.replace('Z', '+00:00'))
-                    time_elapsed = current_time - fetched_time
-                    
-                    # Check if order has been pending for more than 10 minutes
-                    if time_elapsed > auto_reject_threshold:
-                        order_id = order["order_id"]
-                        
-                        # Check if this order already has a response
-                        existing_response = dbb.table("order_responses").select("order_id").eq("order_id", order_id).execute()
-                        
-                        if not existing_response.data:
-                            # No response yet - auto-reject it
-                            # Insert auto-rejection response
-                            dbb.table("order_responses").insert({
-                                "restaurant_owner_id": current_user["id"],
-                                "order_id": order_id,
-                                "overall_status": "auto_rejected",
-                                "synced_to_dba": True
-                            }).execute()
-                            
-                            # Update order status in Database A
-                            try:
-                                dba.table("customer_orders").update({
-                                    "status": "auto_rejected"
-                                }).eq("id", order_id).execute()
-                            except:
-                                pass  # Continue even if DBA update fails
-                            
-                            # Update order status in Database B
-                            dbb.table("fetched_orders").update({
-                                "order_status": "auto_rejected"
-                            }).eq("order_id", order_id).execute()
-                            
-                            # Update the order in result.data to reflect the auto-rejection
-                            order["order_status"] = "auto_rejected"
-                except Exception as e:
-                    # Log error but continue processing other orders
-                    print(f"Error auto-rejecting order {order.get('order_id')}: {str(e)}")
-                    pass
-        
-        # Get all orders (not just from the latest batch)
-        orders = result.data
-        
-        # Get responses for these orders
-        order_ids = [order["order_id"] for order in orders]
-        responses_result = dbb.table("order_responses").select(
-            "order_id, overall_status"
-        ).in_("order_id", order_ids).execute()
-        
-        # Create a map of order_id -> response status
-        responses_map = {resp["order_id"]: resp["overall_status"] for resp in responses_result.data}
-        
-        # Process orders
-        individual_orders = []
-        cumulative_items = {}
-        
-        for order in orders:
-            # Parse items
-            order_items = []
-            for item in order["items"]:
-                order_item = OrderItem(
-                    menu_item_id=item.get("menu_item_id", ""),
-                    name=item.get("name", ""),
-                    quantity=item.get("quantity", 0),
-                    unit_price=item.get("unit_price", 0),
-                    customizations=item.get("customizations"),
-                    subtotal=item.get("subtotal", 0)
-                )
-                order_items.append(order_item)
-                
-                # Aggregate for cumulative view (all items, regardless of status)
-                item_name = item.get("name", "")
-                quantity = item.get("quantity", 0)
-                
-                if item_name in cumulative_items:
-                    cumulative_items[item_name] += quantity
-                else:
-                    cumulative_items[item_name] = quantity
-            
-            # Check if this order has a response
-            order_id = order["order_id"]
-            has_response = order_id in responses_map
-            response_status = responses_map.get(order_id, order["order_status"])
-            
-            # Create individual order
-            individual_order = IndividualOrder(
-                order_id=order_id,
-                customer_name=order.get("customer_name", "Unknown"),
-                customer_phone=order.get("customer_phone", "N/A"),
-                items=order_items,
-                total_amount=order.get("subtotal") or order["total_amount"],  # Use subtotal (what restaurant receives), fallback to total_amount for old data
-                fetched_at=order.get("fetched_at"),
-                order_status=response_status,
-                responded=has_response
-            )
-            individual_orders.append(individual_order)
-        
-        # Create cumulative items list
-        cumulative_orders = [
-            CumulativeItem(item_name=name, total_quantity=qty)
-            for name, qty in cumulative_items.items()
-        ]
-        
-        return FetchOrdersResponse(
-            cumulative_orders=cumulative_orders,
-            individual_orders=individual_orders
-        )
+        return ORJSONResponse(_load_active_orders(dbb, current_user))
     
     except Exception as e:
         raise HTTPException(
@@ -205,7 +166,7 @@ async def fetch_orders(current_user: dict = Depends(get_current_user)):
             detail=f"Failed to fetch orders: {str(e)}"
         )
 
-@router.get("/order-history")
+@router.get("/order-history", response_class=ORJSONResponse)
 async def get_order_history(current_user: dict = Depends(get_current_user)):
     """
     Get order history for the restaurant owner - all orders from Database B
@@ -214,42 +175,35 @@ async def get_order_history(current_user: dict = Depends(get_current_user)):
     
     try:
         # Fetch all orders from Database B (fetched_orders table)
-        result = dbb.table("fetched_orders").select(
+        result = dbb.table(history_table("fetched_orders")).select(
             "order_id, customer_name, customer_phone, items, subtotal, total_amount, payment_status, order_status, created_at"
         ).eq("restaurant_owner_id", current_user["id"]).order("created_at", desc=True).execute()
         
         if not result.data:
-            return {"orders": [], "total_count": 0}
+            return ORJSONResponse({"orders": [], "total_count": 0})
         
         orders = result.data
-        history_orders = []
-        
-        for order in orders:
-            # Get response details from Database B if exists
-            response_result = dbb.table("order_responses").select(
-                "overall_status, responded_at"
-            ).eq("order_id", order["order_id"]).execute()
-            
-            response_data = None
-            if response_result.data:
-                response_data = response_result.data[0]
-            
-            history_orders.append({
-                "order_id": order["order_id"],
-                "customer_name": order.get("customer_name", "Unknown"),
-                "customer_phone": order.get("customer_phone", "N/A"),
-                "items": order["items"],
-                "total_amount": order.get("subtotal") or order["total_amount"],  # Use subtotal (what restaurant receives), fallback to total_amount for old data
-                "payment_status": order.get("payment_status"),
-                "order_status": order.get("order_status"),
-                "created_at": order.get("created_at"),
-                "response": response_data
+        
+        # Get response details from Database B for all orders (chunked, not one query per order)
+        responses_map = {}
+        for chunk in chunked([order["order_id"] for order in orders]):
+            responses_result = dbb.table(history_table("order_responses")).select(
+                "order_id, overall_status, responded_at"
+            ).in_("order_id", chunk).execute()
+            responses_map.update({
+                resp["order_id"]: {"overall_status": resp["overall_status"], "responded_at": resp["responded_at"]}
+                for resp in responses_result.data or []
             })
         
-        return {
+        history_orders = [
+            shape_history_order(order, responses_map.get(order["order_id"]))
+            for order in orders
+        ]
+        
+        return ORJSONResponse({
             "orders": history_orders,
             "total_count": len(history_orders)
-        }
+        })
     
     except Exception as e:
         raise HTTPException(
@@ -258,6 +212,37 @@ async def get_order_history(current_user: dict = Depends(get_current_user)):
         )
 
 
+def _export_response(chunks, export_format: str, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+def _check_export_range(from_date: Optional[date], to_date: Optional[date]) -> None:
+    if from_date and to_date and from_date > to_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="from_date must not be after to_date"
+        )
+
+@router.get("/export/order-history")
+async def export_order_history(
+    current_user: dict = Depends(get_current_user),
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None
+):
+    """
+    Download order history as CSV or NDJSON, streamed page by page
+    Dates are inclusive local days (STATS_TIMEZONE) of when orders reached the restaurant
+    """
+    _check_export_range(from_date, to_date)
+    since, until = export_window(from_date, to_date)
+    chunks = stream_order_history(get_dbb(), current_user["id"], format, since, until)
+    return _export_response(chunks, format, export_filename("order-history", format, from_date, to_date))
+
+
 @router.post("/submit-response", response_model=MessageResponse)
 async def submit_order_response(
     response_data: SubmitOrderResponse,
@@ -265,10 +250,9 @@ async def submit_order_response(
 ):
     """
     Submit restaurant owner's accept/reject decision for a single order
-    Updates order status in Database A and stores response in Database B
+    Stores response in Database B and queues the Database A status update
     """
     dbb = get_dbb()
-    dba = get_dba()
     
     try:
         order_id = response_data.order_id
@@ -280,41 +264,46 @@ async def submit_order_response(
                 detail="Decision must be 'accepted' or 'rejected'"
             )
         
-        # Check if response already exists for this order_id
-        existing_response = dbb.table("order_responses").select("id").eq(
-            "order_id", order_id
-        ).execute()
-        
-        response_payload = {
-            "restaurant_owner_id": current_user["id"],
-            "order_id": order_id,
-            "overall_status": decision,
-            "synced_to_dba": True,
-            "responded_at": "now()"
-        }
-        
-        if existing_response.data:
-            # Update existing response
-            dbb.table("order_responses").update(response_payload).eq(
-                "order_id", order_id
-            ).execute()
-        else:
-            # Insert new response
-            dbb.table("order_responses").insert(response_payload).execute()
-        
-        # Update order status in Database A
-        dba.table("customer_orders").update({
-            "status": decision
-        }).eq("id", order_id).execute()
-        
-        # Update order status in Database B (fetched_orders)
-        dbb.table("fetched_orders").update({
-            "order_status": decision
-        }).eq("order_id", order_id).execute()
+        # Malformed ids would fail the UUID cast in the RPC (22P02)
+        try:
+            order_id = str(uuid.UUID(order_id))
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="order_id must be a UUID"
+            )
         
+        # Record the response, update fetched_orders and queue the Database A
+        # sync atomically in Database B (see Docs/create_dba_sync_outbox.sql)
+        try:
+            dbb.rpc("submit_order_decision", {
+                "p_owner_id": current_user["id"],
+                "p_order_id": order_id,
+                "p_decision": decision
+            }).execute()
+        except APIError as e:
+            if e.code == "22P02":
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="order_id must be a UUID"
+                )
+            if e.code == "P0002":
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Order not found"
+                )
+            if e.code == "55000":
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Order is already closed and can no longer be changed"
+                )
+            raise
+
+        # The Database A status update is queued by submit_order_decision
+        # and written by the sync worker (utils/dba_sync.py)
         return MessageResponse(
             success=True,
-            message=f"Order {decision} and synced successfully!"
+            message=f"Order {decision} successfully!"
         )
     
     except HTTPException:
@@ -326,6 +315,97 @@ async def submit_order_response(
         )
 
 
+@router.post("/submit-responses", response_model=BulkSubmitOrderResult)
+async def submit_order_responses(
+    request: BulkSubmitOrderResponse,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Submit accept/reject decisions for many orders in one call
+    All decisions are applied atomically by one Database B call under the same
+    rules as submit-response; Database A is synced in the background
+    """
+    dbb = get_dbb()
+
+    try:
+        results = {}
+        decisions = {}
+
+        # Validate decisions; the last decision for a repeated order_id wins
+        for item in request.decisions:
+            if item.decision not in OWNER_DECISIONS:
+                results[item.order_id] = OrderDecisionResult(
+                    order_id=item.order_id,
+                    decision=item.decision,
+                    success=False,
+                    message="Decision must be 'accepted' or 'rejected'"
+                )
+                decisions.pop(item.order_id, None)
+            else:
+                decisions[item.order_id] = item.decision
+                results.pop(item.order_id, None)
+
+        # Invalid ids cannot match an order (and would fail the UUID cast);
+        # results are reported under the id the client sent
+        sent_ids = {}
+        for order_id in list(decisions):
+            try:
+                sent_ids[str(uuid.UUID(order_id))] = order_id
+            except ValueError:
+                results[order_id] = OrderDecisionResult(
+                    order_id=order_id,
+                    decision=decisions.pop(order_id),
+                    success=False,
+                    message="Order not found"
+                )
+
+        if decisions:
+            # Lock, check, record and queue the Database A sync for every order
+            # in one transaction, with the same closed-order rule as
+            # submit_order_decision (see Docs/create_submit_order_decisions_function.sql)
+            outcomes = dbb.rpc("submit_order_decisions", {
+                "p_owner_id": current_user["id"],
+                "p_decisions": [
+                    {"order_id": canonical_id, "decision": decisions[order_id]}
+                    for canonical_id, order_id in sent_ids.items()
+                ]
+            }).execute().data or []
+
+            for outcome in outcomes:
+                order_id = sent_ids.get(str(outcome["order_id"]), str(outcome["order_id"]))
+                message = DECISION_OUTCOME_MESSAGES.get(outcome["outcome"])
+                results[order_id] = OrderDecisionResult(
+                    order_id=order_id,
+                    decision=outcome["decision"],
+                    success=message is None,
+                    message=message or f"Order {outcome['decision']} successfully!"
+                )
+
+        # Preserve request order in the response
+        ordered_results = []
+        for item in request.decisions:
+            result = results.pop(item.order_id, None)
+            if result:
+                ordered_results.append(result)
+
+        failed_count = sum(1 for result in ordered_results if not result.success)
+
+        return BulkSubmitOrderResult(
+            success=failed_count == 0,
+            processed_count=len(ordered_results) - failed_count,
+            failed_count=failed_count,
+            results=ordered_results
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to submit responses: {str(e)}"
+        )
+
+
 @router.post("/auto-reject-pending", response_model=MessageResponse)
 async def auto_reject_pending(current_user: dict = Depends(get_current_user)):
     """
@@ -333,57 +413,18 @@ async def auto_reject_pending(current_user: dict = Depends(get_current_user)):
     This is triggered after 10 minutes from when orders were fetched
     """
     dbb = get_dbb()
-    dba = get_dba()
     
     try:
-        # Get all active orders that haven't been sent for delivery yet
-        active_orders = dbb.table("fetched_orders").select(
-            "order_id"
-        ).eq("restaurant_owner_id", current_user["id"]).eq("sent_for_delivery", False).execute()
+        # Auto-reject every active order that has no response yet
+        active_order_ids, auto_rejected_ids = sweep_active_orders(dbb, current_user["id"])
         
-        if not active_orders.data:
+        if not active_order_ids:
             return MessageResponse(
                 success=True,
                 message="No active orders to process"
             )
         
-        order_ids = [order["order_id"] for order in active_orders.data]
-        
-        # Check which orders don't have responses yet
-        existing_responses = dbb.table("order_responses").select(
-            "order_id"
-        ).in_("order_id", order_ids).execute()
-        
-        responded_order_ids = {resp["order_id"] for resp in existing_responses.data} if existing_responses.data else set()
-        pending_order_ids = [oid for oid in order_ids if oid not in responded_order_ids]
-        
-        # Auto-reject only the pending orders
-        auto_rejected_count = 0
-        if pending_order_ids:
-            for order_id in pending_order_ids:
-                # Insert auto-rejection response
-                dbb.table("order_responses").insert({
-                    "restaurant_owner_id": current_user["id"],
-                    "order_id": order_id,
-                    "overall_status": "auto_rejected",
-                    "synced_to_dba": True
-                }).execute()
-                
-                # Update order status in Database A
-                try:
-                    dba.table("customer_orders").update({
-                        "status": "auto_rejected"
-                    }).eq("id", order_id).execute()
-                except:
-                    pass  # Continue even if DBA update fails
-                
-                # Update order status in Database B
-                dbb.table("fetched_orders").update({
-                    "order_status": "auto_rejected"
-                }).eq("order_id", order_id).execute()
-                
-                auto_rejected_count += 1
-        
+        auto_rejected_count = len(auto_rejected_ids)
         message = f"Auto-rejected {auto_rejected_count} pending order(s)"
         
         return MessageResponse(
@@ -406,56 +447,18 @@ async def mark_orders_sent(current_user: dict = Depends(get_current_user)):
     This is used when owner clicks "Mark as Sent" or when 30-minute timer expires
     """
     dbb = get_dbb()
-    dba = get_dba()
     
     try:
-        # First, get all orders that are about to be marked as sent
-        active_orders = dbb.table("fetched_orders").select(
-            "order_id"
-        ).eq("restaurant_owner_id", current_user["id"]).eq("sent_for_delivery", False).execute()
+        # First, auto-reject pending orders among those about to be marked as sent
+        active_order_ids, auto_rejected_ids = sweep_active_orders(dbb, current_user["id"])
         
-        if not active_orders.data:
+        if not active_order_ids:
             return MessageResponse(
                 success=True,
                 message="No active orders to mark as sent"
             )
         
-        order_ids = [order["order_id"] for order in active_orders.data]
-        
-        # Check which orders don't have responses yet
-        existing_responses = dbb.table("order_responses").select(
-            "order_id"
-        ).in_("order_id", order_ids).execute()
-        
-        responded_order_ids = {resp["order_id"] for resp in existing_responses.data} if existing_responses.data else set()
-        pending_order_ids = [oid for oid in order_ids if oid not in responded_order_ids]
-        
-        # Auto-reject pending orders
-        auto_rejected_count = 0
-        if pending_order_ids:
-            for order_id in pending_order_ids:
-                # Insert auto-rejection response
-                dbb.table("order_responses").insert({
-                    "restaurant_owner_id": current_user["id"],
-                    "order_id": order_id,
-                    "overall_status": "auto_rejected",
-                    "synced_to_dba": True
-                }).execute()
-                
-                # Update order status in Database A
-                try:
-                    dba.table("customer_orders").update({
-                        "status": "auto_rejected"
-                    }).eq("id", order_id).execute()
-                except:
-                    pass  # Continue even if DBA update fails
-                
-                # Update order status in Database B
-                dbb.table("fetched_orders").update({
-                    "order_status": "auto_rejected"
-                }).eq("order_id", order_id).execute()
-                
-                auto_rejected_count += 1
+        auto_rejected_count = len(auto_rejected_ids)
         
         # Now mark all orders as sent for delivery
         result = dbb.table("fetched_orders").update({
@@ -484,6 +487,52 @@ async def mark_orders_sent(current_user: dict = Depends(get_current_user)):
 # Earnings Endpoints
 # ============================================
 
+def _load_earnings_data(dbb, restaurant_id: str, columns: str = "*") -> Optional[dict]:
+    """The owner's restaurant_earnings_data row, if earnings have been synced yet"""
+    result = dbb.table("restaurant_earnings_data").select(columns).eq("restaurant_id", restaurant_id).execute()
+    return result.data[0] if result.data else None
+
+def _earnings_summary(current_user: dict, earnings_data: Optional[dict]) -> EarningsSummary:
+    if not earnings_data:
+        # Return default values if no earnings data exists yet
+        return EarningsSummary(
+            restaurant_id=current_user["id"],
+            restaurant_name=current_user.get("restaurant_name", "Unknown"),
+            restaurant_phone=current_user.get("restaurant_phone"),
+            restaurant_email=current_user.get("restaurant_email"),
+            total_lifetime_earnings=0.0,
+            total_completed_orders=0,
+            commission_rate=0.20,  # Default commission rate
+            total_commission_paid=0.0,
+            has_bank_details=False,
+            bank_account_number=None,
+            bank_ifsc_code=None,
+            bank_account_holder_name=None,
+            upi_id=None,
+            last_synced_at=datetime.now(),
+            data_sent_by=None,
+            sync_status="pending"
+        )
+    
+    return EarningsSummary(
+        restaurant_id=earnings_data["restaurant_id"],
+        restaurant_name=earnings_data["restaurant_name"],
+        restaurant_phone=earnings_data.get("restaurant_phone"),
+        restaurant_email=earnings_data.get("restaurant_email"),
+        total_lifetime_earnings=float(earnings_data["total_lifetime_earnings"]),
+        total_completed_orders=earnings_data["total_completed_orders"],
+        commission_rate=float(earnings_data["commission_rate"]),
+        total_commission_paid=float(earnings_data["total_commission_paid"]),
+        has_bank_details=earnings_data["has_bank_details"],
+        bank_account_number=earnings_data.get("bank_account_number"),
+        bank_ifsc_code=earnings_data.get("bank_ifsc_code"),
+        bank_account_holder_name=earnings_data.get("bank_account_holder_name"),
+        upi_id=earnings_data.get("upi_id"),
+        last_synced_at=earnings_data["last_synced_at"],
+        data_sent_by=earnings_data.get("data_sent_by"),
+        sync_status=earnings_data["sync_status"]
+    )
+
 @router.get("/earnings-summary", response_model=EarningsSummary)
 async def get_earnings_summary(current_user: dict = Depends(get_current_user)):
     """
@@ -493,52 +542,7 @@ async def get_earnings_summary(current_user: dict = Depends(get_current_user)):
     
     try:
         # Use restaurant_id directly from current_user (already contains the UUID)
-        restaurant_id = current_user["id"]
-        
-        # Fetch earnings data (including commission_rate)
-        result = dbb.table("restaurant_earnings_data").select("*").eq("restaurant_id", restaurant_id).execute()
-        
-        if not result.data:
-            # Return default values if no earnings data exists yet
-            return EarningsSummary(
-                restaurant_id=restaurant_id,
-                restaurant_name=current_user.get("restaurant_name", "Unknown"),
-                restaurant_phone=current_user.get("restaurant_phone"),
-                restaurant_email=current_user.get("restaurant_email"),
-                total_lifetime_earnings=0.0,
-                total_completed_orders=0,
-                commission_rate=0.20,  # Default commission rate
-                total_commission_paid=0.0,
-                has_bank_details=False,
-                bank_account_number=None,
-                bank_ifsc_code=None,
-                bank_account_holder_name=None,
-                upi_id=None,
-                last_synced_at=datetime.now(),
-                data_sent_by=None,
-                sync_status="pending"
-            )
-        
-        earnings_data = result.data[0]
-        
-        return EarningsSummary(
-            restaurant_id=earnings_data["restaurant_id"],
-            restaurant_name=earnings_data["restaurant_name"],
-            restaurant_phone=earnings_data.get("restaurant_phone"),
-            restaurant_email=earnings_data.get("restaurant_email"),
-            total_lifetime_earnings=float(earnings_data["total_lifetime_earnings"]),
-            total_completed_orders=earnings_data["total_completed_orders"],
-            commission_rate=float(earnings_data["commission_rate"]),
-            total_commission_paid=float(earnings_data["total_commission_paid"]),
-            has_bank_details=earnings_data["has_bank_details"],
-            bank_account_number=earnings_data.get("bank_account_number"),
-            bank_ifsc_code=earnings_data.get("bank_ifsc_code"),
-            bank_account_holder_name=earnings_data.get("bank_account_holder_name"),
-            upi_id=earnings_data.get("upi_id"),
-            last_synced_at=earnings_data["last_synced_at"],
-            data_sent_by=earnings_data.get("data_sent_by"),
-            sync_status=earnings_data["sync_status"]
-        )
+        return _earnings_summary(current_user, _load_earnings_data(dbb, current_user["id"]))
     
     except HTTPException:
         raise
@@ -549,7 +553,7 @@ async def get_earnings_summary(current_user: dict = Depends(get_current_user)):
         )
 
 
-@router.get("/earnings-transactions", response_model=EarningsTransactionsResponse)
+@router.get("/earnings-transactions", response_model=EarningsTransactionsResponse, response_class=ORJSONResponse)
 async def get_earnings_transactions(
     current_user: dict = Depends(get_current_user),
     limit: int = 50,
@@ -574,7 +578,7 @@ async def get_earnings_transactions(
             pending_amount = float(earnings_result.data[0]["pending_earnings"])
         
         # Fetch orders from fetched_orders
-        query = dbb.table("fetched_orders").select("*").eq("restaurant_owner_id", restaurant_id)
+        query = dbb.table(history_table("fetched_orders")).select("*").eq("restaurant_owner_id", restaurant_id)
         
         # Get total count
         count_result = query.execute()
@@ -589,60 +593,25 @@ async def get_earnings_transactions(
         # Fetch order responses for these orders
         responses_map = {}
         if order_ids:
-            responses_result = dbb.table("order_responses").select("order_id, overall_status, responded_at").in_("order_id", order_ids).execute()
+            responses_result = dbb.table(history_table("order_responses")).select("order_id, overall_status, responded_at").in_("order_id", order_ids).execute()
             if responses_result.data:
                 responses_map = {resp["order_id"]: resp for resp in responses_result.data}
         
-        transactions = []
-        pending_orders = 0
-        if result.data:
-            for order in result.data:
-                # Convert amount from paise to rupees
-                # Use subtotal (what restaurant receives) instead of total_amount
-                order_subtotal = order.get("subtotal") or order["total_amount"]
-                order_total = float(order_subtotal) / 100.0
-                platform_commission = order_total * commission_rate
-                delivery_fee = 0.0  # No delivery fee data in fetched_orders
-                net_amount = order_total - platform_commission
-                
-                # Get order status from order_responses if available
-                order_response = responses_map.get(order["order_id"])
-                overall_status = order_response.get("overall_status") if order_response else None
-                
-                # Determine if paid (check if order is accepted and completed)
-                # For now, treat accepted orders as pending payment
-                is_paid = False  # Will be updated when actual payment system is integrated
-                if not is_paid:
-                    pending_orders += 1
-                
-                transactions.append(OrderTransaction(
-                    id=str(order["id"]),
-                    transaction_id=str(order["order_id"]),
-                    restaurant_id=restaurant_id,
-                    order_id=str(order["order_id"]),
-                    order_date=order.get("created_at", order["fetched_at"]),
-                    customer_name=order.get("customer_name"),
-                    customer_phone=order.get("customer_phone"),
-                    delivery_address=None,  # Not available in fetched_orders
-                    order_total=order_total,
-                    platform_commission=platform_commission,
-                    delivery_fee=delivery_fee,
-                    net_amount=net_amount,
-                    is_paid=is_paid,
-                    paid_at=None if not is_paid else order.get("created_at"),
-                    payout_cycle_id=None,
-                    payout_reference=None,
-                    synced_at=order["fetched_at"]
-                ))
-        
-        return EarningsTransactionsResponse(
-            transactions=transactions,
-            total_count=total_count,
-            pending_earnings=PendingEarnings(
-                pending_amount=pending_amount,
-                pending_orders=pending_orders
-            )
-        )
+        transactions = [
+            order_transaction_payload(order, restaurant_id, commission_rate)
+            for order in result.data or []
+        ]
+        # Every transaction is unpaid until the payment system is integrated
+        pending_orders = sum(1 for transaction in transactions if not transaction["is_paid"])
+        
+        return ORJSONResponse({
+            "transactions": transactions,
+            "total_count": total_count,
+            "pending_earnings": {
+                "pending_amount": pending_amount,
+                "pending_orders": pending_orders
+            }
+        })
     
     except HTTPException:
         raise
@@ -653,6 +622,34 @@ async def get_earnings_transactions(
         )
 
 
+@router.get("/export/transactions")
+async def export_transactions(
+    current_user: dict = Depends(get_current_user),
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None
+):
+    """
+    Download earnings transactions as CSV or NDJSON, streamed page by page
+    """
+    _check_export_range(from_date, to_date)
+    dbb = get_dbb()
+    restaurant_id = current_user["id"]
+    
+    try:
+        earnings_result = dbb.table("restaurant_earnings_data").select("commission_rate").eq("restaurant_id", restaurant_id).execute()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to export transactions: {str(e)}"
+        )
+    commission_rate = float(earnings_result.data[0]["commission_rate"]) if earnings_result.data else 0.20
+    
+    since, until = export_window(from_date, to_date)
+    chunks = stream_transactions(dbb, restaurant_id, commission_rate, format, since, until)
+    return _export_response(chunks, format, export_filename("transactions", format, from_date, to_date))
+
+
 @router.get("/earnings-monthly", response_model=List[MonthlyEarnings])
 async def get_monthly_earnings(current_user: dict = Depends(get_current_user)):
     """
@@ -672,7 +669,7 @@ async def get_monthly_earnings(current_user: dict = Depends(get_current_user)):
         
         # Fetch all orders from the last 6 months
         six_months_ago = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        result = dbb.table("fetched_orders").select(
+        result = dbb.table(history_table("fetched_orders")).select(
             "created_at, subtotal, total_amount, order_status"
         ).eq("restaurant_owner_id", restaurant_id).gte(
             "created_at", six_months_ago.isoformat()
@@ -726,6 +723,23 @@ async def get_monthly_earnings(current_user: dict = Depends(get_current_user)):
             detail=f"Failed to fetch monthly earnings: {str(e)}"
         )
 
+def _profile(current_user: dict, earnings_data: Optional[dict]) -> ProfileData:
+    # Bank details live in restaurant_earnings_data, if it exists yet
+    bank_details = earnings_data or {}
+    return ProfileData(
+        full_name=current_user["full_name"],
+        email=current_user["email"],
+        phone=current_user["phone"],
+        restaurant_name=current_user["restaurant_name"],
+        restaurant_address=current_user["restaurant_address"],
+        restaurant_phone=current_user["restaurant_phone"],
+        restaurant_email=current_user.get("restaurant_email"),
+        bank_account_number=bank_details.get("bank_account_number"),
+        bank_ifsc_code=bank_details.get("bank_ifsc_code"),
+        bank_account_holder_name=bank_details.get("bank_account_holder_name"),
+        upi_id=bank_details.get("upi_id")
+    )
+
 @router.get("/profile", response_model=ProfileData)
 async def get_profile(current_user: dict = Depends(get_current_user)):
     """
@@ -734,36 +748,10 @@ async def get_profile(current_user: dict = Depends(get_current_user)):
     dbb = get_dbb()
     
     try:
-        restaurant_id = current_user["id"]
-        
-        # Fetch bank details from restaurant_earnings_data
-        earnings_result = dbb.table("restaurant_earnings_data").select(
-            "bank_account_number, bank_ifsc_code, bank_account_holder_name, upi_id"
-        ).eq("restaurant_id", restaurant_id).execute()
-        
-        # Get bank details if they exist
-        bank_details = {}
-        if earnings_result.data:
-            bank_details = {
-                "bank_account_number": earnings_result.data[0].get("bank_account_number"),
-                "bank_ifsc_code": earnings_result.data[0].get("bank_ifsc_code"),
-                "bank_account_holder_name": earnings_result.data[0].get("bank_account_holder_name"),
-                "upi_id": earnings_result.data[0].get("upi_id")
-            }
-        
-        return ProfileData(
-            full_name=current_user["full_name"],
-            email=current_user["email"],
-            phone=current_user["phone"],
-            restaurant_name=current_user["restaurant_name"],
-            restaurant_address=current_user["restaurant_address"],
-            restaurant_phone=current_user["restaurant_phone"],
-            restaurant_email=current_user.get("restaurant_email"),
-            bank_account_number=bank_details.get("bank_account_number"),
-            bank_ifsc_code=bank_details.get("bank_ifsc_code"),
-            bank_account_holder_name=bank_details.get("bank_account_holder_name"),
-            upi_id=bank_details.get("upi_id")
+        earnings_data = _load_earnings_data(
+            dbb, current_user["id"], "bank_account_number, bank_ifsc_code, bank_account_holder_name, upi_id"
         )
+        return _profile(current_user, earnings_data)
     
     except HTTPException:
         raise
@@ -773,6 +761,178 @@ async def get_profile(current_user: dict = Depends(get_current_user)):
             detail=f"Failed to fetch profile: {str(e)}"
         )
 
+@router.get("/dashboard", response_model=OwnerDashboardResponse, response_class=ORJSONResponse)
+async def get_dashboard(
+    auto_reject: bool = Query(False, description="Also auto-reject pending orders older than 10 minutes, as fetch-orders does"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Status, active orders, earnings summary and profile in one call for app start-up
+    Authenticates once; the orders and earnings reads run concurrently on worker threads
+    Read-only unless auto_reject=true: stale pending orders are returned as pending and
+    left to POST /auto-reject-pending (or the next fetch-orders) to close
+    """
+    dbb = get_dbb()
+    
+    try:
+        # Earnings summary and profile share one restaurant_earnings_data read
+        orders, earnings_data = await asyncio.gather(
+            asyncio.to_thread(_load_active_orders, dbb, current_user, auto_reject),
+            asyncio.to_thread(_load_earnings_data, dbb, current_user["id"])
+        )
+        
+        return ORJSONResponse({
+            "status": _owner_status(current_user).model_dump(mode="json"),
+            "orders": orders,
+            "earnings": _earnings_summary(current_user, earnings_data).model_dump(mode="json"),
+            "profile": _profile(current_user, earnings_data).model_dump(mode="json")
+        })
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to load dashboard: {str(e)}"
+        )
+
+def _recent_days_window(days: int):
+    """[since, until) covering today and the previous days - 1 local days"""
+    today = datetime.now(ZoneInfo(settings.STATS_TIMEZONE)).date()
+    return export_window(today - timedelta(days=days - 1), today)
+
+# Item analytics run as aggregate RPCs over order_line_items (Docs/create_order_line_items.sql)
+@router.get("/items/top", response_model=TopItemsResponse)
+async def get_top_items(
+    current_user: dict = Depends(get_current_user),
+    days: int = Query(30, ge=1, le=365),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """
+    Best-selling items by quantity over the last `days` local days
+    Rejected and auto-rejected orders are not sales and are left out
+    """
+    dbb = get_dbb()
+    
+    try:
+        since, until = _recent_days_window(days)
+        result = dbb.rpc("owner_top_items", {
+            "p_owner_id": current_user["id"],
+            "p_since": since.isoformat(),
+            "p_until": until.isoformat(),
+            "p_limit": limit
+        }).execute()
+        
+        return TopItemsResponse(
+            since=since,
+            until=until,
+            items=[TopItem(**row) for row in result.data or []]
+        )
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch top items: {str(e)}"
+        )
+
+@router.get("/items/daily", response_model=ItemDailyResponse)
+async def get_item_daily(
+    current_user: dict = Depends(get_current_user),
+    days: int = Query(30, ge=1, le=365),
+    menu_item_id: Optional[str] = Query(None, max_length=100)
+):
+    """
+    Quantity and revenue per item per local day, optionally for one menu item
+    Rejected and auto-rejected orders are left out
+    """
+    dbb = get_dbb()
+    
+    try:
+        since, until = _recent_days_window(days)
+        result = dbb.rpc("owner_item_daily", {
+            "p_owner_id": current_user["id"],
+            "p_since": since.isoformat(),
+            "p_until": until.isoformat(),
+            "p_tz": settings.STATS_TIMEZONE,
+            "p_menu_item_id": menu_item_id
+        }).execute()
+        
+        return ItemDailyResponse(
+            since=since,
+            until=until,
+            points=[ItemDailyPoint(**row) for row in result.data or []]
+        )
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch daily item totals: {str(e)}"
+        )
+
+@router.get("/items/pools", response_model=PoolItemDemandResponse)
+async def get_pool_item_demand(
+    current_user: dict = Depends(get_current_user),
+    pools: int = Query(10, ge=1, le=50)
+):
+    """
+    Item demand in each of the owner's latest pools (newest first)
+    """
+    dbb = get_dbb()
+    
+    try:
+        result = dbb.rpc("owner_pool_item_demand", {
+            "p_owner_id": current_user["id"],
+            "p_pools": pools
+        }).execute()
+        
+        # Rows arrive grouped by pool, newest pool first
+        demand = {}
+        for row in result.data or []:
+            pool = demand.setdefault(row["pool_id"], PoolItemDemand(
+                pool_id=row["pool_id"],
+                pool_started_at=row["pool_started_at"],
+                items=[]
+            ))
+            pool.items.append(PoolItem(
+                menu_item_id=row["menu_item_id"],
+                item_name=row["item_name"],
+                total_quantity=row["total_quantity"],
+                order_count=row["order_count"]
+            ))
+        
+        return PoolItemDemandResponse(pools=list(demand.values()))
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch pool item demand: {str(e)}"
+        )
+
+@router.get("/item-analytics", response_model=ItemAnalyticsResponse, response_class=ORJSONResponse)
+async def get_item_analytics(
+    current_user: dict = Depends(get_current_user),
+    days: int = Query(7, ge=1, le=settings.ITEM_ANALYTICS_MAX_DAYS),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """
+    Top items by quantity and revenue over the last `days` local days, plus the
+    expected demand per weekday/hour and for the next few hours
+    Built from item rollups, cached per owner until their rollup version changes
+    """
+    dbb = get_dbb()
+    
+    try:
+        # Rollup reads and the numpy aggregation block: keep them off the event loop
+        analytics = await asyncio.to_thread(item_analytics, dbb, current_user["id"], days, limit)
+        return ORJSONResponse(analytics)
+    
+    except Exception:
+        logger.exception("Item analytics failed for owner_id=%s", current_user["id"])
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch item analytics"
+        )
+
 @router.put("/update-bank-details", response_model=MessageResponse)
 async def update_bank_details(
     bank_data: UpdateBankDetailsRequest,
@@ -2,7 +2,10 @@ from fastapi import APIRouter, HTTPException, status, Header
 from pydantic import BaseModel
 from typing import List, Optional
 from database import get_dbb
+from utils.archive import history_table
 from utils.notifications import send_new_orders_notification
+from utils.metrics import webhook_batch_orders, webhook_orders_total
+from utils.orders import chunked
 import os
 import logging
 
@@ -50,6 +53,19 @@ class WebhookResponse(BaseModel):
     inserted_count: int
     skipped_count: int
 
+def _existing_order_ids(dbb, order_ids: List[str]) -> set:
+    """
+    Lower-cased order ids already stored in either tier. Archived orders have left the hot
+    fetched_orders table (and its UNIQUE constraint), so a re-sent old order
+    must be looked up through history_table() too.
+    """
+    existing = set()
+    for chunk in chunked(list(dict.fromkeys(order_ids))):
+        result = dbb.table(history_table("fetched_orders")).select("order_id").in_("order_id", chunk).execute()
+        # Postgres returns UUIDs in lower case whatever case was sent
+        existing.update(str(row["order_id"]).lower() for row in result.data)
+    return existing
+
 # ---------------------------------------------------
 # Webhook Endpoint to Receive Orders
 # ---------------------------------------------------
@@ -72,7 +88,8 @@ async def receive_orders(
                 detail="Invalid API key"
             )
     
-    logger.info(f"📥 Webhook /receive-orders hit: orders={len(payload.orders)}")
+    logger.debug("Webhook /receive-orders hit: orders=%s", len(payload.orders))
+    webhook_batch_orders.observe(len(payload.orders), endpoint="receive-orders")
     dbb = get_dbb()
     inserted_count = 0
     skipped_count = 0
@@ -80,19 +97,26 @@ async def receive_orders(
     # Track orders by restaurant owner for notifications
     owner_orders = {}  # {owner_id: {"orders": [], "total": 0, "phone": "", "push_token": ""}}
     
+    # Per-batch counters logged once as a summary instead of per order
+    lookup_counts = {"restaurant_uid": 0, "restaurant_phone": 0, "unmatched": 0}
+    unmatched_samples = []  # first few orders with no matching owner
+    missing_token_owners = set()
+    notified_ok = 0
+    notified_failed = 0
+    
     try:
+        # Orders already stored (hot or archived) are skipped; one lookup per 100 orders.
+        # Ids are added as they are inserted, so repeats within the batch are skipped too
+        seen_order_ids = _existing_order_ids(dbb, [order.order_id for order in payload.orders])
+        
         for order in payload.orders:
-            logger.info(
-                f"➡️ Processing order_id={order.order_id} restaurant_phone={order.restaurant_phone} total_amount={order.total_amount}"
+            logger.debug(
+                "Processing order_id=%s restaurant_phone=%s total_amount=%s",
+                order.order_id, order.restaurant_phone, order.total_amount
             )
-            # Check if order already exists (prevent duplicates)
-            existing = dbb.table("fetched_orders").select("id").eq(
-                "order_id", order.order_id
-            ).execute()
-            
-            if existing.data:
+            if order.order_id.lower() in seen_order_ids:
                 # Order already exists, skip
-                logger.info(f"⏭️ Skipping duplicate order_id={order.order_id}")
+                logger.debug("Skipping duplicate order_id=%s", order.order_id)
                 skipped_count += 1
                 continue
             
@@ -123,21 +147,27 @@ async def receive_orders(
                     push_token = owner_result.data[0].get("push_token")
                     lookup_method = "restaurant_phone"
             
-            # Log result
+            # Count the lookup result; unmatched orders are summarised after the batch
             if restaurant_owner_id:
-                token_preview = (push_token[:25] + "...") if push_token else None
-                logger.info(
-                    f"👤 Owner lookup ok (via {lookup_method}): owner_id={restaurant_owner_id} push_token={'set' if push_token else 'missing'} preview={token_preview}"
+                lookup_counts[lookup_method] += 1
+                logger.debug(
+                    "Owner lookup ok via %s: order_id=%s owner_id=%s push_token=%s",
+                    lookup_method, order.order_id, restaurant_owner_id, "set" if push_token else "missing"
                 )
             else:
-                logger.warning(
-                    f"⚠️ Owner lookup failed: restaurant_phone={order.restaurant_phone} restaurant_id={order.restaurant_id} (no matching restaurant_owners row)"
-                )
+                lookup_counts["unmatched"] += 1
+                if len(unmatched_samples) < 5:
+                    unmatched_samples.append({
+                        "order_id": order.order_id,
+                        "restaurant_id": order.restaurant_id,
+                        "restaurant_phone": order.restaurant_phone
+                    })
             
             # Insert order into fetched_orders
             logger.debug(
-                f"🧾 Amount breakdown order_id={order.order_id} subtotal={order.subtotal} delivery_fee={order.delivery_fee} "
-                f"platform_fee={order.platform_fee} total_customer_paid={order.total_customer_paid} amount_to_collect={order.amount_to_collect}"
+                "Amount breakdown order_id=%s subtotal=%s delivery_fee=%s platform_fee=%s total_customer_paid=%s amount_to_collect=%s",
+                order.order_id, order.subtotal, order.delivery_fee, order.platform_fee,
+                order.total_customer_paid, order.amount_to_collect
             )
             
             dbb.table("fetched_orders").insert({
@@ -160,13 +190,8 @@ async def receive_orders(
             }).execute()
             
             inserted_count += 1
-            logger.info(f"✅ Inserted order_id={order.order_id} (inserted_count={inserted_count})")
-            
-            # Debug: Log notification tracking decision
-            logger.debug(
-                f"🔔 Notification tracking: restaurant_owner_id={'set' if restaurant_owner_id else 'missing'} "
-                f"push_token={'set' if push_token else 'missing'}"
-            )
+            seen_order_ids.add(order.order_id.lower())
+            logger.debug("Inserted order_id=%s", order.order_id)
             
             # Track order for push notification
             if restaurant_owner_id and push_token:
@@ -189,14 +214,14 @@ async def receive_orders(
                 owner_orders[restaurant_owner_id]["orders"].append(order.order_id)
                 owner_orders[restaurant_owner_id]["total"] += order.total_amount
             elif restaurant_owner_id and not push_token:
-                logger.warning(f"⚠️ Owner has no push_token: owner_id={restaurant_owner_id} order_id={order.order_id}")
+                missing_token_owners.add(restaurant_owner_id)
         
         # Send push notifications to restaurant owners
         for owner_id, data in owner_orders.items():
             try:
-                token_preview = (data["push_token"][:25] + "...") if data.get("push_token") else None
-                logger.info(
-                    f"📲 Sending push notification: owner_id={owner_id} orders={len(data['orders'])} total_amount={data['total']} token_preview={token_preview}"
+                logger.debug(
+                    "Sending push notification: owner_id=%s orders=%s total_amount=%s",
+                    owner_id, len(data["orders"]), data["total"]
                 )
                 notification_result = send_new_orders_notification(
                     push_tokens=[data["push_token"]],
@@ -205,14 +230,44 @@ async def receive_orders(
                     restaurant_phone=data["phone"]
                 )
                 if notification_result["success"]:
-                    logger.info(f"✅ Notification sent successfully to owner {owner_id}")
+                    notified_ok += 1
                 else:
-                    logger.error(f"❌ Failed to send notification to owner {owner_id}: {notification_result.get('error')}")
+                    notified_failed += 1
+                    logger.error(
+                        "Failed to send notification to owner %s: %s", owner_id, notification_result.get("error")
+                    )
             except Exception as e:
-                logger.error(f"❌ Exception sending notification to owner {owner_id}: {str(e)}")
+                notified_failed += 1
+                logger.error("Exception sending notification to owner %s: %s", owner_id, e)
 
+        webhook_orders_total.inc(inserted_count, result="inserted")
+        webhook_orders_total.inc(skipped_count, result="skipped")
+        
+        if unmatched_samples:
+            logger.warning(
+                "Webhook orders with no matching restaurant owner: count=%s",
+                lookup_counts["unmatched"],
+                extra={"unmatched_samples": unmatched_samples}
+            )
+        if missing_token_owners:
+            logger.warning(
+                "Owners without a push token received orders: owners=%s",
+                len(missing_token_owners),
+                extra={"owner_ids": sorted(missing_token_owners)}
+            )
+        
         logger.info(
-            f"🏁 Webhook /receive-orders complete: total={len(payload.orders)} inserted={inserted_count} skipped={skipped_count} notified_owners={len(owner_orders)}"
+            "Webhook /receive-orders complete: total=%s inserted=%s skipped=%s notified=%s notify_failed=%s",
+            len(payload.orders), inserted_count, skipped_count, notified_ok, notified_failed,
+            extra={
+                "event": "webhook_batch",
+                "orders_total": len(payload.orders),
+                "inserted": inserted_count,
+                "skipped": skipped_count,
+                "owner_lookup": lookup_counts,
+                "notified_owners": notified_ok,
+                "notify_failed": notified_failed
+            }
         )
         
         return WebhookResponse(
@@ -249,15 +304,17 @@ async def receive_single_order(
             detail="Invalid API key"
         )
     
+    webhook_batch_orders.observe(1, endpoint="receive-order")
     dbb = get_dbb()
     
     try:
-        # Check if order already exists
-        existing = dbb.table("fetched_orders").select("id").eq(
+        # Check if order already exists (hot or archived)
+        existing = dbb.table(history_table("fetched_orders")).select("order_id").eq(
             "order_id", order.order_id
-        ).execute()
+        ).limit(1).execute()
         
         if existing.data:
+            webhook_orders_total.inc(result="skipped")
             return {"success": True, "message": "Order already exists", "inserted": False}
         
         # Find restaurant_owner_id by restaurant_uid (primary) or restaurant_phone (fallback)
@@ -285,13 +342,11 @@ async def receive_single_order(
                 push_token = owner_result.data[0].get("push_token")
         
         # Insert order
-        # Debug: Log what we're receiving
-        print(f"📥 Inserting single order {order.order_id}:")
-        print(f"   subtotal: {order.subtotal}")
-        print(f"   delivery_fee: {order.delivery_fee}")
-        print(f"   platform_fee: {order.platform_fee}")
-        print(f"   total_customer_paid: {order.total_customer_paid}")
-        print(f"   amount_to_collect: {order.amount_to_collect}")
+        logger.debug(
+            "Inserting single order_id=%s subtotal=%s delivery_fee=%s platform_fee=%s total_customer_paid=%s amount_to_collect=%s",
+            order.order_id, order.subtotal, order.delivery_fee, order.platform_fee,
+            order.total_customer_paid, order.amount_to_collect
+        )
         
         dbb.table("fetched_orders").insert({
             "restaurant_owner_id": restaurant_owner_id,
@@ -311,23 +366,28 @@ async def receive_single_order(
             "total_customer_paid": order.total_customer_paid,
             "amount_to_collect": order.amount_to_collect
         }).execute()
+        webhook_orders_total.inc(result="inserted")
         
         # Send push notification if token exists
         if push_token:
             try:
-                logger.info(f"📲 Sending push notification for order {order.order_id}")
+                logger.debug("Sending push notification for order_id=%s", order.order_id)
                 notification_result = send_new_orders_notification(
                     push_tokens=[push_token],
                     orders_count=1,
                     total_amount=order.total_amount,
                     restaurant_phone=order.restaurant_phone
                 )
-                if notification_result["success"]:
-                    logger.info(f"✅ Notification sent successfully for order {order.order_id}")
-                else:
-                    logger.error(f"❌ Failed to send notification: {notification_result.get('error')}")
+                if not notification_result["success"]:
+                    logger.error("Failed to send notification for order_id=%s: %s", order.order_id, notification_result.get("error"))
             except Exception as e:
-                logger.error(f"❌ Exception sending notification: {str(e)}")
+                logger.error("Exception sending notification for order_id=%s: %s", order.order_id, e)
+        
+        logger.info(
+            "Webhook /receive-order complete: order_id=%s owner_matched=%s",
+            order.order_id, bool(restaurant_owner_id),
+            extra={"event": "webhook_single_order", "order_id": order.order_id}
+        )
         
         return {"success": True, "message": "Order inserted", "inserted": True}
     
@@ -0,0 +1,53 @@
+"""
+Shared fixtures: the app wired to the in-memory Supabase fake from loadtest/.
+"""
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# config.Settings reads these at import time; the fake clients never use them
+for _key, _value in {
+    "SUPABASE_URL_DBA": "https://dba.example.supabase.co",
+    "SUPABASE_SERVICE_KEY_DBA": "test.service.key",
+    "SUPABASE_URL_DBB": "https://dbb.example.supabase.co",
+    "SUPABASE_SERVICE_KEY_DBB": "test.service.key",
+    "JWT_SECRET_KEY": "test-secret-key-with-at-least-32-bytes",
+    "ENVIRONMENT": "test",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+
+@pytest.fixture
+def fake_app():
+    """
+    (TestClient, fake DBB, fake DBA, seeded owners) with the app's Supabase
+    clients replaced by loadtest.fake_supabase and push sent to a local fake Expo
+    """
+    from fastapi.testclient import TestClient
+
+    import database
+    import main
+    import utils.notifications as notifications
+    from loadtest.fake_expo import FakeExpoServer
+    from loadtest.fake_supabase import FakeSupabaseClient
+    from loadtest.scenarios import seed
+    from utils.db_instrumentation import InstrumentedClient
+
+    dbb, dba = FakeSupabaseClient(), FakeSupabaseClient()
+    previous = (database.supabase_dbb, database.supabase_dba, notifications.EXPO_PUSH_URL)
+    database.supabase_dbb = InstrumentedClient(dbb, "dbb")
+    database.supabase_dba = InstrumentedClient(dba, "dba")
+    expo = FakeExpoServer().start()
+    notifications.EXPO_PUSH_URL = expo.push_url
+
+    owners, _ = seed(dbb, dba, random.Random(7), owners=5, orders_per_owner=40, items_per_order=3)
+    try:
+        # Not entered as a context manager: startup would launch the background workers
+        yield TestClient(main.app), dbb, dba, owners
+    finally:
+        expo.stop()
+        database.supabase_dbb, database.supabase_dba, notifications.EXPO_PUSH_URL = previous
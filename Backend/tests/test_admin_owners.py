@@ -0,0 +1,159 @@
+"""
+Admin owner management: the keyset owner listing and its approval_status filter,
+and the bulk approve / reject / assign-uid endpoints (per-owner results and
+admin stats cache invalidation).
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from utils.auth import create_access_token
+
+
+@pytest.fixture
+def admin(fake_app):
+    """(client, dbb, admin headers) with 3 pending and 2 rejected owners added to the 5 approved ones"""
+    from routes.admin import admin_stats_cache
+
+    client, dbb, _, _ = fake_app
+    admin_stats_cache.invalidate()  # module-level: drop counts cached from another test's data
+    admin_id = dbb.rows("admin_users")[0]["id"]
+    created = datetime.now(timezone.utc) - timedelta(days=1)
+    dbb.seed("restaurant_owners", [
+        {
+            "id": str(uuid.uuid4()), "email": f"new{number}@example.com", "full_name": f"New Owner {number}",
+            "phone": f"8{number:09d}", "restaurant_name": f"New Restaurant {number}",
+            "restaurant_address": f"{number} New Street", "restaurant_phone": f"8{number:09d}", "restaurant_email": None,
+            "restaurant_uid": None, "approval_status": "pending" if number < 3 else "rejected",
+            "created_at": (created + timedelta(minutes=number)).isoformat(),
+        }
+        for number in range(5)
+    ])
+    return client, dbb, {"Authorization": "Bearer " + create_access_token({"sub": admin_id, "type": "admin"})}
+
+
+def _pages(client, headers, **params):
+    """Every owner page for these filters, following X-Next-Cursor"""
+    pages, cursor = [], None
+    while True:
+        response = client.get("/api/admin/all-owners", params={**params, **({"cursor": cursor} if cursor else {})}, headers=headers)
+        assert response.status_code == 200
+        pages.append(response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            return pages
+
+
+def test_owner_listing_filters_by_status_server_side(admin):
+    client, _, headers = admin
+
+    pages = _pages(client, headers, approval_status="pending", limit=2)
+    assert [len(page) for page in pages] == [2, 1]
+    assert {owner["approval_status"] for page in pages for owner in page} == {"pending"}
+
+    assert sum(len(page) for page in _pages(client, headers, approval_status="rejected", limit=2)) == 2
+    assert sum(len(page) for page in _pages(client, headers, limit=4)) == 10
+
+    response = client.get("/api/admin/all-owners", params={"approval_status": "unknown"}, headers=headers)
+    assert response.status_code == 422
+
+
+def _owners_by_status(client, headers):
+    response = client.get("/api/admin/stats", headers=headers)
+    assert response.status_code == 200
+    return response.json()["owners_by_status"]
+
+
+def _owner(dbb, owner_id):
+    return next(owner for owner in dbb.rows("restaurant_owners") if owner["id"] == owner_id)
+
+
+def _ids(dbb, approval_status):
+    return [owner["id"] for owner in dbb.rows("restaurant_owners") if owner["approval_status"] == approval_status]
+
+
+def test_bulk_approve_reports_each_owner_and_refreshes_stats(admin):
+    client, dbb, headers = admin
+    before = _owners_by_status(client, headers)  # primes the stats cache
+    pending = _ids(dbb, "pending")
+    uid, unknown = str(uuid.uuid4()), str(uuid.uuid4())
+
+    response = client.post("/api/admin/bulk-approve-owners", json={"owners": [
+        {"owner_id": pending[0], "restaurant_uid": uid},
+        {"owner_id": "not-a-uuid", "restaurant_uid": uid},
+        {"owner_id": unknown, "restaurant_uid": uid},
+        {"owner_id": pending[1], "restaurant_uid": "not-a-uuid"},
+    ]}, headers=headers)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["success"], body["processed_count"], body["failed_count"]) == (False, 1, 3)
+    assert [(result["owner_id"], result["success"]) for result in body["results"]] == [
+        (pending[0], True), ("not-a-uuid", False), (unknown, False), (pending[1], False)
+    ]
+    assert body["results"][2]["message"] == "Restaurant owner not found"
+    assert _owner(dbb, pending[0])["approval_status"] == "approved"
+    assert _owner(dbb, pending[0])["restaurant_uid"] == uid
+    assert _owner(dbb, pending[1])["approval_status"] == "pending"
+
+    assert _owners_by_status(client, headers) == {
+        **before,
+        "pending": before["pending"] - 1,
+        "approved": before["approved"] + 1,
+    }
+
+
+def test_bulk_reject_reports_each_owner_and_refreshes_stats(admin):
+    client, dbb, headers = admin
+    before = _owners_by_status(client, headers)
+    pending = _ids(dbb, "pending")
+    unknown = str(uuid.uuid4())
+
+    response = client.post(
+        "/api/admin/bulk-reject-owners", json={"owner_ids": [pending[0], unknown, pending[1], pending[0]]}, headers=headers
+    )
+
+    body = response.json()
+    assert (body["success"], body["processed_count"], body["failed_count"]) == (False, 2, 1)
+    # One result per distinct owner, in request order
+    assert [(result["owner_id"], result["success"]) for result in body["results"]] == [
+        (pending[0], True), (unknown, False), (pending[1], True)
+    ]
+    assert _ids(dbb, "pending") == pending[2:]
+    assert _owners_by_status(client, headers)["rejected"] == before["rejected"] + 2
+
+
+def test_bulk_reject_without_matches_keeps_cached_stats(admin):
+    from routes.admin import admin_stats_cache
+
+    client, _, headers = admin
+    _owners_by_status(client, headers)
+    cached = admin_stats_cache.get("stats")
+
+    response = client.post("/api/admin/bulk-reject-owners", json={"owner_ids": [str(uuid.uuid4())]}, headers=headers)
+
+    assert response.json()["failed_count"] == 1
+    assert admin_stats_cache.get("stats") is cached
+
+
+def test_bulk_assign_uid_only_for_approved_owners(admin):
+    client, dbb, headers = admin
+    approved, pending = _ids(dbb, "approved")[0], _ids(dbb, "pending")[0]
+    first, second = str(uuid.uuid4()), str(uuid.uuid4())
+
+    response = client.post("/api/admin/bulk-assign-uid", json={"owners": [
+        {"owner_id": approved, "restaurant_uid": first},
+        {"owner_id": pending, "restaurant_uid": first},
+        {"owner_id": approved, "restaurant_uid": second},  # repeated owner: the last UID wins
+    ]}, headers=headers)
+
+    body = response.json()
+    assert (body["processed_count"], body["failed_count"]) == (1, 1)
+    assert body["results"] == [
+        {"owner_id": approved, "success": True, "message": "Restaurant UID assigned successfully"},
+        {"owner_id": pending, "success": False, "message": "Can only assign UID to approved owners"},
+    ]
+    assert _owner(dbb, approved)["restaurant_uid"] == second
+    assert _owner(dbb, pending)["restaurant_uid"] is None
+    assert _owner(dbb, pending)["approval_status"] == "pending"
@@ -0,0 +1,55 @@
+"""
+Order shaping/rendering regression gate: a reduced loadtest/bench.py run
+(end-to-end `.total` benchmarks at 200 orders) checked against
+loadtest/bench_baseline.json. Marked `benchmark`; skip with -m "not benchmark".
+"""
+import json
+import platform
+
+import pytest
+
+from loadtest import bench
+
+SIZE = 200
+ENDPOINTS = ("fetch-orders", "order-history", "earnings-transactions")
+
+# Normalised slowdown allowed in every one of REPEATS runs. Unchanged code
+# stays within ~20% of the baseline; a noisy neighbour rarely lasts all runs.
+TOLERANCE = 0.3
+REPEATS = 5
+
+# The ORJSON fast path must stay this many times cheaper than the validated path
+MIN_SPEEDUP = 3
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    with open(bench.BASELINE_PATH, encoding="utf-8") as f:
+        recorded = json.load(f)
+    # Relative costs shift between interpreter versions; re-record the baseline there
+    if recorded["python"].rsplit(".", 1)[0] != platform.python_version().rsplit(".", 1)[0]:
+        pytest.skip(f"baseline recorded on Python {recorded['python']}")
+    return recorded
+
+
+@pytest.fixture(scope="module")
+def repeats(baseline):
+    only = [f"{endpoint}.{path}total" for endpoint in ENDPOINTS for path in ("", "validated.")]
+    return [
+        bench.run([SIZE], baseline["items_per_order"], only, rounds=3, min_round_seconds=0.01)
+        for _ in range(REPEATS)
+    ]
+
+
+def test_no_regression_against_baseline(repeats, baseline):
+    assert bench.compare(repeats, baseline["benchmarks"], TOLERANCE) == []
+
+
+def test_fast_path_beats_validated_path(repeats):
+    results = bench.best_of(repeats)
+    for endpoint in ENDPOINTS:
+        fast = results[f"{endpoint}.total[{SIZE}]"]["min_us"]
+        validated = results[f"{endpoint}.validated.total[{SIZE}]"]["min_us"]
+        assert validated >= MIN_SPEEDUP * fast, f"{endpoint}: {fast}µs vs validated {validated}µs"
@@ -0,0 +1,47 @@
+"""
+Compression metrics: a stream that grows when compressed must not make the
+"saved bytes" counter go backwards (counters are monotonic in Prometheus).
+"""
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from utils.compression import SUPPORTED_ENCODINGS, CompressionMiddleware
+from utils.metrics import http_compression_input_bytes_total, http_compression_output_bytes_total, http_compression_saved_bytes_total
+
+ROUTE = "/tiny-stream"
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get(ROUTE)
+    async def tiny_stream():
+        async def rows():
+            yield "order_id,status\n"
+            yield ""
+        return StreamingResponse(rows(), media_type="text/csv")
+
+    return app
+
+
+def _value(counter, **labels) -> float:
+    return counter._values.get(counter._key(labels), 0)
+
+
+def test_small_stream_never_decrements_saved_bytes():
+    client = TestClient(_app())
+    for encoding in SUPPORTED_ENCODINGS:
+        saved_before = _value(http_compression_saved_bytes_total, route=ROUTE, encoding=encoding)
+        in_before = _value(http_compression_input_bytes_total, encoding=encoding)
+        out_before = _value(http_compression_output_bytes_total, encoding=encoding)
+
+        response = client.get(ROUTE, headers={"Accept-Encoding": encoding})
+        assert response.headers["content-encoding"] == encoding
+        assert response.text == "order_id,status\n"
+
+        bytes_in = _value(http_compression_input_bytes_total, encoding=encoding) - in_before
+        bytes_out = _value(http_compression_output_bytes_total, encoding=encoding) - out_before
+        assert bytes_out > bytes_in  # the stream really did grow
+        assert _value(http_compression_saved_bytes_total, route=ROUTE, encoding=encoding) == saved_before
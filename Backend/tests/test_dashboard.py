@@ -0,0 +1,41 @@
+"""
+GET /api/owner/dashboard is read-only unless the caller asks for auto_reject.
+"""
+from datetime import datetime, timedelta, timezone
+
+
+def _make_stale(dbb, owner_id: str, count: int) -> set:
+    """Push the first `count` of the owner's pending orders past the 10-minute auto-reject mark"""
+    stale_at = (datetime.now(timezone.utc) - timedelta(minutes=20)).isoformat()
+    orders = [row for row in dbb.rows("fetched_orders") if row["restaurant_owner_id"] == owner_id][:count]
+    for row in orders:
+        row["fetched_at"] = stale_at
+    return {row["order_id"] for row in orders}
+
+
+def _statuses(payload: dict) -> dict:
+    return {order["order_id"]: order["order_status"] for order in payload["orders"]["individual_orders"]}
+
+
+def test_dashboard_does_not_auto_reject_by_default(fake_app):
+    client, dbb, _, owners = fake_app
+    stale_ids = _make_stale(dbb, owners[0]["id"], 3)
+
+    response = client.get("/api/owner/dashboard", headers=owners[0]["headers"])
+    assert response.status_code == 200
+    statuses = _statuses(response.json())
+    assert len(statuses) == 40
+    assert all(statuses[order_id] != "auto_rejected" for order_id in stale_ids)
+    assert dbb.rows("order_responses") == []
+    assert dbb.rows("dba_sync_outbox") == []
+
+
+def test_dashboard_auto_reject_is_explicit(fake_app):
+    client, dbb, _, owners = fake_app
+    stale_ids = _make_stale(dbb, owners[0]["id"], 3)
+
+    response = client.get("/api/owner/dashboard", params={"auto_reject": "true"}, headers=owners[0]["headers"])
+    assert response.status_code == 200
+    statuses = _statuses(response.json())
+    assert {order_id for order_id, status in statuses.items() if status == "auto_rejected"} == stale_ids
+    assert {row["order_id"] for row in dbb.rows("order_responses")} == stale_ids
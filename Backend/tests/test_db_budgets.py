@@ -0,0 +1,57 @@
+"""
+DB round-trip budgets for the hot owner and webhook routes.
+
+Each request runs against the in-memory Supabase fake inside
+assert_db_budget, so a change that adds queries (or an N+1 loop) to one of
+these routes fails here instead of showing up in production latency.
+Raise a budget only together with the change that needs the extra query.
+"""
+import random
+
+import pytest
+
+from loadtest.scenarios import make_webhook_order
+from utils.request_accounting import assert_db_budget
+
+# owner lookup + orders + responses (one responses query per 100 orders)
+ORDER_HISTORY_BUDGET = 3
+FETCH_ORDERS_BUDGET = 3
+
+WEBHOOK_BATCH_SIZE = 50
+# One duplicate check for the batch; owners are still looked up and orders inserted one by one
+WEBHOOK_BATCH_QUERIES = 1
+WEBHOOK_QUERIES_PER_ORDER = 2
+
+
+def test_order_history_budget(fake_app):
+    client, _, _, owners = fake_app
+    with assert_db_budget(ORDER_HISTORY_BUDGET, "GET /api/owner/order-history"):
+        response = client.get("/api/owner/order-history", headers=owners[0]["headers"])
+    assert response.status_code == 200
+    assert len(response.json()["orders"]) == 40
+
+
+def test_fetch_orders_budget(fake_app):
+    client, _, _, owners = fake_app
+    with assert_db_budget(FETCH_ORDERS_BUDGET, "POST /api/owner/fetch-orders"):
+        response = client.post("/api/owner/fetch-orders", headers=owners[0]["headers"])
+    assert response.status_code == 200
+    assert len(response.json()["individual_orders"]) == 40
+
+
+def test_webhook_batch_budget(fake_app):
+    client, dbb, _, owners = fake_app
+    rng = random.Random(11)
+    orders = [make_webhook_order(rng, rng.choice(owners), 3) for _ in range(WEBHOOK_BATCH_SIZE)]
+    budget = WEBHOOK_BATCH_QUERIES + WEBHOOK_QUERIES_PER_ORDER * WEBHOOK_BATCH_SIZE
+    with assert_db_budget(budget, "POST /api/webhook/receive-orders"):
+        response = client.post("/api/webhook/receive-orders", json={"orders": orders})
+    assert response.status_code == 200
+    assert response.json()["inserted_count"] == WEBHOOK_BATCH_SIZE
+
+
+def test_budget_exceeded_fails(fake_app):
+    client, _, _, owners = fake_app
+    with pytest.raises(AssertionError, match="budget 1"):
+        with assert_db_budget(1, "GET /api/owner/order-history"):
+            client.get("/api/owner/order-history", headers=owners[0]["headers"])
@@ -0,0 +1,155 @@
+"""
+Item analytics (numpy) against a plain-Python reference over the same rollup rows.
+"""
+import random
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from utils.item_analytics import ItemRollups
+
+TODAY = date(2026, 3, 18)
+FORECAST_WEEKS = 4
+ITEMS = [f"item-{number}" for number in range(12)]
+
+
+@pytest.fixture
+def rollup_rows():
+    rng = random.Random(21)
+    daily, hourly = [], []
+    for age in range(45, -1, -1):
+        day = (TODAY - timedelta(days=age)).isoformat()
+        for menu_item_id in rng.sample(ITEMS, 6):
+            quantity = rng.randint(1, 30)
+            daily.append({
+                "day": day, "menu_item_id": menu_item_id, "item_name": f"{menu_item_id} v{age}",
+                "quantity": quantity, "revenue": quantity * rng.choice((4000, 8500, 12000)),
+            })
+            if age:
+                for hour in rng.sample(range(24), 3):
+                    hourly.append({"day": day, "hour": hour, "menu_item_id": menu_item_id, "quantity": rng.randint(1, 9)})
+    return daily, hourly
+
+
+def _reference_top(daily, days, limit):
+    quantity, revenue, names = defaultdict(int), defaultdict(int), {}
+    for row in daily:
+        names[row["menu_item_id"]] = row["item_name"]
+        if (TODAY - date.fromisoformat(row["day"])).days < days:
+            quantity[row["menu_item_id"]] += row["quantity"]
+            revenue[row["menu_item_id"]] += row["revenue"]
+    return {
+        item: {"item_name": names[item], "total_quantity": quantity[item], "total_revenue": revenue[item]}
+        for item in quantity
+    }, sorted(quantity, key=lambda item: (-quantity[item], -revenue[item]))[:limit]
+
+
+def _reference_slot_demand(hourly):
+    start = TODAY - timedelta(days=7 * FORECAST_WEEKS)
+    weeks = [0] * 7
+    for offset in range(7 * FORECAST_WEEKS):
+        weeks[(start + timedelta(days=offset)).weekday()] += 1
+    totals = defaultdict(float)
+    for row in hourly:
+        slot = date.fromisoformat(row["day"]).weekday() * 24 + row["hour"]
+        totals[slot] += row["quantity"]
+    return {slot: total / weeks[slot // 24] for slot, total in totals.items()}
+
+
+def test_top_items_match_reference(rollup_rows):
+    daily, hourly = rollup_rows
+    rollups = ItemRollups(TODAY, daily, hourly, FORECAST_WEEKS)
+    for days in (1, 7, 30):
+        expected, order = _reference_top(daily, days, 5)
+        top = rollups.top_items(days, 5)["top_by_quantity"]
+        assert [entry["menu_item_id"] for entry in top] == order
+        for entry in top:
+            assert {key: entry[key] for key in ("item_name", "total_quantity", "total_revenue")} == expected[entry["menu_item_id"]]
+
+
+def test_demand_by_slot_matches_reference(rollup_rows):
+    daily, hourly = rollup_rows
+    # Only the forecast weeks are loaded (load_item_rollups filters by day)
+    since = (TODAY - timedelta(days=7 * FORECAST_WEEKS)).isoformat()
+    hourly = [row for row in hourly if row["day"] >= since]
+    rollups = ItemRollups(TODAY, daily, hourly, FORECAST_WEEKS)
+
+    expected = _reference_slot_demand(hourly)
+    assert {
+        entry["weekday"] * 24 + entry["hour"]: entry["expected_quantity"] for entry in rollups.demand_by_slot()
+    } == {slot: round(total, 2) for slot, total in expected.items()}
+
+    upcoming = rollups.upcoming(datetime(2026, 3, 18, 12), 3, 50)
+    for hour in upcoming:
+        slot = hour["weekday"] * 24 + hour["hour"]
+        assert round(sum(item["expected_quantity"] for item in hour["items"]), 1) == round(expected.get(slot, 0.0), 1)
+
+
+def test_no_rollups():
+    rollups = ItemRollups(TODAY, [], [], FORECAST_WEEKS)
+    assert rollups.top_items(7, 10) == {"top_by_quantity": [], "top_by_revenue": []}
+    assert rollups.demand_by_slot() == []
+    assert all(hour["items"] == [] for hour in rollups.upcoming(datetime(2026, 3, 18, 12), 3, 10))
+
+
+def test_cache_follows_rollup_version(fake_app):
+    """Another worker's writes show up once the trigger-maintained version moves"""
+    from config import settings
+    from utils.item_analytics import item_analytics_cache
+
+    client, dbb, _, owners = fake_app
+    owner = owners[0]
+    item_analytics_cache.invalidate()
+    today = datetime.now(ZoneInfo(settings.STATS_TIMEZONE)).date().isoformat()
+    dbb.seed("item_daily_rollups", [{
+        "restaurant_owner_id": owner["id"], "day": today, "menu_item_id": "item-1", "item_name": "Paneer Roll",
+        "quantity": 3, "revenue": 36000, "line_count": 3,
+    }])
+    dbb.seed("item_rollup_versions", [{"restaurant_owner_id": owner["id"], "version": 1}])
+
+    def top_quantity():
+        response = client.get("/api/owner/item-analytics", headers=owner["headers"])
+        assert response.status_code == 200
+        return response.json()["top_by_quantity"][0]["total_quantity"]
+
+    assert top_quantity() == 3
+    # Rollups change without the version moving: the cached copy is still served
+    dbb.rows("item_daily_rollups")[0]["quantity"] = 5
+    assert top_quantity() == 3
+    # The trigger bumps the version with every rollup change
+    dbb.rows("item_rollup_versions")[0]["version"] = 2
+    assert top_quantity() == 5
+
+
+def test_rollup_timezone_check(caplog):
+    from config import settings
+    from loadtest.fake_supabase import FakeSupabaseClient
+    from utils.item_analytics import check_rollup_timezone
+
+    dbb = FakeSupabaseClient()
+    assert not check_rollup_timezone(dbb)  # rollups not installed: warned, not fatal
+
+    dbb.rpcs["rollup_timezone"] = lambda client: settings.STATS_TIMEZONE
+    assert check_rollup_timezone(dbb)
+
+    dbb.rpcs["rollup_timezone"] = lambda client: "UTC" if settings.STATS_TIMEZONE != "UTC" else "Asia/Kolkata"
+    assert not check_rollup_timezone(dbb)
+    assert "rebuild_item_rollups" in caplog.text
+
+
+def test_item_analytics_error_is_not_echoed(fake_app, monkeypatch, caplog):
+    import routes.owner
+
+    client, _, _, owners = fake_app
+
+    def broken(dbb, owner_id, days, limit):
+        raise RuntimeError("relation item_daily_rollups: connection string postgres://secret")
+
+    monkeypatch.setattr(routes.owner, "item_analytics", broken)
+    response = client.get("/api/owner/item-analytics", headers=owners[0]["headers"])
+
+    assert response.status_code == 500
+    assert response.json()["detail"] == "Failed to fetch item analytics"
+    assert "postgres://secret" in caplog.text
@@ -0,0 +1,53 @@
+"""
+The *_payload fast-path shapers must stay field-for-field equivalent to the
+Pydantic model builders they replace (utils/order_shaping.py).
+"""
+import pytest
+
+from loadtest.bench import make_order_rows
+from models.schemas import FetchOrdersResponse, IndividualOrder, OrderTransaction
+from utils.order_shaping import (
+    build_individual_order,
+    build_order_transaction,
+    fetch_orders_payload,
+    individual_order_payload,
+    order_transaction_payload,
+    shape_fetch_orders,
+)
+
+
+def _fixture_rows():
+    rows, responses = make_order_rows(25, items_per_order=4)
+    # Older / sparser rows: no subtotal, missing optional fields, customizations
+    sparse = dict(rows[0], order_id="sparse-order", subtotal=None)
+    for field in ("customer_name", "customer_phone", "created_at"):
+        sparse.pop(field)
+    sparse["items"] = [
+        {"name": "Masala Dosa", "quantity": 2},
+        {"menu_item_id": "m-2", "name": "Cold Coffee", "quantity": 1, "unit_price": 8000,
+         "subtotal": 8000, "customizations": "Less sugar"},
+    ]
+    return rows + [sparse], responses
+
+
+ROWS, RESPONSES = _fixture_rows()
+
+
+def test_fetch_orders_payload_matches_model():
+    payload = fetch_orders_payload(ROWS, RESPONSES)
+    expected = shape_fetch_orders(ROWS, RESPONSES).model_dump(mode="json")
+    assert FetchOrdersResponse(**payload).model_dump(mode="json") == expected
+
+
+@pytest.mark.parametrize("order", ROWS, ids=lambda order: order["order_id"])
+def test_individual_order_payload_matches_model(order):
+    payload = individual_order_payload(order, RESPONSES)
+    expected = build_individual_order(order, RESPONSES).model_dump(mode="json")
+    assert IndividualOrder(**payload).model_dump(mode="json") == expected
+
+
+@pytest.mark.parametrize("order", ROWS, ids=lambda order: order["order_id"])
+def test_order_transaction_payload_matches_model(order):
+    payload = order_transaction_payload(order, "owner-1", 0.2)
+    expected = build_order_transaction(order, "owner-1", 0.2).model_dump(mode="json")
+    assert OrderTransaction(**payload).model_dump(mode="json") == expected
@@ -0,0 +1,13 @@
+"""
+READY_CRITICAL_DEPENDENCIES parsing.
+"""
+from config import settings
+from utils.readiness import critical_dependencies
+
+
+def test_critical_dependencies_are_stripped(monkeypatch):
+    monkeypatch.setattr(settings, "READY_CRITICAL_DEPENDENCIES", " dbb , dba,, ")
+    assert critical_dependencies() == {"dbb", "dba"}
+
+    monkeypatch.setattr(settings, "READY_CRITICAL_DEPENDENCIES", "")
+    assert critical_dependencies() == set()
@@ -0,0 +1,86 @@
+"""
+Reconciliation repairs against the repair_order_status_drift contract mirrored
+by loadtest/fake_supabase.py: drift is repaired, but neither a decision made
+mid-scan nor a Database A write still waiting in the outbox counts as drift.
+"""
+from loadtest.fake_supabase import _repair_order_status_drift, _submit_order_decision
+from utils.reconciliation import reconcile_order_statuses
+
+
+def _respond(dbb, owner, order_id, status):
+    dbb.seed("order_responses", [{"order_id": order_id, "restaurant_owner_id": owner["id"], "overall_status": status}])
+
+
+def _status(dbb, order_id):
+    return next(row["order_status"] for row in dbb.rows("fetched_orders") if row["order_id"] == order_id)
+
+
+def _outbox(dbb, order_id):
+    return [row["status"] for row in dbb.rows("dba_sync_outbox") if row["order_id"] == order_id]
+
+
+def test_drift_is_repaired(fake_app):
+    _, dbb, _, owners = fake_app
+    order_id = next(row["order_id"] for row in dbb.rows("fetched_orders") if row["restaurant_owner_id"] == owners[0]["id"])
+    _respond(dbb, owners[0], order_id, "accepted")
+
+    report = reconcile_order_statuses(chunk_size=50)
+
+    assert (report["dbb_mismatches"], report["dba_mismatches"]) == (1, 1)
+    assert (report["repaired_dbb"], report["queued_dba_repairs"]) == (1, 1)
+    assert _status(dbb, order_id) == "accepted"
+    assert _outbox(dbb, order_id) == ["accepted"]
+
+    # Nothing left to repair in Database B; Database A waits for the sync worker
+    report = reconcile_order_statuses(chunk_size=50)
+    assert (report["dbb_mismatches"], report["dba_mismatches"], report["pending_dba_sync"]) == (0, 0, 1)
+    assert _outbox(dbb, order_id) == ["accepted"]
+
+
+def test_unsynced_outbox_is_not_drift(fake_app):
+    client, dbb, _, owners = fake_app
+    owner = owners[0]
+    order_id = next(row["order_id"] for row in dbb.rows("fetched_orders") if row["restaurant_owner_id"] == owner["id"])
+    response = client.post(
+        "/api/owner/submit-response", json={"order_id": order_id, "decision": "rejected"}, headers=owner["headers"]
+    )
+    assert response.status_code == 200
+
+    report = reconcile_order_statuses(chunk_size=50)
+
+    assert (report["dba_mismatches"], report["pending_dba_sync"], report["queued_dba_repairs"]) == (0, 1, 0)
+    assert report["samples"] == []
+    assert _outbox(dbb, order_id) == ["rejected"]
+
+
+def test_decision_during_scan_is_not_reverted(fake_app):
+    _, dbb, _, owners = fake_app
+    owner = owners[0]
+    order_id = next(row["order_id"] for row in dbb.rows("fetched_orders") if row["restaurant_owner_id"] == owner["id"])
+    _respond(dbb, owner, order_id, "accepted")
+
+    def owner_decides_first(client, p_repairs):
+        # The owner changes their mind after the scan read "accepted"
+        _submit_order_decision(client, owner["id"], order_id, "rejected")
+        return _repair_order_status_drift(client, p_repairs)
+
+    dbb.rpcs["repair_order_status_drift"] = owner_decides_first
+
+    report = reconcile_order_statuses(chunk_size=50)
+
+    assert report["dbb_mismatches"] == 1
+    assert (report["repaired_dbb"], report["queued_dba_repairs"]) == (0, 0)
+    assert _status(dbb, order_id) == "rejected"
+    assert _outbox(dbb, order_id) == ["rejected"]
+
+
+def test_dry_run_writes_nothing(fake_app):
+    _, dbb, _, owners = fake_app
+    order_id = next(row["order_id"] for row in dbb.rows("fetched_orders") if row["restaurant_owner_id"] == owners[0]["id"])
+    _respond(dbb, owners[0], order_id, "accepted")
+
+    report = reconcile_order_statuses(chunk_size=50, repair=False)
+
+    assert report["dbb_mismatches"] == 1
+    assert _status(dbb, order_id) != "accepted"
+    assert dbb.rows("dba_sync_outbox") == []
@@ -0,0 +1,53 @@
+"""
+Restaurant catalog typeahead: the fuzzy fallback scores only the vocabulary
+length buckets that can reach the cutoff, with the same results as scoring all.
+"""
+import difflib
+import random
+import string
+
+from loadtest.fake_supabase import FakeSupabaseClient
+from utils.restaurant_catalog import FUZZY_CUTOFF, RestaurantCatalog
+
+
+def _catalog(monkeypatch, restaurants):
+    import utils.restaurant_catalog as catalog_module
+
+    dba = FakeSupabaseClient()
+    dba.seed("restaurants", restaurants)
+    monkeypatch.setattr(catalog_module, "get_dba", lambda: dba)
+    catalog = RestaurantCatalog(ttl_seconds=60)
+    catalog.refresh()
+    return catalog
+
+
+def test_fuzzy_vocabulary_prune_matches_full_scan(monkeypatch):
+    rng = random.Random(11)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 14))) for _ in range(400)]
+    catalog = _catalog(monkeypatch, [
+        {"id": str(number), "name": f"{words[number]} {words[-number - 1]}", "address": None, "phone": None}
+        for number in range(200)
+    ])
+    snapshot = catalog._snapshot
+    vocabulary = [token for tokens in snapshot[2].values() for token in tokens]
+
+    for word in rng.sample(words, 60):
+        typo = word[:-1] + rng.choice(string.ascii_lowercase) if rng.random() < 0.5 else word[1:]
+        pruned = RestaurantCatalog._fuzzy_vocabulary(snapshot, typo)
+        assert len(pruned) < len(vocabulary)
+        assert difflib.get_close_matches(typo, pruned, n=5, cutoff=FUZZY_CUTOFF) == \
+            difflib.get_close_matches(typo, vocabulary, n=5, cutoff=FUZZY_CUTOFF)
+
+
+def test_search_route_falls_back_to_fuzzy(fake_app):
+    from utils.auth import create_access_token
+    from utils.restaurant_catalog import restaurant_catalog
+
+    client, dbb, _, _ = fake_app
+    restaurant_catalog.refresh()
+    headers = {"Authorization": "Bearer " + create_access_token({"sub": dbb.rows("admin_users")[0]["id"], "type": "admin"})}
+
+    response = client.get("/api/admin/restaurants/search", params={"q": "Restuarant"}, headers=headers)
+
+    assert response.status_code == 200
+    assert [restaurant["name"] for restaurant in response.json()] == [f"Restaurant {number}" for number in range(5)]
@@ -0,0 +1,152 @@
+"""
+Owner decisions: POST /api/owner/submit-response and /submit-responses against
+the submit_order_decision(s) contracts mirrored by loadtest/fake_supabase.py.
+"""
+import uuid
+
+import pytest
+
+
+@pytest.fixture
+def owner_orders(fake_app):
+    """(client, dbb, owner, owner's order ids, another owner's order id)"""
+    client, dbb, _, owners = fake_app
+    owner = owners[0]
+    order_ids = [row["order_id"] for row in dbb.rows("fetched_orders") if row["restaurant_owner_id"] == owner["id"]]
+    other_id = next(row["order_id"] for row in dbb.rows("fetched_orders") if row["restaurant_owner_id"] != owner["id"])
+    return client, dbb, owner, order_ids, other_id
+
+
+def _order(dbb, order_id):
+    return next(row for row in dbb.rows("fetched_orders") if row["order_id"] == order_id)
+
+
+def _outbox(dbb, order_id):
+    return [row["status"] for row in dbb.rows("dba_sync_outbox") if row["order_id"] == order_id]
+
+
+def test_bulk_mixed_decisions_with_bad_ids(owner_orders):
+    client, dbb, owner, order_ids, other_id = owner_orders
+    accepted, rejected, closed = order_ids[:3]
+    _order(dbb, closed)["sent_for_delivery"] = True
+    unknown = str(uuid.uuid4())
+    decisions = [
+        {"order_id": accepted, "decision": "accepted"},
+        {"order_id": rejected, "decision": "accepted"},
+        {"order_id": "not-a-uuid", "decision": "accepted"},
+        {"order_id": unknown, "decision": "rejected"},
+        {"order_id": other_id, "decision": "accepted"},
+        {"order_id": closed, "decision": "rejected"},
+        {"order_id": rejected, "decision": "rejected"},  # repeated id: the last decision wins
+        {"order_id": order_ids[3], "decision": "maybe"},
+    ]
+
+    response = client.post("/api/owner/submit-responses", json={"decisions": decisions}, headers=owner["headers"])
+
+    assert response.status_code == 200
+    body = response.json()
+    results = {result["order_id"]: result for result in body["results"]}
+    # One result per distinct order, in request order
+    assert [result["order_id"] for result in body["results"]] == [
+        accepted, rejected, "not-a-uuid", unknown, other_id, closed, order_ids[3]
+    ]
+    assert (body["success"], body["processed_count"], body["failed_count"]) == (False, 2, 5)
+
+    assert results[accepted]["success"] and results[accepted]["decision"] == "accepted"
+    assert results[rejected]["success"] and results[rejected]["decision"] == "rejected"
+    for order_id in ("not-a-uuid", unknown, other_id):
+        assert not results[order_id]["success"] and results[order_id]["message"] == "Order not found"
+    assert not results[closed]["success"] and "closed" in results[closed]["message"]
+    assert not results[order_ids[3]]["success"] and "Decision must be" in results[order_ids[3]]["message"]
+
+    # Applied decisions are recorded and queued for Database A; failures write nothing
+    assert _order(dbb, accepted)["order_status"] == "accepted"
+    assert _order(dbb, rejected)["order_status"] == "rejected"
+    assert _outbox(dbb, accepted) == ["accepted"] and _outbox(dbb, rejected) == ["rejected"]
+    assert _order(dbb, other_id)["order_status"] != "accepted"
+    assert _outbox(dbb, other_id) == [] and _outbox(dbb, closed) == []
+    assert len(dbb.rows("order_responses")) == 2
+
+
+def test_bulk_repeated_decision_is_unchanged(owner_orders):
+    client, dbb, owner, order_ids, _ = owner_orders
+    payload = {"decisions": [{"order_id": order_ids[0].upper(), "decision": "rejected"}]}
+
+    for _ in range(2):
+        response = client.post("/api/owner/submit-responses", json=payload, headers=owner["headers"])
+        assert response.status_code == 200
+        # Reported under the id as sent, even though the database stores it in lower case
+        assert response.json()["results"][0]["order_id"] == order_ids[0].upper()
+        assert response.json()["success"]
+
+    # The second submit changed nothing and queued no second Database A write
+    assert _outbox(dbb, order_ids[0]) == ["rejected"]
+
+
+def test_bulk_auto_rejected_order_is_closed(owner_orders):
+    client, dbb, owner, order_ids, _ = owner_orders
+    dbb.seed("order_responses", [{"order_id": order_ids[0], "restaurant_owner_id": owner["id"], "overall_status": "auto_rejected"}])
+
+    response = client.post(
+        "/api/owner/submit-responses",
+        json={"decisions": [{"order_id": order_ids[0], "decision": "accepted"}, {"order_id": order_ids[1], "decision": "accepted"}]},
+        headers=owner["headers"],
+    )
+
+    body = response.json()
+    assert (body["processed_count"], body["failed_count"]) == (1, 1)
+    assert not body["results"][0]["success"] and body["results"][1]["success"]
+
+
+def _submit(client, owner, order_id, decision="accepted"):
+    return client.post(
+        "/api/owner/submit-response", json={"order_id": order_id, "decision": decision}, headers=owner["headers"]
+    )
+
+
+def test_single_decision_success(owner_orders):
+    client, dbb, owner, order_ids, _ = owner_orders
+
+    response = _submit(client, owner, order_ids[0].upper(), "rejected")
+
+    assert response.status_code == 200
+    assert response.json() == {"success": True, "message": "Order rejected successfully!"}
+    assert _order(dbb, order_ids[0])["order_status"] == "rejected"
+    assert [row["overall_status"] for row in dbb.rows("order_responses")] == ["rejected"]
+    assert _outbox(dbb, order_ids[0]) == ["rejected"]
+
+    # Changing the decision queues the newer status; repeating it queues nothing
+    assert _submit(client, owner, order_ids[0], "accepted").status_code == 200
+    assert _submit(client, owner, order_ids[0], "accepted").status_code == 200
+    assert _outbox(dbb, order_ids[0]) == ["rejected", "accepted"]
+
+
+def test_single_decision_not_found(owner_orders):
+    client, dbb, owner, _, other_id = owner_orders
+    for order_id in (str(uuid.uuid4()), other_id):
+        response = _submit(client, owner, order_id)
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Order not found"
+    assert dbb.rows("order_responses") == []
+
+
+def test_single_decision_on_closed_order(owner_orders):
+    client, dbb, owner, order_ids, _ = owner_orders
+    _order(dbb, order_ids[0])["sent_for_delivery"] = True
+    dbb.seed("order_responses", [{"order_id": order_ids[1], "restaurant_owner_id": owner["id"], "overall_status": "auto_rejected"}])
+
+    for order_id in order_ids[:2]:
+        response = _submit(client, owner, order_id)
+        assert response.status_code == 409
+        assert _outbox(dbb, order_id) == []
+
+
+def test_single_decision_bad_input(owner_orders):
+    client, dbb, owner, order_ids, _ = owner_orders
+
+    response = _submit(client, owner, "not-a-uuid")
+    assert response.status_code == 422
+    assert response.json()["detail"] == "order_id must be a UUID"
+
+    assert _submit(client, owner, order_ids[0], "maybe").status_code == 400
+    assert dbb.rows("order_responses") == []
@@ -0,0 +1,47 @@
+"""
+Webhook duplicate checks cover archived orders and repeats within a batch.
+"""
+import random
+
+import pytest
+
+from config import settings
+from loadtest.scenarios import make_webhook_order
+
+
+@pytest.fixture
+def archived_order(fake_app, monkeypatch):
+    """An order that was moved to the archive tier (seen through the fetched_orders_all view)"""
+    _, dbb, _, owners = fake_app
+    monkeypatch.setattr(settings, "ORDER_ARCHIVE_ENABLED", True)
+    order = make_webhook_order(random.Random(3), owners[0], 2)
+    # The fake has no views: seed the hot rows plus the archived one under the view's name
+    dbb.seed("fetched_orders_all", [dict(row) for row in dbb.rows("fetched_orders")] + [
+        {**order, "restaurant_owner_id": owners[0]["id"], "sent_for_delivery": True}
+    ])
+    return order
+
+
+def test_batch_skips_archived_and_repeated_orders(fake_app, archived_order):
+    client, dbb, _, owners = fake_app
+    rng = random.Random(5)
+    new_order = make_webhook_order(rng, owners[1], 2)
+    repeated = {**new_order, "order_id": new_order["order_id"].upper()}
+    hot_before = len(dbb.rows("fetched_orders"))
+
+    response = client.post("/api/webhook/receive-orders", json={"orders": [archived_order, new_order, repeated]})
+
+    assert response.status_code == 200
+    assert (response.json()["inserted_count"], response.json()["skipped_count"]) == (1, 2)
+    assert len(dbb.rows("fetched_orders")) == hot_before + 1
+
+
+def test_single_order_skips_archived_order(fake_app, archived_order):
+    client, dbb, _, _ = fake_app
+    hot_before = len(dbb.rows("fetched_orders"))
+
+    response = client.post("/api/webhook/receive-order", json=archived_order)
+
+    assert response.status_code == 200
+    assert response.json()["inserted"] is False
+    assert len(dbb.rows("fetched_orders")) == hot_before
@@ -0,0 +1,94 @@
+"""
+Archival tiering for fetched_orders / order_responses.
+
+Orders sent for delivery more than ORDER_ARCHIVE_AFTER_DAYS ago are moved,
+together with their responses, into fetched_orders_archive /
+order_responses_archive by the archive_sent_orders() function
+(Docs/create_order_archive.sql), one batch per call. The active-order path
+keeps reading the hot tables only; history, exports and earnings read the
+*_all views spanning both tiers through history_table().
+"""
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+import logging
+
+from config import settings
+from database import get_dbb
+
+logger = logging.getLogger(__name__)
+
+
+def history_table(table: str) -> str:
+    """
+    Table (or view) to read for a full order history: the hot table, or the
+    view spanning hot and archive tiers once archival is enabled.
+    Only for reads; writes always go to the hot table.
+    """
+    return f"{table}_all" if settings.ORDER_ARCHIVE_ENABLED else table
+
+
+def archive_sent_orders(
+    older_than_days: int = 30,
+    batch_size: int = 1000,
+    max_batches: Optional[int] = None
+) -> Dict:
+    """
+    Move old sent orders to the archive tier in batches until none are left
+    (or max_batches have run). Each batch is one transaction in Database B.
+
+    Returns a report dict.
+    """
+    dbb = get_dbb()
+    started = time.monotonic()
+
+    report = {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "older_than_days": older_than_days,
+        "batch_size": batch_size,
+        "batches": 0,
+        "archived_orders": 0
+    }
+
+    while max_batches is None or report["batches"] < max_batches:
+        result = dbb.rpc("archive_sent_orders", {
+            "p_older_than_days": older_than_days,
+            "p_batch_size": batch_size
+        }).execute()
+        moved = int(result.data or 0)
+        report["batches"] += 1
+        report["archived_orders"] += moved
+        if moved < batch_size:
+            break
+
+    report["finished_at"] = datetime.now(timezone.utc).isoformat()
+    report["duration_seconds"] = round(time.monotonic() - started, 3)
+
+    logger.info(
+        "Order archival: archived=%s batches=%s older_than_days=%s duration=%ss",
+        report["archived_orders"], report["batches"], older_than_days, report["duration_seconds"],
+    )
+    return report
+
+
+async def run_archive_job() -> None:
+    """Archive old sent orders every ORDER_ARCHIVE_INTERVAL_MINUTES."""
+    interval = settings.ORDER_ARCHIVE_INTERVAL_MINUTES * 60
+    logger.info(
+        "Order archival scheduled every %s minute(s) for orders sent over %s day(s) ago",
+        settings.ORDER_ARCHIVE_INTERVAL_MINUTES, settings.ORDER_ARCHIVE_AFTER_DAYS
+    )
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(
+                archive_sent_orders,
+                older_than_days=settings.ORDER_ARCHIVE_AFTER_DAYS,
+                batch_size=settings.ORDER_ARCHIVE_BATCH_SIZE,
+                max_batches=settings.ORDER_ARCHIVE_MAX_BATCHES or None
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Order archival failed: %s", e)
@@ -0,0 +1,203 @@
+"""
+Negotiated response compression (brotli, or gzip for clients without it).
+
+Large JSON payloads such as order-history and earnings-transactions go to
+tablets on mobile data, so compressible responses above COMPRESSION_MIN_SIZE
+are encoded with levels chosen for low CPU cost rather than maximum ratio.
+Streaming responses are compressed chunk by chunk and flushed, so rows keep
+reaching the client as they are produced. Endpoints decorated with
+@skip_compression are always sent as-is.
+"""
+import zlib
+from typing import Callable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from config import settings
+from utils.metrics import (
+    http_compression_input_bytes_total,
+    http_compression_output_bytes_total,
+    http_compression_saved_bytes_total,
+    http_compression_skipped_total,
+)
+
+try:
+    import brotli
+except ImportError:  # listed in requirements.txt; without it only gzip is offered
+    brotli = None
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+}
+
+# Preference order when the client accepts several encodings with equal q
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli else ("gzip",)
+
+
+def skip_compression(endpoint: Callable) -> Callable:
+    """Route decorator: never compress this endpoint's responses (tiny or latency-critical)"""
+    endpoint.skip_compression = True
+    return endpoint
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Best supported encoding for an Accept-Encoding header, honouring q-values"""
+    qualities = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding] = quality
+
+    best, best_quality = None, 0.0
+    for coding in SUPPORTED_ENCODINGS:
+        quality = qualities.get(coding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def _is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type.startswith("text/") or media_type.endswith("+json") or media_type in COMPRESSIBLE_TYPES
+
+
+class _Encoder:
+    """Incremental gzip/brotli encoder; flush() makes everything so far decodable"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        else:
+            self._gzip = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + (self._brotli.flush() if flush else b"")
+        return self._gzip.compress(data) + (self._gzip.flush(zlib.Z_SYNC_FLUSH) if flush else b"")
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._gzip.compress(data) + self._gzip.flush(zlib.Z_FINISH)
+
+
+class _CompressionResponder:
+    def __init__(self, scope, send, encoding: str):
+        self.scope = scope
+        self.send = send
+        self.encoding = encoding
+        self.start_message = None
+        self.mode = None  # "passthrough" | "compress" | "stream"
+        self.encoder = None
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def _route_path(self) -> str:
+        return getattr(self.scope.get("route"), "path", None) or "unmatched"
+
+    def _skip_reason(self, headers: Headers, body: bytes, more_body: bool) -> Optional[str]:
+        status_code = self.start_message["status"]
+        if status_code < 200 or status_code in (204, 304) or self.scope.get("method") == "HEAD":
+            return "no_body"
+        if getattr(getattr(self.scope.get("route"), "endpoint", None), "skip_compression", False):
+            return "opt_out"
+        if "content-encoding" in headers:
+            return "already_encoded"
+        if not _is_compressible(headers.get("content-type", "")):
+            return "content_type"
+        length = headers.get("content-length")
+        size = int(length) if length and length.isdigit() else (None if more_body else len(body))
+        if size is not None and size < settings.COMPRESSION_MIN_SIZE:
+            return "below_min_size"
+        return None
+
+    async def __call__(self, message) -> None:
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk shows whether to compress
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.mode is None:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            reason = self._skip_reason(headers, body, more_body)
+            if reason:
+                http_compression_skipped_total.inc(reason=reason)
+                if reason in ("below_min_size", "opt_out"):
+                    headers.add_vary_header("Accept-Encoding")
+                self.mode = "passthrough"
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+
+            self.encoder = _Encoder(self.encoding)
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                self.mode = "stream"
+                del headers["Content-Length"]
+            else:
+                self.mode = "compress"
+                compressed = self.encoder.finish(body)
+                headers["Content-Length"] = str(len(compressed))
+                self._record(len(body), len(compressed))
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+            await self.send(self.start_message)
+
+        if self.mode == "passthrough":
+            await self.send(message)
+            return
+
+        # Streaming: flush each chunk so the client sees rows as they are produced
+        self.bytes_in += len(body)
+        chunk = self.encoder.compress(body, flush=True) if more_body else self.encoder.finish(body)
+        self.bytes_out += len(chunk)
+        if not more_body:
+            self._record(self.bytes_in, self.bytes_out)
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    def _record(self, bytes_in: int, bytes_out: int) -> None:
+        http_compression_input_bytes_total.inc(bytes_in, encoding=self.encoding)
+        http_compression_output_bytes_total.inc(bytes_out, encoding=self.encoding)
+        # A short stream can come out larger than it went in (encoder header plus
+        # per-chunk flush markers); counters must never decrease, so that counts as 0 saved
+        http_compression_saved_bytes_total.inc(max(bytes_in - bytes_out, 0), route=self._route_path(), encoding=self.encoding)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses for clients that send Accept-Encoding"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, _CompressionResponder(scope, send, encoding))
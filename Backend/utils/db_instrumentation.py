@@ -0,0 +1,140 @@
+"""
+Instrumented wrapper around the Supabase clients.
+
+Every `.execute()` issued through `get_dbb()` / `get_dba()` is timed and
+reported to the registered query observers as a QueryEvent describing the
+database, table (or `rpc:<function>`), operation and filtered columns.
+Metrics, request accounting and the slow-query log are all observers.
+"""
+import time
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Builder methods that decide the statement type
+OPERATION_METHODS = ("select", "insert", "upsert", "update", "delete")
+
+# Builder methods whose first argument is a filtered column
+FILTER_METHODS = (
+    "eq", "neq", "gt", "gte", "lt", "lte", "like", "ilike", "is_", "in_",
+    "contains", "contained_by", "overlaps", "text_search", "filter"
+)
+
+
+class QueryEvent(NamedTuple):
+    db: str                    # "dbb" or "dba"
+    table: str                 # table name, or "rpc:<function>"
+    operation: str             # select/insert/upsert/update/delete/rpc
+    filters: Tuple[str, ...]   # filtered columns in call order ("or" for logic trees)
+    duration: float            # seconds spent in execute()
+    error: Optional[str]       # exception class name when execute() raised
+
+
+_observers: List[Callable[[QueryEvent], None]] = []
+
+
+def add_query_observer(observer: Callable[[QueryEvent], None]) -> None:
+    """Register a callback invoked (in the calling thread) after every query."""
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def remove_query_observer(observer: Callable[[QueryEvent], None]) -> None:
+    if observer in _observers:
+        _observers.remove(observer)
+
+
+def _notify(event: QueryEvent) -> None:
+    for observer in list(_observers):
+        try:
+            observer(event)
+        except Exception as e:
+            # Instrumentation must never break the query itself
+            logger.warning("Query observer %s failed: %s", getattr(observer, "__name__", observer), e)
+
+
+class _QueryProxy:
+    """
+    Wraps a postgrest request builder and records the operation and filter
+    columns as the query is built. Builder calls are forwarded unchanged.
+    """
+
+    def __init__(self, builder: Any, db: str, table: str, operation: Optional[str] = None):
+        self._builder = builder
+        self._db = db
+        self._table = table
+        self._operation = operation
+        self._filters: List[str] = []
+
+    def _track(self, name: str, args: tuple, kwargs: dict) -> None:
+        if name in OPERATION_METHODS:
+            self._operation = name
+        elif name in FILTER_METHODS and args and isinstance(args[0], str):
+            self._filters.append(args[0])
+        elif name in ("or_", "and_"):
+            self._filters.append(name.rstrip("_"))
+        elif name == "match" and args and isinstance(args[0], dict):
+            self._filters.extend(args[0].keys())
+
+    def execute(self, *args, **kwargs):
+        started = time.perf_counter()
+        error = None
+        try:
+            return self._builder.execute(*args, **kwargs)
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            _notify(QueryEvent(
+                db=self._db,
+                table=self._table,
+                operation=self._operation or "select",
+                filters=tuple(self._filters),
+                duration=time.perf_counter() - started,
+                error=error
+            ))
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._builder, name)
+        if hasattr(attr, "execute"):
+            # Property-style builders such as `not_`
+            self._builder = attr
+            return self
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if hasattr(result, "execute"):
+                self._track(name, args, kwargs)
+                self._builder = result
+                return self
+            return result
+
+        return call
+
+
+class InstrumentedClient:
+    """Drop-in wrapper for a supabase Client that instruments table and RPC queries."""
+
+    def __init__(self, client: Any, db: str):
+        self._client = client
+        self._db = db
+
+    def table(self, table_name: str) -> _QueryProxy:
+        return _QueryProxy(self._client.table(table_name), self._db, table_name)
+
+    def from_(self, table_name: str) -> _QueryProxy:
+        return self.table(table_name)
+
+    def rpc(self, fn: str, params: Optional[dict] = None, *args, **kwargs) -> _QueryProxy:
+        return _QueryProxy(
+            self._client.rpc(fn, params or {}, *args, **kwargs),
+            self._db,
+            f"rpc:{fn}",
+            operation="rpc"
+        )
+
+    def __getattr__(self, name: str):
+        return getattr(self._client, name)
@@ -0,0 +1,121 @@
+"""
+Write-behind sync of order statuses to Database A.
+
+Owner actions only record a status intent in Database B (dba_sync_outbox).
+A background worker claims due intents in batches, writes them to
+customer_orders in Database A with one update per status, and retries
+failures with exponential backoff. A claim returns at most one intent per
+order (the newest) and retires older pending ones, so a retried stale status
+never overwrites a newer one. See Docs/create_dba_sync_outbox.sql.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+import logging
+
+from config import settings
+from database import get_dbb, get_dba
+from utils.orders import chunked, group_by_decision, update_dba_order_status
+
+logger = logging.getLogger(__name__)
+
+# How long a claimed batch stays invisible to other workers
+CLAIM_LEASE_SECONDS = 60
+
+
+def _retry_delay(attempts: int) -> int:
+    """Exponential backoff in seconds, capped by DBA_SYNC_MAX_BACKOFF_SECONDS."""
+    return min(2 ** attempts, settings.DBA_SYNC_MAX_BACKOFF_SECONDS)
+
+
+def _mark_synced(dbb, outbox_ids: List[int], synced_at: str) -> None:
+    for chunk in chunked(outbox_ids):
+        dbb.table("dba_sync_outbox").update({
+            "synced_at": synced_at,
+            "leased_until": None,
+            "last_error": None
+        }).in_("id", chunk).execute()
+
+
+def _mark_failed(dbb, intents: List[Dict], error: str) -> None:
+    """Push failed intents back with a later next_attempt_at, grouped by attempt count."""
+    by_attempts: Dict[int, List[int]] = {}
+    for intent in intents:
+        by_attempts.setdefault(intent["attempts"] + 1, []).append(intent["id"])
+
+    now = datetime.now(timezone.utc)
+    for attempts, outbox_ids in by_attempts.items():
+        next_attempt_at = (now + timedelta(seconds=_retry_delay(attempts))).isoformat()
+        for chunk in chunked(outbox_ids):
+            dbb.table("dba_sync_outbox").update({
+                "attempts": attempts,
+                "next_attempt_at": next_attempt_at,
+                "leased_until": None,
+                "last_error": error[:500]
+            }).in_("id", chunk).execute()
+
+
+def sync_pending_batch(batch_size: int = None) -> int:
+    """
+    Claim one batch of due intents and write them to Database A.
+
+    Returns the number of intents claimed (0 means the outbox is drained).
+    """
+    dbb = get_dbb()
+    dba = get_dba()
+
+    claimed = dbb.rpc("claim_dba_sync_batch", {
+        "p_limit": batch_size or settings.DBA_SYNC_BATCH_SIZE,
+        "p_lease_seconds": CLAIM_LEASE_SECONDS
+    }).execute()
+    # claim_dba_sync_batch returns only the newest intent per order
+    intents = claimed.data or []
+    if not intents:
+        return 0
+    latest: Dict[str, Dict] = {intent["order_id"]: intent for intent in intents}
+
+    synced_at = datetime.now(timezone.utc).isoformat()
+    synced_ids = []
+    failed_count = 0
+
+    grouped = group_by_decision({order_id: intent["status"] for order_id, intent in latest.items()})
+    for order_status, order_ids in grouped.items():
+        group_intents = [latest[order_id] for order_id in order_ids]
+
+        if update_dba_order_status(dba, order_ids, order_status):
+            synced_ids.extend(intent["id"] for intent in group_intents)
+            # Only flag responses that still carry the status we just wrote
+            for chunk in chunked(order_ids):
+                dbb.table("order_responses").update({
+                    "synced_to_dba": True
+                }).in_("order_id", chunk).eq("overall_status", order_status).execute()
+        else:
+            failed_count += len(group_intents)
+            _mark_failed(dbb, group_intents, f"Database A update failed for status {order_status}")
+
+    _mark_synced(dbb, synced_ids, synced_at)
+
+    logger.info(
+        "DBA sync batch: claimed=%s synced=%s failed=%s",
+        len(intents), len(synced_ids), failed_count,
+    )
+    return len(intents)
+
+
+async def run_dba_sync_worker() -> None:
+    """Drain the outbox forever; sleeps between polls once it is empty."""
+    logger.info(
+        "DBA sync worker started: interval=%ss batch_size=%s",
+        settings.DBA_SYNC_INTERVAL_SECONDS, settings.DBA_SYNC_BATCH_SIZE,
+    )
+    while True:
+        try:
+            claimed = await asyncio.to_thread(sync_pending_batch)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("DBA sync worker error: %s", e)
+            claimed = 0
+
+        if claimed < settings.DBA_SYNC_BATCH_SIZE:
+            await asyncio.sleep(settings.DBA_SYNC_INTERVAL_SECONDS)
@@ -1,6 +1,7 @@
 from fastapi import HTTPException, Security, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from utils.auth import decode_access_token
+from utils.request_accounting import set_request_owner
 from database import get_dbb
 from typing import Dict
 
@@ -37,6 +38,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Security(
         )
     
     user = result.data[0]
+    set_request_owner(user["id"])
     
     # Check if user is approved
     if user["approval_status"] != "approved":
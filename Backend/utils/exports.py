@@ -0,0 +1,209 @@
+"""
+Streaming CSV/NDJSON exports of a restaurant owner's orders and transactions.
+
+fetched_orders is read one keyset page at a time, ordered by (fetched_at, id),
+and every page is encoded and yielded before the next one is requested, so
+memory stays bounded by EXPORT_PAGE_SIZE however long the history is.
+fetched_at is used rather than created_at because it is always set (created_at
+comes from Database A and can be null on old rows) and trails it by minutes.
+Reads span the hot and archive tiers (utils/archive.py).
+
+The generators are synchronous like the Supabase client; StreamingResponse
+iterates them in the threadpool.
+"""
+import csv
+import io
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import orjson
+
+from config import settings
+from utils.archive import history_table
+from utils.order_shaping import order_transaction_payload, shape_history_order
+from utils.orders import chunked, quote_filter_value
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("csv", "ndjson")
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+ORDER_EXPORT_COLUMNS = (
+    "id, order_id, customer_name, customer_phone, items, subtotal, total_amount, "
+    "payment_status, order_status, created_at, fetched_at"
+)
+
+HISTORY_CSV_FIELDS = [
+    "order_id", "created_at", "customer_name", "customer_phone", "items", "total_amount",
+    "payment_status", "order_status", "response_status", "responded_at",
+]
+
+TRANSACTION_CSV_FIELDS = [
+    "transaction_id", "order_id", "order_date", "customer_name", "customer_phone",
+    "order_total", "platform_commission", "delivery_fee", "net_amount", "is_paid",
+]
+
+# Spreadsheet apps evaluate cells starting with these as formulas
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def export_window(from_date: Optional[date], to_date: Optional[date]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """
+    [since, until) in UTC for an inclusive local date range in STATS_TIMEZONE.
+    Either end may be None (unbounded).
+    """
+    tz = ZoneInfo(settings.STATS_TIMEZONE)
+    since = datetime.combine(from_date, time.min, tz).astimezone(timezone.utc) if from_date else None
+    until = datetime.combine(to_date + timedelta(days=1), time.min, tz).astimezone(timezone.utc) if to_date else None
+    return since, until
+
+
+def export_filename(kind: str, export_format: str, from_date: Optional[date], to_date: Optional[date]) -> str:
+    parts = [kind]
+    if from_date:
+        parts.append(f"from-{from_date.isoformat()}")
+    if to_date:
+        parts.append(f"to-{to_date.isoformat()}")
+    return "-".join(parts) + f".{export_format}"
+
+
+def iter_order_pages(
+    dbb,
+    owner_id: str,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    page_size: Optional[int] = None
+) -> Iterator[List[Dict]]:
+    """Yield the owner's fetched_orders in (fetched_at, id) order, one keyset page at a time"""
+    page_size = page_size or settings.EXPORT_PAGE_SIZE
+    last = None
+    while True:
+        query = dbb.table(history_table("fetched_orders")).select(ORDER_EXPORT_COLUMNS).eq("restaurant_owner_id", owner_id)
+        if since:
+            query = query.gte("fetched_at", since.isoformat())
+        if until:
+            query = query.lt("fetched_at", until.isoformat())
+        if last:
+            fetched_at, row_id = quote_filter_value(last["fetched_at"]), quote_filter_value(str(last["id"]))
+            query = query.or_(f"fetched_at.gt.{fetched_at},and(fetched_at.eq.{fetched_at},id.gt.{row_id})")
+
+        rows = query.order("fetched_at").order("id").limit(page_size).execute().data or []
+        if not rows:
+            return
+        yield rows
+        if len(rows) < page_size:
+            return
+        last = rows[-1]
+
+
+def _responses_for(dbb, orders: List[Dict]) -> Dict[str, Dict]:
+    responses_map = {}
+    for chunk in chunked([order["order_id"] for order in orders]):
+        result = dbb.table(history_table("order_responses")).select(
+            "order_id, overall_status, responded_at"
+        ).in_("order_id", chunk).execute()
+        responses_map.update({
+            resp["order_id"]: {"overall_status": resp["overall_status"], "responded_at": resp["responded_at"]}
+            for resp in result.data or []
+        })
+    return responses_map
+
+
+def _csv_safe(value):
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES) and not value[1:].replace(" ", "").replace("-", "").isdigit():
+        return "'" + value
+    return value
+
+
+def _items_summary(items: List[Dict]) -> str:
+    return "; ".join(f"{item.get('quantity', 0)} x {item.get('name', '')}" for item in items)
+
+
+def history_csv_row(entry: Dict) -> Dict:
+    """Flatten one order-history entry for CSV (items summarised, response split out)"""
+    response = entry["response"] or {}
+    return {
+        **{field: entry.get(field) for field in HISTORY_CSV_FIELDS},
+        "items": _items_summary(entry["items"]),
+        "response_status": response.get("overall_status"),
+        "responded_at": response.get("responded_at"),
+    }
+
+
+def encode_csv(rows: List[Dict], fields: List[str], header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction="ignore", lineterminator="\r\n")
+    if header:
+        writer.writeheader()
+    for row in rows:
+        writer.writerow({field: _csv_safe(row.get(field)) for field in fields})
+    return buffer.getvalue().encode("utf-8")
+
+
+def encode_ndjson(rows: List[Dict]) -> bytes:
+    return b"".join(orjson.dumps(row) + b"\n" for row in rows)
+
+
+def _stream(
+    pages: Iterator[List[Dict]],
+    shape_page: Callable[[List[Dict]], List[Dict]],
+    export_format: str,
+    csv_fields: List[str],
+    csv_row: Callable[[Dict], Dict] = lambda row: row
+) -> Iterator[bytes]:
+    # One chunk per page keeps writes (and compression flushes) coarse
+    if export_format == "csv":
+        yield encode_csv([], csv_fields, header=True)
+    try:
+        for page in pages:
+            rows = shape_page(page)
+            if export_format == "csv":
+                yield encode_csv([csv_row(row) for row in rows], csv_fields)
+            else:
+                yield encode_ndjson(rows)
+    except Exception:
+        # Headers are already sent; abort so the client sees a truncated download, not a short file
+        logger.exception("Export stream failed")
+        raise
+
+
+def stream_order_history(
+    dbb,
+    owner_id: str,
+    export_format: str,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None
+) -> Iterator[bytes]:
+    """Order-history entries (same shape as GET /api/owner/order-history) as CSV or NDJSON"""
+    def shape_page(orders: List[Dict]) -> List[Dict]:
+        responses_map = _responses_for(dbb, orders)
+        return [shape_history_order(order, responses_map.get(order["order_id"])) for order in orders]
+
+    return _stream(
+        iter_order_pages(dbb, owner_id, since, until),
+        shape_page, export_format, HISTORY_CSV_FIELDS, history_csv_row
+    )
+
+
+def stream_transactions(
+    dbb,
+    owner_id: str,
+    commission_rate: float,
+    export_format: str,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None
+) -> Iterator[bytes]:
+    """Earnings transactions (same shape as GET /api/owner/earnings-transactions) as CSV or NDJSON"""
+    def shape_page(orders: List[Dict]) -> List[Dict]:
+        return [order_transaction_payload(order, owner_id, commission_rate) for order in orders]
+
+    return _stream(
+        iter_order_pages(dbb, owner_id, since, until),
+        shape_page, export_format, TRANSACTION_CSV_FIELDS
+    )
@@ -0,0 +1,210 @@
+"""
+Top items and weekday/hour demand forecast for GET /api/owner/item-analytics.
+
+Reads the pre-aggregated item_daily_rollups / item_hourly_rollups tables
+(Docs/create_item_rollups.sql), never fetched_orders.items. An owner's
+rollups are loaded once into column arrays and cached per worker; every
+request first reads the owner's rollup version (bumped by the rollup triggers
+whenever new orders or decisions change the rollups) and reloads when it
+moved, so all workers see a change on their next request. Window totals and
+the forecast are then computed with numpy over the arrays.
+"""
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+from zoneinfo import ZoneInfo
+import logging
+
+import numpy as np
+
+from config import settings
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# PostgREST returns at most this many rows per request
+ROLLUP_PAGE_SIZE = 1000
+
+# owner id -> (rollup version, ItemRollups); entries are only reused at the same version
+item_analytics_cache = TTLCache(ttl_seconds=settings.ITEM_ANALYTICS_CACHE_SECONDS, max_entries=1024)
+
+
+def _select_all(query_factory) -> List[Dict]:
+    rows = []
+    while True:
+        page = query_factory().range(len(rows), len(rows) + ROLLUP_PAGE_SIZE - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < ROLLUP_PAGE_SIZE:
+            return rows
+
+
+class ItemRollups:
+    """One owner's rollups as parallel column arrays (item index per row)"""
+
+    def __init__(self, today: date, daily: List[Dict], hourly: List[Dict], forecast_weeks: int):
+        self.today = today
+        self.forecast_weeks = forecast_weeks
+        self.item_ids: List[str] = []
+        self.item_names: List[str] = []
+        index: Dict[str, int] = {}
+
+        def item_index(menu_item_id: str, name: Optional[str] = None) -> int:
+            if menu_item_id not in index:
+                index[menu_item_id] = len(self.item_ids)
+                self.item_ids.append(menu_item_id)
+                self.item_names.append(name or menu_item_id)
+            elif name:
+                self.item_names[index[menu_item_id]] = name
+            return index[menu_item_id]
+
+        # Daily rows arrive oldest first, so the newest name wins
+        self.daily_item = np.array([item_index(row["menu_item_id"], row["item_name"]) for row in daily], dtype=np.int64)
+        self.daily_age = np.array([(today - date.fromisoformat(row["day"])).days for row in daily], dtype=np.int64)
+        self.daily_quantity = np.array([row["quantity"] for row in daily], dtype=np.int64)
+        self.daily_revenue = np.array([row["revenue"] for row in daily], dtype=np.int64)
+
+        hourly_days = [date.fromisoformat(row["day"]) for row in hourly]
+        self.hourly_item = np.array([item_index(row["menu_item_id"]) for row in hourly], dtype=np.int64)
+        self.hourly_slot = np.array(
+            [day.weekday() * 24 + row["hour"] for day, row in zip(hourly_days, hourly)], dtype=np.int64
+        )
+        self.hourly_quantity = np.array([row["quantity"] for row in hourly], dtype=np.int64)
+
+        # Weeks actually observed per weekday, so new restaurants are not averaged against empty weeks
+        first_day = min(hourly_days) if hourly_days else today
+        start = max(first_day, today - timedelta(days=7 * forecast_weeks))
+        self.weekday_weeks = [0] * 7
+        for offset in range((today - start).days):
+            self.weekday_weeks[(start + timedelta(days=offset)).weekday()] += 1
+
+        self.slot_demand = self._slot_demand()
+
+    def _slot_demand(self) -> np.ndarray:
+        """Expected quantity per (item, weekday * 24 + hour): mean over observed weeks"""
+        size = len(self.item_ids) * 7 * 24
+        flat = self.hourly_item * (7 * 24) + self.hourly_slot
+        totals = np.bincount(flat, weights=self.hourly_quantity, minlength=size)
+        weeks_per_slot = np.maximum(np.repeat(self.weekday_weeks, 24), 1)
+        return totals.reshape(len(self.item_ids), 7 * 24) / weeks_per_slot
+
+    def top_items(self, days: int, limit: int) -> Dict[str, List[Dict]]:
+        """Top items by quantity and by revenue over the last `days` local days (today included)"""
+        n_items = len(self.item_ids)
+        mask = self.daily_age < days
+        quantity = np.bincount(self.daily_item[mask], weights=self.daily_quantity[mask], minlength=n_items)
+        revenue = np.bincount(self.daily_item[mask], weights=self.daily_revenue[mask], minlength=n_items)
+        by_quantity = np.lexsort((-revenue, -quantity))[:limit].tolist()
+        by_revenue = np.lexsort((-quantity, -revenue))[:limit].tolist()
+
+        def entries(order: List[int], key) -> List[Dict]:
+            return [
+                {
+                    "menu_item_id": self.item_ids[i],
+                    "item_name": self.item_names[i],
+                    "total_quantity": int(quantity[i]),
+                    "total_revenue": int(revenue[i]),
+                }
+                for i in order if key[i] > 0
+            ]
+
+        return {"top_by_quantity": entries(by_quantity, quantity), "top_by_revenue": entries(by_revenue, revenue)}
+
+    def demand_by_slot(self) -> List[Dict]:
+        """Expected total quantity for every weekday/hour that has any demand"""
+        totals = self.slot_demand.sum(axis=0).tolist()
+        return [
+            {"weekday": slot // 24, "hour": slot % 24, "expected_quantity": round(total, 2)}
+            for slot, total in enumerate(totals) if total > 0
+        ]
+
+    def upcoming(self, now: datetime, hours: int, limit: int) -> List[Dict]:
+        """Items expected in each of the next `hours` local hours, starting with the current one"""
+        upcoming = []
+        for offset in range(hours):
+            moment = now + timedelta(hours=offset)
+            slot = moment.weekday() * 24 + moment.hour
+            expected = self.slot_demand[:, slot]
+            order = np.argsort(-expected, kind="stable")[:limit].tolist()
+            upcoming.append({
+                "weekday": moment.weekday(),
+                "hour": moment.hour,
+                "items": [
+                    {
+                        "menu_item_id": self.item_ids[i],
+                        "item_name": self.item_names[i],
+                        "expected_quantity": round(float(expected[i]), 2),
+                    }
+                    for i in order if expected[i] > 0
+                ],
+            })
+        return upcoming
+
+
+def check_rollup_timezone(dbb) -> bool:
+    """
+    Compare the database's rollup_timezone() with STATS_TIMEZONE at start-up.
+    The triggers bucket rollup days/hours in the database's zone while the
+    backend picks "today" and the forecast hour in its own, so a mismatch
+    shifts every window; it is logged as an error rather than failing start-up.
+    """
+    try:
+        rollup_tz = dbb.rpc("rollup_timezone", {}).execute().data
+    except Exception as e:
+        logger.warning("Could not read rollup_timezone() (item rollups installed?): %s", e)
+        return False
+
+    if rollup_tz != settings.STATS_TIMEZONE:
+        logger.error(
+            "Item rollups use timezone %s but STATS_TIMEZONE is %s: change rollup_timezone() in "
+            "Docs/create_item_rollups.sql and run SELECT public.rebuild_item_rollups()",
+            rollup_tz, settings.STATS_TIMEZONE
+        )
+        return False
+    return True
+
+
+def rollup_version(dbb, owner_id: str) -> int:
+    """The owner's item_rollup_versions.version (0 before their first order)"""
+    result = dbb.table("item_rollup_versions").select("version").eq("restaurant_owner_id", owner_id).execute()
+    return result.data[0]["version"] if result.data else 0
+
+
+def load_item_rollups(dbb, owner_id: str) -> ItemRollups:
+    """Read the owner's rollups for the longest window and the forecast weeks"""
+    today = datetime.now(ZoneInfo(settings.STATS_TIMEZONE)).date()
+    forecast_weeks = settings.ITEM_ANALYTICS_FORECAST_WEEKS
+    daily_since = today - timedelta(days=settings.ITEM_ANALYTICS_MAX_DAYS - 1)
+    hourly_since = today - timedelta(days=7 * forecast_weeks)
+
+    daily = _select_all(lambda: dbb.table("item_daily_rollups").select(
+        "day, menu_item_id, item_name, quantity, revenue"
+    ).eq("restaurant_owner_id", owner_id).gte("day", daily_since.isoformat()).order("day").order("menu_item_id"))
+
+    # Complete days only: today's partial hours would drag the averages down
+    hourly = _select_all(lambda: dbb.table("item_hourly_rollups").select(
+        "day, hour, menu_item_id, quantity"
+    ).eq("restaurant_owner_id", owner_id).gte("day", hourly_since.isoformat()).lt(
+        "day", today.isoformat()
+    ).order("day").order("hour").order("menu_item_id"))
+
+    return ItemRollups(today, daily, hourly, forecast_weeks)
+
+
+def item_analytics(dbb, owner_id: str, days: int, limit: int) -> Dict:
+    """Payload for GET /api/owner/item-analytics (rollups cached per owner and rollup version)"""
+    # Read before the rollups: a change committed in between is picked up on the next request
+    version = rollup_version(dbb, owner_id)
+    cached = item_analytics_cache.get(owner_id)
+    if cached is not None and cached[0] == version:
+        rollups = cached[1]
+    else:
+        rollups = load_item_rollups(dbb, owner_id)
+        item_analytics_cache.set(owner_id, (version, rollups))
+    now = datetime.now(ZoneInfo(settings.STATS_TIMEZONE))
+    return {
+        "days": days,
+        "since": (rollups.today - timedelta(days=days - 1)).isoformat(),
+        **rollups.top_items(days, limit),
+        "forecast_weeks": rollups.forecast_weeks,
+        "demand_by_slot": rollups.demand_by_slot(),
+        "upcoming": rollups.upcoming(now, settings.ITEM_ANALYTICS_FORECAST_HOURS, limit),
+    }
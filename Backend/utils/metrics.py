@@ -0,0 +1,199 @@
+"""
+Minimal Prometheus metrics (text exposition format 0.0.4) for the API.
+
+Metrics are kept in process memory. When running several gunicorn workers
+each worker exports its own series; Prometheus sums them per instance.
+"""
+import bisect
+import threading
+import time
+from typing import Dict, List, Sequence, Tuple
+
+from utils.db_instrumentation import QueryEvent, add_query_observer
+
+# Latency buckets in seconds (API requests and DB round trips)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Orders per webhook call
+BATCH_SIZE_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+_registry: List["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts..., +Inf count], sum
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            values = sorted((key, (list(counts), total[0])) for key, (counts, total) in self._values.items())
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_number(bound) if bound == float("inf") else bound}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_number(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+def render_metrics() -> str:
+    """Render every registered metric in Prometheus text format."""
+    lines: List[str] = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ============================================
+# Metric definitions
+# ============================================
+
+http_requests_total = Counter(
+    "http_requests_total", "HTTP requests by route template and status code", ("method", "route", "status")
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route")
+)
+db_queries_total = Counter(
+    "db_queries_total", "Supabase queries by database, table and operation", ("db", "table", "operation", "outcome")
+)
+db_query_duration_seconds = Histogram(
+    "db_query_duration_seconds", "Supabase query latency by database, table and operation", ("db", "table", "operation")
+)
+webhook_batch_orders = Histogram(
+    "webhook_batch_orders", "Orders received per webhook call", ("endpoint",), buckets=BATCH_SIZE_BUCKETS
+)
+webhook_orders_total = Counter(
+    "webhook_orders_total", "Webhook orders by result (inserted/skipped)", ("result",)
+)
+push_notifications_total = Counter(
+    "push_notifications_total", "Expo push notification attempts by outcome", ("outcome",)
+)
+http_compression_input_bytes_total = Counter(
+    "http_compression_input_bytes_total", "Response body bytes before compression", ("encoding",)
+)
+http_compression_output_bytes_total = Counter(
+    "http_compression_output_bytes_total", "Response body bytes after compression", ("encoding",)
+)
+http_compression_saved_bytes_total = Counter(
+    "http_compression_saved_bytes_total", "Bytes saved by response compression per route template", ("route", "encoding")
+)
+http_compression_skipped_total = Counter(
+    "http_compression_skipped_total", "Responses sent uncompressed to clients that accept compression, by reason", ("reason",)
+)
+
+
+def _record_query(event: QueryEvent) -> None:
+    db_queries_total.inc(
+        db=event.db, table=event.table, operation=event.operation,
+        outcome="error" if event.error else "ok"
+    )
+    db_query_duration_seconds.observe(event.duration, db=event.db, table=event.table, operation=event.operation)
+
+
+add_query_observer(_record_query)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request latency and status per route template
+    (e.g. /api/admin/approve-owner/{owner_id}) so path parameters don't
+    explode label cardinality. Unmatched paths are grouped as "unmatched".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "")
+            http_requests_total.inc(method=method, route=route_path, status=str(status_code))
+            http_request_duration_seconds.observe(time.perf_counter() - started, method=method, route=route_path)
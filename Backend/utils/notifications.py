@@ -5,6 +5,8 @@ import requests
 from typing import List, Dict, Optional
 import logging
 
+from utils.metrics import push_notifications_total
+
 logger = logging.getLogger(__name__)
 
 EXPO_PUSH_URL = "https://exp.host/--/api/v2/push/send"
@@ -37,6 +39,7 @@ def send_push_notification(
     """
     if not push_tokens:
         logger.warning("No push tokens provided")
+        push_notifications_total.inc(outcome="no_tokens")
         return {"success": False, "error": "No push tokens"}
     
     # Filter out invalid tokens
@@ -47,10 +50,10 @@ def send_push_notification(
     
     if not valid_tokens:
         logger.warning("No valid Expo push tokens found")
+        push_notifications_total.inc(outcome="no_tokens")
         return {"success": False, "error": "No valid push tokens"}
 
-    token_previews = [(t[:25] + "...") for t in valid_tokens]
-    logger.info(f"📤 Sending Expo push: devices={len(valid_tokens)} tokens={token_previews}")
+    logger.debug("Sending Expo push: devices=%s", len(valid_tokens))
     
     # Prepare notification messages
     messages = []
@@ -92,12 +95,13 @@ def send_push_notification(
         result = response.json()
 
         # Expo typically returns a list of ticket objects
-        logger.info(f"✅ Expo push accepted: devices={len(valid_tokens)}")
-        logger.debug(f"Expo response: {result}")
+        logger.debug("Expo push accepted: devices=%s response=%s", len(valid_tokens), result)
+        push_notifications_total.inc(outcome="sent")
         return {"success": True, "data": result}
         
     except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to send push notification: {str(e)}")
+        logger.error("Failed to send push notification: %s", e)
+        push_notifications_total.inc(outcome="failed")
         return {"success": False, "error": str(e)}
 
 
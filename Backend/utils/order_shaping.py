@@ -0,0 +1,179 @@
+"""
+Pure functions that turn Database B order rows into owner API responses.
+
+Kept free of database and request state so routes/owner.py and the
+micro-benchmarks (python -m loadtest.bench) exercise exactly the same code.
+
+The *_payload functions are the fast path used by the hot endpoints: rows in
+fetched_orders were validated by the webhook schemas on the way in, so they
+are shaped straight into plain dicts with the same fields and defaults as the
+Pydantic models, and returned through ORJSONResponse without a second
+response_model validation. The model builders remain the reference shape;
+tests/test_order_shaping.py checks that both produce the same response.
+"""
+from typing import Dict, Iterable, List, Optional
+
+from models.schemas import (
+    CumulativeItem,
+    FetchOrdersResponse,
+    IndividualOrder,
+    OrderItem,
+    OrderTransaction,
+)
+
+
+def order_amount(order: Dict) -> int:
+    """Subtotal (what the restaurant receives), falling back to total_amount for old rows"""
+    return order.get("subtotal") or order["total_amount"]
+
+
+def aggregate_cumulative_items(orders: Iterable[Dict]) -> Dict[str, int]:
+    """Total quantity per item name across all orders (all items, regardless of status)"""
+    cumulative_items: Dict[str, int] = {}
+    for order in orders:
+        for item in order["items"]:
+            item_name = item.get("name", "")
+            cumulative_items[item_name] = cumulative_items.get(item_name, 0) + item.get("quantity", 0)
+    return cumulative_items
+
+
+def build_order_item(item: Dict) -> OrderItem:
+    return OrderItem(
+        menu_item_id=item.get("menu_item_id", ""),
+        name=item.get("name", ""),
+        quantity=item.get("quantity", 0),
+        unit_price=item.get("unit_price", 0),
+        customizations=item.get("customizations"),
+        subtotal=item.get("subtotal", 0)
+    )
+
+
+def build_individual_order(order: Dict, responses_map: Dict[str, str]) -> IndividualOrder:
+    """One active order with its items and the owner's decision (if any)"""
+    order_id = order["order_id"]
+    return IndividualOrder(
+        order_id=order_id,
+        customer_name=order.get("customer_name", "Unknown"),
+        customer_phone=order.get("customer_phone", "N/A"),
+        items=[build_order_item(item) for item in order["items"]],
+        total_amount=order_amount(order),
+        fetched_at=order.get("fetched_at"),
+        order_status=responses_map.get(order_id, order["order_status"]),
+        responded=order_id in responses_map
+    )
+
+
+def shape_fetch_orders(orders: List[Dict], responses_map: Dict[str, str]) -> FetchOrdersResponse:
+    """Response for POST /api/owner/fetch-orders"""
+    return FetchOrdersResponse(
+        cumulative_orders=[
+            CumulativeItem(item_name=name, total_quantity=qty)
+            for name, qty in aggregate_cumulative_items(orders).items()
+        ],
+        individual_orders=[build_individual_order(order, responses_map) for order in orders]
+    )
+
+
+def order_item_payload(item: Dict) -> Dict:
+    """Trusted equivalent of build_order_item"""
+    return {
+        "menu_item_id": item.get("menu_item_id", ""),
+        "name": item.get("name", ""),
+        "quantity": item.get("quantity", 0),
+        "unit_price": item.get("unit_price", 0),
+        "customizations": item.get("customizations"),
+        "subtotal": item.get("subtotal", 0),
+    }
+
+
+def individual_order_payload(order: Dict, responses_map: Dict[str, str]) -> Dict:
+    """Trusted equivalent of build_individual_order"""
+    order_id = order["order_id"]
+    return {
+        "order_id": order_id,
+        "customer_name": order.get("customer_name", "Unknown"),
+        "customer_phone": order.get("customer_phone", "N/A"),
+        "items": [order_item_payload(item) for item in order["items"]],
+        "total_amount": order_amount(order),
+        "fetched_at": order.get("fetched_at"),
+        "order_status": responses_map.get(order_id, order["order_status"]),
+        "responded": order_id in responses_map,
+    }
+
+
+def fetch_orders_payload(orders: List[Dict], responses_map: Dict[str, str]) -> Dict:
+    """Trusted equivalent of shape_fetch_orders (FetchOrdersResponse fields)"""
+    return {
+        "cumulative_orders": [
+            {"item_name": name, "total_quantity": qty}
+            for name, qty in aggregate_cumulative_items(orders).items()
+        ],
+        "individual_orders": [individual_order_payload(order, responses_map) for order in orders],
+    }
+
+
+def shape_history_order(order: Dict, response: Optional[Dict]) -> Dict:
+    """One entry of GET /api/owner/order-history"""
+    return {
+        "order_id": order["order_id"],
+        "customer_name": order.get("customer_name", "Unknown"),
+        "customer_phone": order.get("customer_phone", "N/A"),
+        "items": order["items"],
+        "total_amount": order_amount(order),
+        "payment_status": order.get("payment_status"),
+        "order_status": order.get("order_status"),
+        "created_at": order.get("created_at"),
+        "response": response
+    }
+
+
+def build_order_transaction(order: Dict, restaurant_id: str, commission_rate: float) -> OrderTransaction:
+    """Earnings view of one fetched order (amounts converted from paise to rupees)"""
+    order_total = float(order_amount(order)) / 100.0
+    platform_commission = order_total * commission_rate
+    # Will be updated when the actual payment system is integrated
+    is_paid = False
+    return OrderTransaction(
+        id=str(order["id"]),
+        transaction_id=str(order["order_id"]),
+        restaurant_id=restaurant_id,
+        order_id=str(order["order_id"]),
+        order_date=order.get("created_at", order["fetched_at"]),
+        customer_name=order.get("customer_name"),
+        customer_phone=order.get("customer_phone"),
+        delivery_address=None,  # Not available in fetched_orders
+        order_total=order_total,
+        platform_commission=platform_commission,
+        delivery_fee=0.0,  # No delivery fee data in fetched_orders
+        net_amount=order_total - platform_commission,
+        is_paid=is_paid,
+        paid_at=None if not is_paid else order.get("created_at"),
+        payout_cycle_id=None,
+        payout_reference=None,
+        synced_at=order["fetched_at"]
+    )
+
+
+def order_transaction_payload(order: Dict, restaurant_id: str, commission_rate: float) -> Dict:
+    """Trusted equivalent of build_order_transaction (OrderTransaction fields)"""
+    order_total = float(order_amount(order)) / 100.0
+    platform_commission = order_total * commission_rate
+    return {
+        "id": str(order["id"]),
+        "transaction_id": str(order["order_id"]),
+        "restaurant_id": restaurant_id,
+        "order_id": str(order["order_id"]),
+        "order_date": order.get("created_at", order["fetched_at"]),
+        "customer_name": order.get("customer_name"),
+        "customer_phone": order.get("customer_phone"),
+        "delivery_address": None,
+        "order_total": order_total,
+        "platform_commission": platform_commission,
+        "delivery_fee": 0.0,
+        "net_amount": order_total - platform_commission,
+        "is_paid": False,
+        "paid_at": None,
+        "payout_cycle_id": None,
+        "payout_reference": None,
+        "synced_at": order["fetched_at"],
+    }
@@ -0,0 +1,136 @@
+"""
+Shared helpers for applying order decisions across Database A and Database B.
+"""
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Decisions an owner can submit for an order
+OWNER_DECISIONS = ("accepted", "rejected")
+
+# Failure messages for submit_order_decisions outcomes ("applied" and
+# "unchanged" are successes)
+DECISION_OUTCOME_MESSAGES = {
+    "not_found": "Order not found",
+    "closed": "Order is already closed and can no longer be changed",
+}
+
+# Max ids per `in_` filter. PostgREST puts filters in the URL, so very long
+# id lists have to be split to stay under proxy URL limits.
+IN_FILTER_CHUNK_SIZE = 100
+
+
+def chunked(items: List, size: int = IN_FILTER_CHUNK_SIZE) -> Iterator[List]:
+    """Yield successive slices of `items` with at most `size` elements."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def quote_filter_value(value: str) -> str:
+    """Quote a value for a PostgREST logic tree (or/and) filter."""
+    return '"' + value.replace("\\", "").replace('"', "") + '"'
+
+
+def group_by_decision(decisions: Dict[str, str]) -> Dict[str, List[str]]:
+    """
+    Invert an {order_id: decision} map into {decision: [order_id, ...]}
+    so each decision can be applied with one set-based update.
+    """
+    grouped: Dict[str, List[str]] = {}
+    for order_id, decision in decisions.items():
+        grouped.setdefault(decision, []).append(order_id)
+    return grouped
+
+
+def update_dba_order_status(dba, order_ids: Iterable[str], order_status: str) -> bool:
+    """
+    Set customer_orders.status in Database A for many orders at once.
+
+    Returns True if every chunk was written, False if Database A rejected
+    or failed any of them (callers decide whether that is fatal).
+    """
+    order_ids = list(order_ids)
+    try:
+        for chunk in chunked(order_ids):
+            dba.table("customer_orders").update({
+                "status": order_status
+            }).in_("id", chunk).execute()
+        return True
+    except Exception as e:
+        logger.error(
+            "DBA status update failed: status=%s orders=%s error=%s",
+            order_status, len(order_ids), e,
+        )
+        return False
+
+
+def enqueue_dba_status_sync(dbb, order_ids: Iterable[str], order_status: str) -> None:
+    """
+    Queue customer_orders.status = `order_status` for these orders in the
+    DBA sync outbox; the write itself happens in utils/dba_sync.py.
+    """
+    rows = [{"order_id": order_id, "status": order_status} for order_id in order_ids]
+    if rows:
+        dbb.table("dba_sync_outbox").insert(rows).execute()
+
+
+def update_dbb_order_status(dbb, order_ids: Iterable[str], order_status: str) -> None:
+    """Set fetched_orders.order_status in Database B for many orders at once."""
+    for chunk in chunked(list(order_ids)):
+        dbb.table("fetched_orders").update({
+            "order_status": order_status
+        }).in_("order_id", chunk).execute()
+
+
+def auto_reject_orders(dbb, owner_id: str, order_ids: Iterable[str]) -> List[str]:
+    """
+    Auto-reject the orders in `order_ids` that have no response yet.
+
+    Uses a constant number of writes regardless of how many orders are
+    rejected: one insert-if-absent of all responses, one fetched_orders
+    update per id chunk and one DBA sync outbox insert. Orders that already
+    have a response (including one recorded concurrently) are left untouched.
+
+    Returns the ids of the orders that were auto-rejected.
+    """
+    order_ids = list(order_ids)
+    if not order_ids:
+        return []
+
+    # ON CONFLICT DO NOTHING only returns the rows it inserted, so the
+    # result is exactly the set of orders that had no response
+    responded_at = datetime.now(timezone.utc).isoformat()
+    inserted = dbb.table("order_responses").upsert([
+        {
+            "restaurant_owner_id": owner_id,
+            "order_id": order_id,
+            "overall_status": "auto_rejected",
+            "synced_to_dba": False,
+            "responded_at": responded_at
+        }
+        for order_id in order_ids
+    ], on_conflict="order_id", ignore_duplicates=True).execute()
+
+    rejected_ids = [row["order_id"] for row in inserted.data or []]
+    if rejected_ids:
+        update_dbb_order_status(dbb, rejected_ids, "auto_rejected")
+        enqueue_dba_status_sync(dbb, rejected_ids, "auto_rejected")
+
+    return rejected_ids
+
+
+def sweep_active_orders(dbb, owner_id: str) -> Tuple[List[str], List[str]]:
+    """
+    Auto-reject every active (not yet sent for delivery) order of an owner
+    that has not been accepted or rejected.
+
+    Returns (active_order_ids, auto_rejected_order_ids).
+    """
+    active_orders = dbb.table("fetched_orders").select(
+        "order_id"
+    ).eq("restaurant_owner_id", owner_id).eq("sent_for_delivery", False).execute()
+
+    active_order_ids = [order["order_id"] for order in active_orders.data or []]
+    return active_order_ids, auto_reject_orders(dbb, owner_id, active_order_ids)
@@ -0,0 +1,268 @@
+"""
+Opt-in per-request profiling.
+
+A request carrying `X-Profile: <admin access token>` is run under a stack
+sampling profiler (a background thread sampling the event loop thread's
+stack) with tracemalloc tracing allocations. The report is written to
+PROFILE_DIR and can be listed/downloaded through the admin API; the
+response carries its id in X-Profile-Id.
+
+Requests without the header go straight to the app; nothing is sampled
+or traced for them. The profiled request is not isolated, though: the
+sampler watches the shared event loop thread and tracemalloc is
+process-wide, so other requests served while a profile runs show up in its
+stacks and allocation sites (and pay the tracing overhead). Profile on a
+quiet instance, or read the report with that in mind.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+import json
+import logging
+
+from config import settings
+from database import get_dbb
+from utils.auth import decode_access_token
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+
+# Allocation sites included in the report
+TRACEMALLOC_TOP = 25
+
+# Frames included in the "top self time" table
+TOP_FRAMES = 40
+
+# Only one request is profiled at a time (tracemalloc is process-wide)
+_profile_lock = threading.Lock()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler(threading.Thread):
+    """Samples one thread's Python stack every `interval` seconds."""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name="request-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
+
+
+def _verify_admin(token: str) -> Optional[str]:
+    """Return the admin id for a valid admin access token"""
+    payload = decode_access_token(token)
+    if not payload or payload.get("type") != "admin" or not payload.get("sub"):
+        return None
+    result = get_dbb().table("admin_users").select("id").eq("id", payload["sub"]).execute()
+    return result.data[0]["id"] if result.data else None
+
+
+def _profile_path(profile_id: str, suffix: str) -> str:
+    return os.path.join(settings.PROFILE_DIR, f"{profile_id}.{suffix}")
+
+
+def _take_snapshot(stop_tracing: bool) -> tracemalloc.Snapshot:
+    """Snapshot the traced allocations, minus the profiler's own"""
+    try:
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+    finally:
+        if stop_tracing:
+            tracemalloc.stop()
+
+
+def _write_report(profile_id: str, meta: Dict, sampler: StackSampler, stop_tracing: bool) -> None:
+    # Snapshotting and filtering walk every live traced block: done here, in a
+    # worker thread, so the event loop keeps serving other requests meanwhile
+    snapshot = _take_snapshot(stop_tracing)
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+
+    # Collapsed stacks: load into speedscope or flamegraph.pl as-is
+    with open(_profile_path(profile_id, "folded"), "w", encoding="utf-8") as f:
+        for stack, count in sampler.stacks.most_common():
+            f.write(f"{stack} {count}\n")
+
+    self_counts: Counter = Counter()
+    total_counts: Counter = Counter()
+    for stack, count in sampler.stacks.items():
+        frames = stack.split(";")
+        self_counts[frames[-1]] += count
+        for frame in set(frames):
+            total_counts[frame] += count
+
+    samples = max(sampler.samples, 1)
+    lines = [
+        f"Profile {profile_id}",
+        f"{meta['method']} {meta['path']} -> {meta['status']} in {meta['duration_ms']:.1f} ms",
+        f"Samples: {sampler.samples} every {meta['interval_ms']} ms (event loop thread)",
+        "",
+        f"Top {TOP_FRAMES} frames by self samples",
+        f"{'self%':>7} {'total%':>7}  frame",
+    ]
+    for frame, count in self_counts.most_common(TOP_FRAMES):
+        lines.append(f"{100 * count / samples:6.1f}% {100 * total_counts[frame] / samples:6.1f}%  {frame}")
+
+    lines += ["", f"Top {TRACEMALLOC_TOP} allocation sites (allocated during the request, still live at the end)"]
+    for stat in snapshot.statistics("lineno")[:TRACEMALLOC_TOP]:
+        lines.append(f"{stat.size / 1024:10.1f} KiB {stat.count:8d} blocks  {stat.traceback}")
+
+    with open(_profile_path(profile_id, "txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+    with open(_profile_path(profile_id, "json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+    _prune_profiles()
+
+
+def _prune_profiles() -> None:
+    """Keep only the newest PROFILE_MAX_STORED profiles"""
+    metas = list_profiles()
+    for meta in metas[settings.PROFILE_MAX_STORED:]:
+        for suffix in ("json", "txt", "folded"):
+            try:
+                os.remove(_profile_path(meta["id"], suffix))
+            except OSError:
+                pass
+
+
+def list_profiles() -> List[Dict]:
+    """Stored profile metadata, newest first"""
+    if not os.path.isdir(settings.PROFILE_DIR):
+        return []
+    metas = []
+    for name in os.listdir(settings.PROFILE_DIR):
+        if name.endswith(".json"):
+            try:
+                with open(os.path.join(settings.PROFILE_DIR, name), encoding="utf-8") as f:
+                    metas.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+    return sorted(metas, key=lambda meta: meta["created_at"], reverse=True)
+
+
+def profile_file(profile_id: str, part: str) -> Optional[str]:
+    """Path of a stored report ('report' or 'stacks'), or None"""
+    try:
+        profile_id = str(uuid.UUID(profile_id))
+    except ValueError:
+        return None
+    path = _profile_path(profile_id, "folded" if part == "stacks" else "txt")
+    return path if os.path.isfile(path) else None
+
+
+def _find_header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", []):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that profiles requests opting in with X-Profile"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _find_header(scope, PROFILE_HEADER)
+        if token is None:
+            await self.app(scope, receive, send)
+            return
+
+        admin_id = await asyncio.to_thread(_verify_admin, token)
+        if not admin_id:
+            await self.app(scope, receive, self._with_header(send, b"x-profile-status", b"unauthorized"))
+            return
+        if not _profile_lock.acquire(blocking=False):
+            await self.app(scope, receive, self._with_header(send, b"x-profile-status", b"busy"))
+            return
+
+        try:
+            await self._profile(scope, receive, send, admin_id)
+        finally:
+            _profile_lock.release()
+
+    @staticmethod
+    def _with_header(send, name: bytes, value: bytes):
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": list(message.get("headers", [])) + [(name, value)]}
+            await send(message)
+        return send_wrapper
+
+    async def _profile(self, scope, receive, send, admin_id: str) -> None:
+        profile_id = str(uuid.uuid4())
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        interval_ms = settings.PROFILE_SAMPLE_INTERVAL_MS
+        sampler = StackSampler(threading.get_ident(), interval_ms / 1000)
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, self._with_header(send_wrapper, b"x-profile-id", profile_id.encode()))
+        finally:
+            sampler.stop()
+            duration_ms = (time.perf_counter() - started) * 1000
+
+            meta = {
+                "id": profile_id,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "method": scope.get("method"),
+                "path": scope.get("path"),
+                "status": status_code,
+                "duration_ms": round(duration_ms, 1),
+                "samples": sampler.samples,
+                "interval_ms": interval_ms,
+                "admin_id": admin_id,
+            }
+            try:
+                await asyncio.to_thread(_write_report, profile_id, meta, sampler, started_tracing)
+                logger.info("Profiled %s %s in %.1f ms: profile_id=%s", meta["method"], meta["path"], duration_ms, profile_id)
+            except Exception as e:
+                logger.error("Failed to store profile %s: %s", profile_id, e)
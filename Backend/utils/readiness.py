@@ -0,0 +1,98 @@
+"""
+Dependency probes for the /ready endpoint.
+
+DBB, DBA and the Expo push service are probed concurrently with tight
+timeouts over plain HTTP (so a wedged probe never ties up a worker thread),
+and the combined result is cached for READY_CACHE_SECONDS so load balancer
+polling adds almost no database load.
+"""
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, Set
+
+import httpx
+
+from config import settings
+from utils.notifications import EXPO_PUSH_URL
+
+# Receipts lookup with no ids: cheap, needs no auth and has no side effects
+EXPO_RECEIPTS_URL = EXPO_PUSH_URL.replace("/push/send", "/push/getReceipts")
+
+_cached: Optional[Dict] = None
+_cached_at = 0.0
+_lock: Optional[asyncio.Lock] = None
+
+
+async def _probe_postgrest(client: httpx.AsyncClient, url: str, key: str, table: str) -> None:
+    response = await client.get(
+        f"{url.rstrip('/')}/rest/v1/{table}",
+        params={"select": "id", "limit": "1"},
+        headers={"apikey": key, "Authorization": f"Bearer {key}"},
+    )
+    response.raise_for_status()
+
+
+async def _probe_push(client: httpx.AsyncClient) -> None:
+    response = await client.post(EXPO_RECEIPTS_URL, json={"ids": []})
+    response.raise_for_status()
+
+
+def critical_dependencies() -> Set[str]:
+    """READY_CRITICAL_DEPENDENCIES as a set; tolerates spaces and empty entries ("dbb, dba,")"""
+    return {name.strip() for name in settings.READY_CRITICAL_DEPENDENCIES.split(",") if name.strip()}
+
+
+async def _timed(name: str, probe) -> Dict:
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(probe, timeout=settings.READY_PROBE_TIMEOUT_SECONDS)
+        error = None
+    except asyncio.TimeoutError:
+        error = "timeout"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return {
+        "ok": error is None,
+        "critical": name in critical_dependencies(),
+        "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+        "error": error,
+    }
+
+
+async def _run_probes() -> Dict:
+    timeout = httpx.Timeout(settings.READY_PROBE_TIMEOUT_SECONDS)
+    async with httpx.AsyncClient(timeout=timeout) as client:
+        names = ("dbb", "dba", "push")
+        results = await asyncio.gather(
+            _timed("dbb", _probe_postgrest(client, settings.SUPABASE_URL_DBB, settings.SUPABASE_SERVICE_KEY_DBB, "admin_users")),
+            _timed("dba", _probe_postgrest(client, settings.SUPABASE_URL_DBA, settings.SUPABASE_SERVICE_KEY_DBA, "restaurants")),
+            _timed("push", _probe_push(client)),
+        )
+
+    dependencies = dict(zip(names, results))
+    ready = all(result["ok"] for result in results if result["critical"])
+    degraded = not all(result["ok"] for result in results)
+    return {
+        "status": "ready" if ready and not degraded else ("degraded" if ready else "unavailable"),
+        "ready": ready,
+        "checked_at": datetime.now(timezone.utc).isoformat(),
+        "dependencies": dependencies,
+    }
+
+
+async def check_readiness() -> Dict:
+    """Return cached probe results, re-probing at most once per READY_CACHE_SECONDS"""
+    global _cached, _cached_at, _lock
+    if _lock is None:
+        _lock = asyncio.Lock()
+
+    if _cached is not None and time.monotonic() - _cached_at < settings.READY_CACHE_SECONDS:
+        return _cached
+
+    # Concurrent /ready calls share one round of probes
+    async with _lock:
+        if _cached is None or time.monotonic() - _cached_at >= settings.READY_CACHE_SECONDS:
+            _cached = await _run_probes()
+            _cached_at = time.monotonic()
+    return _cached
@@ -0,0 +1,198 @@
+"""
+Detect and repair order status drift between Database B and Database A.
+
+Walks fetched_orders in keyset-paginated chunks (ordered by order_id), loads
+the matching order_responses and customer_orders rows for each chunk only,
+and compares statuses in memory. Memory use is bounded by the chunk size no
+matter how long the order history is.
+"""
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set
+import logging
+
+from config import settings
+from database import get_dbb, get_dba
+from utils.orders import chunked
+
+logger = logging.getLogger(__name__)
+
+# customer_orders statuses that belong to the accept/reject phase. Orders that
+# Database A has already moved past this phase (e.g. delivered) are left alone.
+DECISION_PHASE_STATUSES = ("pending", "accepted", "rejected", "auto_rejected")
+
+# Mismatches kept verbatim in the report; the rest are only counted
+MAX_REPORT_SAMPLES = 50
+
+
+def _fetch_dba_statuses(dba, order_ids: List[str]) -> Dict[str, str]:
+    statuses = {}
+    for chunk in chunked(order_ids):
+        result = dba.table("customer_orders").select("id, status").in_("id", chunk).execute()
+        statuses.update({row["id"]: row["status"] for row in result.data or []})
+    return statuses
+
+
+def _fetch_response_statuses(dbb, order_ids: List[str]) -> Dict[str, str]:
+    statuses = {}
+    for chunk in chunked(order_ids):
+        result = dbb.table("order_responses").select(
+            "order_id, overall_status"
+        ).in_("order_id", chunk).execute()
+        statuses.update({row["order_id"]: row["overall_status"] for row in result.data or []})
+    return statuses
+
+
+def _fetch_pending_sync_ids(dbb, order_ids: List[str]) -> Set[str]:
+    """Orders with a DBA sync outbox intent that has not been written yet"""
+    pending = set()
+    for chunk in chunked(order_ids):
+        result = dbb.table("dba_sync_outbox").select("order_id").in_(
+            "order_id", chunk
+        ).is_("synced_at", "null").execute()
+        pending.update(row["order_id"] for row in result.data or [])
+    return pending
+
+
+def _apply_repairs(dbb, repairs: Dict[str, Dict]) -> Dict[str, int]:
+    """
+    Apply one chunk's repairs through repair_order_status_drift (see
+    Docs/create_repair_order_status_drift_function.sql), which re-reads
+    order_responses under the fetched_orders row locks and skips any order
+    whose decision changed after it was scanned.
+    """
+    if not repairs:
+        return {"repaired_dbb": 0, "queued_dba": 0}
+    payload = [{"order_id": order_id, **repair} for order_id, repair in repairs.items()]
+    return dbb.rpc("repair_order_status_drift", {"p_repairs": payload}).execute().data
+
+
+def reconcile_order_statuses(
+    chunk_size: int = 500,
+    repair: bool = True,
+    max_chunks: Optional[int] = None
+) -> Dict:
+    """
+    Compare decision statuses across both databases and optionally repair them.
+
+    The owner's response in order_responses is treated as the source of truth:
+    - fetched_orders.order_status is corrected in place
+    - customer_orders.status is corrected through the DBA sync outbox
+
+    Repairs are re-checked inside the database, so a decision the owner makes
+    while a chunk is being compared is never reverted. Orders that still have
+    an unsynced outbox intent are not compared against Database A at all: the
+    sync worker has yet to write them, so a difference there is not drift.
+
+    Returns a drift report dict.
+    """
+    dbb = get_dbb()
+    dba = get_dba()
+    started = time.monotonic()
+
+    report = {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "repair": repair,
+        "scanned_orders": 0,
+        "responded_orders": 0,
+        "dbb_mismatches": 0,
+        "dba_mismatches": 0,
+        "missing_in_dba": 0,
+        "dba_past_decision_phase": 0,
+        "pending_dba_sync": 0,
+        "repaired_dbb": 0,
+        "queued_dba_repairs": 0,
+        "samples": []
+    }
+
+    last_order_id = None
+    chunks = 0
+    while max_chunks is None or chunks < max_chunks:
+        query = dbb.table("fetched_orders").select("order_id, order_status").order("order_id").limit(chunk_size)
+        if last_order_id:
+            query = query.gt("order_id", last_order_id)
+        orders = query.execute().data or []
+        if not orders:
+            break
+
+        chunks += 1
+        last_order_id = orders[-1]["order_id"]
+        report["scanned_orders"] += len(orders)
+
+        order_ids = [order["order_id"] for order in orders]
+        response_statuses = _fetch_response_statuses(dbb, order_ids)
+        dba_statuses = _fetch_dba_statuses(dba, list(response_statuses))
+        pending_sync = _fetch_pending_sync_ids(dbb, list(response_statuses))
+
+        repairs = {}
+        for order in orders:
+            order_id = order["order_id"]
+            expected = response_statuses.get(order_id)
+            if expected is None:
+                continue
+            report["responded_orders"] += 1
+
+            if order.get("order_status") != expected:
+                report["dbb_mismatches"] += 1
+                repairs[order_id] = {"expected": expected, "fix_dbb": True, "fix_dba": False}
+                _add_sample(report, order_id, "fetched_orders", order.get("order_status"), expected)
+
+            dba_status = dba_statuses.get(order_id)
+            if order_id in pending_sync:
+                report["pending_dba_sync"] += 1
+            elif order_id not in dba_statuses:
+                report["missing_in_dba"] += 1
+            elif dba_status not in DECISION_PHASE_STATUSES:
+                report["dba_past_decision_phase"] += 1
+            elif dba_status != expected:
+                report["dba_mismatches"] += 1
+                repairs.setdefault(order_id, {"expected": expected, "fix_dbb": False})["fix_dba"] = True
+                _add_sample(report, order_id, "customer_orders", dba_status, expected)
+
+        if repair:
+            applied = _apply_repairs(dbb, repairs)
+            report["repaired_dbb"] += applied["repaired_dbb"]
+            report["queued_dba_repairs"] += applied["queued_dba"]
+
+        if len(orders) < chunk_size:
+            break
+
+    report["finished_at"] = datetime.now(timezone.utc).isoformat()
+    report["duration_seconds"] = round(time.monotonic() - started, 3)
+
+    logger.info(
+        "Order status reconciliation: scanned=%s responded=%s dbb_mismatches=%s dba_mismatches=%s "
+        "missing_in_dba=%s pending_dba_sync=%s repaired_dbb=%s queued_dba_repairs=%s duration=%ss",
+        report["scanned_orders"], report["responded_orders"], report["dbb_mismatches"],
+        report["dba_mismatches"], report["missing_in_dba"], report["pending_dba_sync"], report["repaired_dbb"],
+        report["queued_dba_repairs"], report["duration_seconds"],
+    )
+    return report
+
+
+def _add_sample(report: Dict, order_id: str, table: str, found: Optional[str], expected: str) -> None:
+    if len(report["samples"]) < MAX_REPORT_SAMPLES:
+        report["samples"].append({
+            "order_id": order_id,
+            "table": table,
+            "found_status": found,
+            "expected_status": expected
+        })
+
+
+async def run_reconciliation_job() -> None:
+    """Run reconciliation every RECONCILE_INTERVAL_MINUTES."""
+    interval = settings.RECONCILE_INTERVAL_MINUTES * 60
+    logger.info("Order status reconciliation scheduled every %s minute(s)", settings.RECONCILE_INTERVAL_MINUTES)
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(
+                reconcile_order_statuses,
+                chunk_size=settings.RECONCILE_CHUNK_SIZE
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Order status reconciliation failed: %s", e)
@@ -0,0 +1,149 @@
+"""
+Request-scoped accounting of Supabase round trips.
+
+Each HTTP request gets a DbCallStats in a context variable; the query
+observer adds every DBA/DBB call made while handling it. Outside
+production the totals are returned in X-DB-* response headers, and a
+warning is logged when one query shape repeats often enough to look like
+an N+1 loop.
+
+`assert_db_budget` wraps a block (e.g. a TestClient call) and fails when it
+makes more round trips than allowed.
+"""
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+import logging
+
+from config import settings
+from utils.db_instrumentation import QueryEvent, add_query_observer, remove_query_observer
+
+logger = logging.getLogger(__name__)
+
+
+class DbCallStats:
+    """Round trips, time and tables touched by one request (or one budgeted block)."""
+
+    def __init__(self, scope: Optional[dict] = None):
+        # ASGI scope of the request; the matched route is added to it during routing
+        self.scope = scope
+        self.owner_id: Optional[str] = None
+        self.count = 0
+        self.total_time = 0.0
+        self.tables: Counter = Counter()
+        self.shapes: Counter = Counter()
+        self.events: List[QueryEvent] = []
+        # Sync endpoints and asyncio.to_thread run queries on worker threads
+        self._lock = threading.Lock()
+
+    def add(self, event: QueryEvent) -> None:
+        with self._lock:
+            self.count += 1
+            self.total_time += event.duration
+            self.tables[f"{event.db}.{event.table}"] += 1
+            self.shapes[(event.db, event.table, event.operation, event.filters)] += 1
+            self.events.append(event)
+
+    @property
+    def route(self) -> Optional[str]:
+        if self.scope is None:
+            return None
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or self.scope.get("path")
+
+    def repeated_shapes(self, threshold: int):
+        """Query shapes issued at least `threshold` times"""
+        return [(shape, count) for shape, count in self.shapes.items() if count >= threshold]
+
+
+_current_stats: ContextVar[Optional[DbCallStats]] = ContextVar("db_call_stats", default=None)
+
+
+def current_db_stats() -> Optional[DbCallStats]:
+    return _current_stats.get()
+
+
+def set_request_owner(owner_id: str) -> None:
+    """Attribute the current request's queries to a restaurant owner"""
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.owner_id = owner_id
+
+
+def _record_query(event: QueryEvent) -> None:
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.add(event)
+
+
+add_query_observer(_record_query)
+
+
+class DbAccountingMiddleware:
+    """
+    ASGI middleware that scopes DbCallStats to each request and, outside
+    production, adds X-DB-Queries, X-DB-Time-Ms and X-DB-Tables headers
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.expose_headers = settings.ENVIRONMENT != "production"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = DbCallStats(scope)
+        token = _current_stats.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and self.expose_headers:
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-queries", str(stats.count).encode()))
+                headers.append((b"x-db-time-ms", f"{stats.total_time * 1000:.1f}".encode()))
+                headers.append((b"x-db-tables", ",".join(sorted(stats.tables)).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_stats.reset(token)
+            for (db, table, operation, filters), count in stats.repeated_shapes(settings.DB_N_PLUS_ONE_THRESHOLD):
+                logger.warning(
+                    "Possible N+1: %s %s repeated %s %s.%s(%s) queries",
+                    scope.get("method"), stats.route, count, db, table, ",".join(filters) or operation
+                )
+
+
+@contextmanager
+def assert_db_budget(max_queries: int, label: str = "block") -> Iterator[DbCallStats]:
+    """
+    Fail with AssertionError when the wrapped block makes more than
+    `max_queries` DBA/DBB round trips, e.g.
+
+        with assert_db_budget(3, "GET /api/owner/order-history"):
+            client.get("/api/owner/order-history", headers=headers)
+
+    Works with in-process clients such as FastAPI's TestClient, which run
+    the app in another thread, by observing queries globally for the
+    duration of the block.
+    """
+    stats = DbCallStats()
+    add_query_observer(stats.add)
+    try:
+        yield stats
+    finally:
+        remove_query_observer(stats.add)
+
+    if stats.count > max_queries:
+        shapes = ", ".join(
+            f"{db}.{table}.{operation}({','.join(filters)}) x{count}"
+            for (db, table, operation, filters), count in stats.shapes.most_common()
+        )
+        raise AssertionError(
+            f"{label} made {stats.count} DB round trips (budget {max_queries}): {shapes}"
+        )
@@ -0,0 +1,233 @@
+"""
+In-memory catalog of Database A restaurants for admin UID assignment.
+
+The catalog is loaded from Database A once per refresh interval (TTL) and
+kept in memory with a token prefix index over name, phone and address, so
+admin typeahead searches never hit Database A. Async routes load a stale
+catalog through ensure_loaded_async(), which runs the Database A read in a
+worker thread; after a failed load, requests back off for retry_seconds
+instead of each retrying Database A. search() is CPU-bound (its fuzzy
+fallback scores vocabulary tokens with difflib), so routes call it through
+search_async().
+"""
+import asyncio
+import difflib
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Set
+import logging
+
+from config import settings
+from database import get_dba
+
+logger = logging.getLogger(__name__)
+
+# Longest token prefix stored in the index; longer queries are verified by substring match
+MAX_INDEXED_PREFIX = 12
+
+# difflib similarity a vocabulary token needs to count as a typo of a query token
+FUZZY_CUTOFF = 0.75
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _tokens(text: Optional[str]) -> List[str]:
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+def _phone_tokens(phone: Optional[str]) -> List[str]:
+    digits = re.sub(r"\D", "", phone or "")
+    if not digits:
+        return []
+    # Allow searching with or without the country code
+    return list({digits, digits[-10:]})
+
+
+class RestaurantCatalog:
+    """Cached restaurant list with prefix/fuzzy search."""
+
+    def __init__(self, ttl_seconds: int, retry_seconds: int = 30):
+        self.ttl_seconds = ttl_seconds
+        self.retry_seconds = retry_seconds
+        # (restaurants, prefix_index, vocabulary by token length), replaced as a whole on refresh
+        self._snapshot = ([], {}, {})
+        self._loaded_at: Optional[float] = None
+        self._failed_at: Optional[float] = None
+        self._last_error: Optional[Exception] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl_seconds
+
+    @property
+    def _backing_off(self) -> bool:
+        return self._failed_at is not None and time.monotonic() - self._failed_at < self.retry_seconds
+
+    @property
+    def needs_load(self) -> bool:
+        """Stale and not waiting out a recent failure"""
+        return self.is_stale and not self._backing_off
+
+    def refresh(self) -> None:
+        """Reload all restaurants from Database A and rebuild the index."""
+        dba = get_dba()
+        result = dba.table("restaurants").select("id, name, address, phone").execute()
+        restaurants = sorted(result.data or [], key=lambda r: (r.get("name") or "").lower())
+
+        prefix_index: Dict[str, Set[int]] = {}
+        vocabulary: Set[str] = set()
+        for position, restaurant in enumerate(restaurants):
+            tokens = (
+                _tokens(restaurant.get("name"))
+                + _tokens(restaurant.get("address"))
+                + _phone_tokens(restaurant.get("phone"))
+            )
+            for token in tokens:
+                vocabulary.add(token)
+                for end in range(1, min(len(token), MAX_INDEXED_PREFIX) + 1):
+                    prefix_index.setdefault(token[:end], set()).add(position)
+
+        vocabulary_by_length: Dict[int, List[str]] = {}
+        for token in sorted(vocabulary):
+            vocabulary_by_length.setdefault(len(token), []).append(token)
+
+        # Swap in the new snapshot in one step so readers never see a partial index
+        self._snapshot = (restaurants, prefix_index, vocabulary_by_length)
+        self._loaded_at = time.monotonic()
+        self._failed_at = None
+        self._last_error = None
+
+        logger.info("Restaurant catalog refreshed: restaurants=%s tokens=%s", len(restaurants), len(vocabulary))
+
+    def ensure_loaded(self) -> None:
+        """
+        Load synchronously (blocking) if the catalog is empty or the refresher
+        fell behind. Raises if there is no snapshot to serve.
+        """
+        if self.needs_load:
+            # Concurrent requests wait for one load instead of each hitting Database A
+            with self._lock:
+                if self.needs_load:
+                    try:
+                        self.refresh()
+                    except Exception as e:
+                        self._failed_at = time.monotonic()
+                        self._last_error = e
+                        if self._loaded_at is not None:
+                            # Keep serving the last good snapshot while Database A is unavailable
+                            logger.warning("Restaurant catalog refresh failed, serving stale data: %s", e)
+        if self._loaded_at is None and self._last_error is not None:
+            raise RuntimeError(f"Restaurant catalog unavailable: {self._last_error}")
+
+    async def ensure_loaded_async(self) -> None:
+        """ensure_loaded() for async routes: the Database A load runs in a worker thread"""
+        if self.needs_load:
+            await asyncio.to_thread(self.ensure_loaded)
+
+    def all(self) -> List[Dict]:
+        self.ensure_loaded()
+        return self._snapshot[0]
+
+    @staticmethod
+    def _matches_for_token(snapshot, token: str) -> Set[int]:
+        restaurants, prefix_index, _ = snapshot
+        matches = prefix_index.get(token[:MAX_INDEXED_PREFIX], set())
+        if len(token) > MAX_INDEXED_PREFIX:
+            matches = {
+                position for position in matches
+                if token in RestaurantCatalog._searchable_text(restaurants[position])
+            }
+        return matches
+
+    @staticmethod
+    def _fuzzy_vocabulary(snapshot, token: str) -> List[str]:
+        """
+        Vocabulary tokens whose length allows a difflib ratio of FUZZY_CUTOFF
+        (ratio <= 2 * min(a, b) / (a + b)); the rest can never match, so
+        only a few length buckets are scored instead of the whole vocabulary
+        """
+        vocabulary_by_length = snapshot[2]
+        size = len(token)
+        return [
+            candidate
+            for length, tokens in vocabulary_by_length.items()
+            if 2 * min(size, length) / (size + length) >= FUZZY_CUTOFF
+            for candidate in tokens
+        ]
+
+    @staticmethod
+    def _fuzzy_matches_for_token(snapshot, token: str) -> Set[int]:
+        prefix_index = snapshot[1]
+        vocabulary = RestaurantCatalog._fuzzy_vocabulary(snapshot, token)
+        matches: Set[int] = set()
+        for close_token in difflib.get_close_matches(token, vocabulary, n=5, cutoff=FUZZY_CUTOFF):
+            matches |= prefix_index.get(close_token[:MAX_INDEXED_PREFIX], set())
+        return matches
+
+    @staticmethod
+    def _searchable_text(restaurant: Dict) -> str:
+        return " ".join(
+            _tokens(restaurant.get("name")) + _tokens(restaurant.get("address")) + _phone_tokens(restaurant.get("phone"))
+        )
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """
+        Return restaurants whose name, address or phone tokens start with
+        every query token; falls back to fuzzy token matching when nothing
+        matches exactly. Name matches rank first.
+        """
+        self.ensure_loaded()
+        snapshot = self._snapshot
+        restaurants = snapshot[0]
+        # "98765 43210" and "98765-43210" should match a phone number
+        query_tokens = _tokens(re.sub(r"(?<=\d)[\s-]+(?=\d)", "", query or ""))
+        if not query_tokens:
+            return restaurants[:limit]
+
+        candidates: Optional[Set[int]] = None
+        for token in query_tokens:
+            token_matches = self._matches_for_token(snapshot, token)
+            candidates = token_matches if candidates is None else candidates & token_matches
+
+        if not candidates:
+            candidates = None
+            for token in query_tokens:
+                token_matches = (
+                    self._matches_for_token(snapshot, token)
+                    or self._fuzzy_matches_for_token(snapshot, token)
+                )
+                candidates = token_matches if candidates is None else candidates & token_matches
+
+        query_text = " ".join(query_tokens)
+
+        def rank(position: int):
+            name = (restaurants[position].get("name") or "").lower()
+            name_hit = any(token.startswith(query_tokens[0]) for token in _tokens(name))
+            return (not name.startswith(query_text), not name_hit, position)
+
+        return [restaurants[position] for position in sorted(candidates or (), key=rank)[:limit]]
+
+    async def search_async(self, query: str, limit: int = 20) -> List[Dict]:
+        """search() for async routes: loading and matching run in a worker thread"""
+        return await asyncio.to_thread(self.search, query, limit)
+
+
+restaurant_catalog = RestaurantCatalog(
+    ttl_seconds=settings.RESTAURANT_CATALOG_TTL_SECONDS,
+    retry_seconds=settings.RESTAURANT_CATALOG_RETRY_SECONDS
+)
+
+
+async def run_catalog_refresher() -> None:
+    """Refresh the catalog in the background shortly before it expires."""
+    interval = max(restaurant_catalog.ttl_seconds * 0.9, 1)
+    while True:
+        try:
+            await asyncio.to_thread(restaurant_catalog.refresh)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Restaurant catalog refresh failed: %s", e)
+        await asyncio.sleep(interval)
@@ -0,0 +1,106 @@
+"""
+Slow-query log.
+
+Every DBA/DBB query slower than SLOW_QUERY_THRESHOLD_MS is logged with its
+fingerprint (db.table.operation(filter columns)), duration, route and owner
+id, and kept in a rolling buffer of the most recent SLOW_QUERY_BUFFER_SIZE
+slow queries. Admins can read top-N aggregates per fingerprint from the
+buffer to see which filters need an index.
+
+The buffer is per worker process.
+"""
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Dict, List
+import logging
+
+from config import settings
+from utils.db_instrumentation import QueryEvent, add_query_observer
+from utils.request_accounting import current_db_stats
+
+logger = logging.getLogger(__name__)
+
+SORT_KEYS = ("total_ms", "max_ms", "count", "avg_ms")
+
+_recent: deque = deque(maxlen=settings.SLOW_QUERY_BUFFER_SIZE)
+_lock = threading.Lock()
+
+
+def fingerprint(event: QueryEvent) -> str:
+    """Stable shape of a query: filter values are never part of it"""
+    columns = ",".join(sorted(set(event.filters)))
+    return f"{event.db}.{event.table}.{event.operation}({columns})"
+
+
+def _record_slow_query(event: QueryEvent) -> None:
+    duration_ms = event.duration * 1000
+    if duration_ms < settings.SLOW_QUERY_THRESHOLD_MS:
+        return
+
+    stats = current_db_stats()
+    entry = {
+        "fingerprint": fingerprint(event),
+        "duration_ms": round(duration_ms, 1),
+        "route": stats.route if stats else "background",
+        "owner_id": stats.owner_id if stats else None,
+        "error": event.error,
+        "at": time.time(),
+    }
+    with _lock:
+        _recent.append(entry)
+
+    logger.warning(
+        "Slow query %s took %.1f ms (route=%s owner_id=%s)",
+        entry["fingerprint"], duration_ms, entry["route"], entry["owner_id"],
+        extra={"event": "slow_query", **{k: v for k, v in entry.items() if k != "at"}}
+    )
+
+
+add_query_observer(_record_slow_query)
+
+
+def slow_query_report(limit: int = 20, sort_by: str = "total_ms") -> Dict:
+    """Top-N fingerprints over the rolling buffer, plus the latest samples"""
+    with _lock:
+        entries = list(_recent)
+
+    aggregates: Dict[str, Dict] = {}
+    for entry in entries:
+        aggregate = aggregates.setdefault(entry["fingerprint"], {
+            "fingerprint": entry["fingerprint"],
+            "count": 0,
+            "total_ms": 0.0,
+            "max_ms": 0.0,
+            "errors": 0,
+            "routes": Counter(),
+            "last_seen": 0.0,
+        })
+        aggregate["count"] += 1
+        aggregate["total_ms"] += entry["duration_ms"]
+        aggregate["max_ms"] = max(aggregate["max_ms"], entry["duration_ms"])
+        aggregate["errors"] += 1 if entry["error"] else 0
+        aggregate["routes"][entry["route"]] += 1
+        aggregate["last_seen"] = max(aggregate["last_seen"], entry["at"])
+
+    top: List[Dict] = []
+    for aggregate in aggregates.values():
+        aggregate["avg_ms"] = round(aggregate["total_ms"] / aggregate["count"], 1)
+        aggregate["total_ms"] = round(aggregate["total_ms"], 1)
+        aggregate["routes"] = dict(aggregate["routes"].most_common(5))
+        aggregate["last_seen"] = datetime.fromtimestamp(aggregate["last_seen"], timezone.utc).isoformat()
+        top.append(aggregate)
+    top.sort(key=lambda aggregate: aggregate[sort_by], reverse=True)
+
+    recent = [
+        {**entry, "at": datetime.fromtimestamp(entry["at"], timezone.utc).isoformat()}
+        for entry in entries[-limit:][::-1]
+    ]
+
+    return {
+        "threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+        "buffered": len(entries),
+        "top": top[:limit],
+        "recent": recent,
+    }
@@ -0,0 +1,7 @@
+-- Index for the streaming order exports
+-- GET /api/owner/export/order-history and /api/owner/export/transactions page
+-- through one owner's fetched_orders by (fetched_at, id), optionally bounded
+-- by a fetched_at date range, so each page is a short index range scan.
+
+CREATE INDEX IF NOT EXISTS idx_fetched_orders_owner_fetched_id
+ON public.fetched_orders (restaurant_owner_id, fetched_at, id);
@@ -0,0 +1,17 @@
+-- Enforce one response per order in order_responses
+-- Required by the bulk decision endpoint (POST /api/owner/submit-responses),
+-- which records all decisions with a single upsert ON CONFLICT (order_id).
+
+-- Remove duplicate responses, keeping the most recent one per order
+DELETE FROM public.order_responses r
+USING public.order_responses newer
+WHERE r.order_id = newer.order_id
+  AND (r.responded_at, r.id) < (newer.responded_at, newer.id);
+
+-- The unique constraint also serves order_id lookups, so the old index is redundant
+ALTER TABLE public.order_responses
+ADD CONSTRAINT order_responses_order_id_key UNIQUE (order_id);
+
+DROP INDEX IF EXISTS idx_order_responses_order;
+
+COMMENT ON CONSTRAINT order_responses_order_id_key ON public.order_responses IS 'One owner decision per order; enables upserts on order_id';
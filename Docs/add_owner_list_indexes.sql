@@ -0,0 +1,29 @@
+-- Indexes for the paginated admin owner lists
+-- GET /api/admin/pending-owners and /api/admin/all-owners page through
+-- restaurant_owners by (created_at, id) and search by name/email/phone.
+
+-- Keyset pagination over all owners
+CREATE INDEX IF NOT EXISTS idx_restaurant_owners_created_id
+ON public.restaurant_owners (created_at, id);
+
+-- Keyset pagination within one approval status (pending list)
+CREATE INDEX IF NOT EXISTS idx_restaurant_owners_status_created_id
+ON public.restaurant_owners (approval_status, created_at, id);
+
+-- Substring search (ILIKE '%term%') needs trigram indexes
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_restaurant_owners_full_name_trgm
+ON public.restaurant_owners USING gin (full_name gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_restaurant_owners_email_trgm
+ON public.restaurant_owners USING gin (email gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_restaurant_owners_phone_trgm
+ON public.restaurant_owners USING gin (phone gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_restaurant_owners_restaurant_name_trgm
+ON public.restaurant_owners USING gin (restaurant_name gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_restaurant_owners_restaurant_phone_trgm
+ON public.restaurant_owners USING gin (restaurant_phone gin_trgm_ops);
@@ -0,0 +1,61 @@
+-- Aggregated admin dashboard statistics for GET /api/admin/stats
+-- Returns every dashboard number in one round trip, computed with
+-- GROUP BY / COUNT in the database instead of shipping full tables.
+-- Requires: add_pool_id_column.sql (sent_for_delivery)
+
+CREATE OR REPLACE FUNCTION public.admin_dashboard_stats(p_since TIMESTAMPTZ)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'owners_by_status', (
+            SELECT COALESCE(jsonb_object_agg(s.approval_status, s.owner_count), '{}'::jsonb)
+            FROM (
+                SELECT approval_status, COUNT(*) AS owner_count
+                FROM public.restaurant_owners
+                GROUP BY approval_status
+            ) s
+        ),
+        'orders_ingested_today', (
+            SELECT COUNT(*)
+            FROM public.fetched_orders
+            WHERE fetched_at >= p_since
+        ),
+        'decisions_today', (
+            SELECT COALESCE(jsonb_object_agg(d.overall_status, d.decision_count), '{}'::jsonb)
+            FROM (
+                SELECT overall_status, COUNT(*) AS decision_count
+                FROM public.order_responses
+                WHERE responded_at >= p_since
+                GROUP BY overall_status
+            ) d
+        ),
+        'pending_by_restaurant', (
+            SELECT COALESCE(jsonb_agg(p ORDER BY p.pending_orders DESC), '[]'::jsonb)
+            FROM (
+                SELECT fo.restaurant_owner_id,
+                       ro.restaurant_name,
+                       COUNT(*) AS pending_orders
+                FROM public.fetched_orders fo
+                LEFT JOIN public.order_responses r ON r.order_id = fo.order_id
+                LEFT JOIN public.restaurant_owners ro ON ro.id = fo.restaurant_owner_id
+                WHERE fo.sent_for_delivery = FALSE
+                  AND r.order_id IS NULL
+                GROUP BY fo.restaurant_owner_id, ro.restaurant_name
+            ) p
+        )
+    );
+$$;
+
+-- Supporting indexes
+CREATE INDEX IF NOT EXISTS idx_fetched_orders_fetched_at
+ON public.fetched_orders (fetched_at);
+
+CREATE INDEX IF NOT EXISTS idx_order_responses_responded_at
+ON public.order_responses (responded_at);
+
+-- Active (not yet dispatched) orders are a small slice of the table
+CREATE INDEX IF NOT EXISTS idx_fetched_orders_active_owner
+ON public.fetched_orders (restaurant_owner_id)
+WHERE sent_for_delivery = FALSE;
@@ -0,0 +1,25 @@
+-- Bulk restaurant UID assignment for the admin bulk endpoints
+-- Applies a batch of (owner_id, restaurant_uid) pairs in one UPDATE instead
+-- of one round trip per owner. With p_approve the owners are also approved;
+-- without it only owners that are already approved are updated.
+-- Returns the ids of the owners that were updated.
+-- Requires: setup_database_b.sql
+
+CREATE OR REPLACE FUNCTION public.bulk_assign_restaurant_uids(
+    p_assignments JSONB,  -- [{"owner_id": "...", "restaurant_uid": "..."}, ...]
+    p_approved_by UUID,
+    p_approve BOOLEAN
+)
+RETURNS TABLE (owner_id UUID)
+LANGUAGE sql
+AS $$
+    UPDATE public.restaurant_owners ro
+    SET restaurant_uid = a.restaurant_uid,
+        approval_status = CASE WHEN p_approve THEN 'approved' ELSE ro.approval_status END,
+        approved_at = CASE WHEN p_approve THEN NOW() ELSE ro.approved_at END,
+        approved_by = CASE WHEN p_approve THEN p_approved_by ELSE ro.approved_by END
+    FROM jsonb_to_recordset(p_assignments) AS a(owner_id UUID, restaurant_uid UUID)
+    WHERE ro.id = a.owner_id
+      AND (p_approve OR ro.approval_status = 'approved')
+    RETURNING ro.id;
+$$;
@@ -0,0 +1,169 @@
+-- Write-behind outbox for Database A status sync
+-- Owner decisions and auto-rejections no longer update customer_orders in
+-- Database A inline. Instead a status intent is written here and the backend
+-- worker (utils/dba_sync.py) pushes intents to Database A in batches with retries.
+-- order_responses.synced_to_dba is set to TRUE only once Database A accepted the write.
+-- Requires: create_submit_order_decision_function.sql
+
+CREATE TABLE IF NOT EXISTS public.dba_sync_outbox (
+    id BIGSERIAL PRIMARY KEY,
+    order_id UUID NOT NULL,           -- customer_orders.id in Database A
+    status TEXT NOT NULL,             -- Status to write to customer_orders.status
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    last_error TEXT,
+    synced_at TIMESTAMPTZ,            -- NULL until Database A accepted the write (or superseded)
+    leased_until TIMESTAMPTZ,         -- Set while a worker is writing the intent
+    superseded_by BIGINT              -- Newer intent for the same order that replaced this one
+);
+
+ALTER TABLE public.dba_sync_outbox ADD COLUMN IF NOT EXISTS leased_until TIMESTAMPTZ;
+ALTER TABLE public.dba_sync_outbox ADD COLUMN IF NOT EXISTS superseded_by BIGINT;
+
+-- Pending intents in claim order
+CREATE INDEX IF NOT EXISTS idx_dba_sync_outbox_pending
+ON public.dba_sync_outbox (next_attempt_at, id)
+WHERE synced_at IS NULL;
+
+-- Newest pending intent per order
+CREATE INDEX IF NOT EXISTS idx_dba_sync_outbox_pending_order
+ON public.dba_sync_outbox (order_id, id)
+WHERE synced_at IS NULL;
+
+-- ============================================
+-- Claim a batch of due intents
+-- ============================================
+-- Only the newest pending intent per order is claimed; older pending intents
+-- for the same order are marked superseded in the same statement, so a retried
+-- old status can never overwrite a newer one in Database A. Orders whose
+-- previous intent is still leased (being written by a worker) are skipped
+-- until that write finishes, and claims are serialized by an advisory lock so
+-- each claim sees the leases taken by the one before it. Rows are leased by
+-- pushing next_attempt_at / leased_until forward.
+CREATE OR REPLACE FUNCTION public.claim_dba_sync_batch(
+    p_limit INTEGER DEFAULT 200,
+    p_lease_seconds INTEGER DEFAULT 60
+)
+RETURNS SETOF public.dba_sync_outbox
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('public.claim_dba_sync_batch'));
+
+    RETURN QUERY
+    WITH newest AS (
+        SELECT DISTINCT ON (p.order_id) p.id
+        FROM public.dba_sync_outbox p
+        WHERE p.synced_at IS NULL
+        ORDER BY p.order_id, p.id DESC
+    ),
+    due AS (
+        SELECT o.id
+        FROM public.dba_sync_outbox o
+        JOIN newest n ON n.id = o.id
+        WHERE o.next_attempt_at <= NOW()
+          AND NOT EXISTS (
+              SELECT 1
+              FROM public.dba_sync_outbox f
+              WHERE f.order_id = o.order_id
+                AND f.synced_at IS NULL
+                AND f.leased_until > NOW()
+          )
+        ORDER BY o.id
+        LIMIT p_limit
+        FOR UPDATE OF o SKIP LOCKED
+    ),
+    claimed AS (
+        UPDATE public.dba_sync_outbox o
+        SET next_attempt_at = NOW() + make_interval(secs => p_lease_seconds),
+            leased_until = NOW() + make_interval(secs => p_lease_seconds)
+        FROM due
+        WHERE o.id = due.id
+        RETURNING o.*
+    ),
+    superseded AS (
+        UPDATE public.dba_sync_outbox o
+        SET synced_at = NOW(),
+            superseded_by = c.id
+        FROM claimed c
+        WHERE o.order_id = c.order_id
+          AND o.id < c.id
+          AND o.synced_at IS NULL
+    )
+    SELECT * FROM claimed;
+END;
+$$;
+
+-- ============================================
+-- Decisions enqueue their Database A write
+-- ============================================
+CREATE OR REPLACE FUNCTION public.submit_order_decision(
+    p_owner_id UUID,
+    p_order_id UUID,
+    p_decision TEXT
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_sent_for_delivery BOOLEAN;
+    v_previous_status TEXT;
+BEGIN
+    IF p_decision NOT IN ('accepted', 'rejected') THEN
+        RAISE EXCEPTION 'Decision must be accepted or rejected' USING ERRCODE = '22023';
+    END IF;
+
+    SELECT fo.sent_for_delivery INTO v_sent_for_delivery
+    FROM public.fetched_orders fo
+    WHERE fo.order_id = p_order_id
+      AND fo.restaurant_owner_id = p_owner_id
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Order not found' USING ERRCODE = 'P0002';
+    END IF;
+
+    SELECT r.overall_status INTO v_previous_status
+    FROM public.order_responses r
+    WHERE r.order_id = p_order_id;
+
+    IF v_sent_for_delivery OR v_previous_status = 'auto_rejected' THEN
+        RAISE EXCEPTION 'Order is already closed' USING ERRCODE = '55000';
+    END IF;
+
+    -- Repeated taps with the same decision are a no-op
+    IF v_previous_status = p_decision THEN
+        RETURN jsonb_build_object(
+            'order_id', p_order_id,
+            'overall_status', p_decision,
+            'previous_status', v_previous_status
+        );
+    END IF;
+
+    INSERT INTO public.order_responses AS r (
+        restaurant_owner_id, order_id, overall_status, synced_to_dba, responded_at
+    )
+    VALUES (p_owner_id, p_order_id, p_decision, FALSE, NOW())
+    ON CONFLICT ON CONSTRAINT order_responses_order_id_key DO UPDATE
+    SET restaurant_owner_id = EXCLUDED.restaurant_owner_id,
+        overall_status = EXCLUDED.overall_status,
+        synced_to_dba = EXCLUDED.synced_to_dba,
+        responded_at = EXCLUDED.responded_at;
+
+    UPDATE public.fetched_orders fo
+    SET order_status = p_decision
+    WHERE fo.order_id = p_order_id;
+
+    INSERT INTO public.dba_sync_outbox (order_id, status)
+    VALUES (p_order_id, p_decision);
+
+    RETURN jsonb_build_object(
+        'order_id', p_order_id,
+        'overall_status', p_decision,
+        'previous_status', v_previous_status
+    );
+END;
+$$;
+
+COMMENT ON TABLE public.dba_sync_outbox IS 'Pending customer_orders.status writes to Database A, drained by the backend sync worker';
@@ -0,0 +1,265 @@
+-- Pre-aggregated item rollups for GET /api/owner/item-analytics
+-- item_daily_rollups (top items over day windows) and item_hourly_rollups
+-- (weekday/hour demand forecast) are kept current by a trigger on
+-- order_line_items, so analytics read a few hundred rollup rows per owner
+-- instead of every order. Days and hours are local to rollup_timezone(),
+-- which must match the backend's STATS_TIMEZONE (the backend checks this at
+-- start-up and logs an error on a mismatch).
+-- item_name is the name on the day's latest line (ties: greatest name), the
+-- same rule whether rows are folded in by the triggers or rebuilt.
+-- Daily rollups count sales only: lines of rejected orders are left out, and
+-- subtracted again when an order is rejected after its lines were counted.
+-- Hourly rollups are demand and count every line.
+-- Every change bumps the owner's item_rollup_versions.version; the backend
+-- keeps an owner's rollups cached only while that version is unchanged.
+-- Requires: create_order_line_items.sql
+
+CREATE OR REPLACE FUNCTION public.rollup_timezone()
+RETURNS TEXT
+LANGUAGE sql
+IMMUTABLE
+AS $$ SELECT 'Asia/Kolkata'::TEXT $$;
+
+CREATE TABLE IF NOT EXISTS public.item_daily_rollups (
+    restaurant_owner_id UUID NOT NULL REFERENCES public.restaurant_owners(id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    menu_item_id TEXT NOT NULL,
+    item_name TEXT NOT NULL,          -- Name on the latest line that day
+    name_seen_at TIMESTAMPTZ,         -- ordered_at of that line
+    quantity INTEGER NOT NULL DEFAULT 0,
+    revenue BIGINT NOT NULL DEFAULT 0,  -- Paise
+    line_count INTEGER NOT NULL DEFAULT 0,  -- Rows with none left are deleted
+    PRIMARY KEY (restaurant_owner_id, day, menu_item_id)
+);
+
+ALTER TABLE public.item_daily_rollups ADD COLUMN IF NOT EXISTS name_seen_at TIMESTAMPTZ;
+
+CREATE TABLE IF NOT EXISTS public.item_hourly_rollups (
+    restaurant_owner_id UUID NOT NULL REFERENCES public.restaurant_owners(id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    hour SMALLINT NOT NULL CHECK (hour BETWEEN 0 AND 23),
+    menu_item_id TEXT NOT NULL,
+    quantity INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (restaurant_owner_id, day, hour, menu_item_id)
+);
+
+CREATE TABLE IF NOT EXISTS public.item_rollup_versions (
+    restaurant_owner_id UUID PRIMARY KEY REFERENCES public.restaurant_owners(id) ON DELETE CASCADE,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- ============================================
+-- Fold a set of line items into the rollups
+-- ============================================
+CREATE OR REPLACE FUNCTION public.update_item_rollups()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO public.item_daily_rollups AS r (
+        restaurant_owner_id, day, menu_item_id, item_name, name_seen_at, quantity, revenue, line_count
+    )
+    SELECT restaurant_owner_id,
+           (ordered_at AT TIME ZONE public.rollup_timezone())::DATE,
+           menu_item_id,
+           (ARRAY_AGG(item_name ORDER BY ordered_at DESC, item_name DESC))[1],
+           MAX(ordered_at),
+           SUM(quantity),
+           SUM(subtotal),
+           COUNT(*)
+    FROM new_lines
+    WHERE restaurant_owner_id IS NOT NULL
+      AND NOT rejected
+    GROUP BY 1, 2, 3
+    ON CONFLICT (restaurant_owner_id, day, menu_item_id) DO UPDATE
+    SET item_name = CASE
+            WHEN r.name_seen_at IS NULL
+              OR (EXCLUDED.name_seen_at, EXCLUDED.item_name) > (r.name_seen_at, r.item_name)
+            THEN EXCLUDED.item_name ELSE r.item_name
+        END,
+        name_seen_at = GREATEST(r.name_seen_at, EXCLUDED.name_seen_at),
+        quantity = r.quantity + EXCLUDED.quantity,
+        revenue = r.revenue + EXCLUDED.revenue,
+        line_count = r.line_count + EXCLUDED.line_count;
+
+    INSERT INTO public.item_hourly_rollups AS r (
+        restaurant_owner_id, day, hour, menu_item_id, quantity
+    )
+    SELECT restaurant_owner_id,
+           (ordered_at AT TIME ZONE public.rollup_timezone())::DATE,
+           EXTRACT(HOUR FROM ordered_at AT TIME ZONE public.rollup_timezone())::SMALLINT,
+           menu_item_id,
+           SUM(quantity)
+    FROM new_lines
+    WHERE restaurant_owner_id IS NOT NULL
+    GROUP BY 1, 2, 3, 4
+    ON CONFLICT (restaurant_owner_id, day, hour, menu_item_id) DO UPDATE
+    SET quantity = r.quantity + EXCLUDED.quantity;
+
+    INSERT INTO public.item_rollup_versions AS v (restaurant_owner_id, version, updated_at)
+    SELECT DISTINCT restaurant_owner_id, 1, NOW()
+    FROM new_lines
+    WHERE restaurant_owner_id IS NOT NULL
+    ON CONFLICT (restaurant_owner_id) DO UPDATE
+    SET version = v.version + 1,
+        updated_at = EXCLUDED.updated_at;
+
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_order_line_items_rollups ON public.order_line_items;
+CREATE TRIGGER trg_order_line_items_rollups
+AFTER INSERT ON public.order_line_items
+REFERENCING NEW TABLE AS new_lines
+FOR EACH STATEMENT EXECUTE FUNCTION public.update_item_rollups();
+
+-- ============================================
+-- Move lines in or out of the daily rollups when an order's decision flips
+-- ============================================
+CREATE OR REPLACE FUNCTION public.update_item_rollups_rejected()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    WITH changed AS (
+        SELECT n.restaurant_owner_id,
+               (n.ordered_at AT TIME ZONE public.rollup_timezone())::DATE AS day,
+               n.menu_item_id,
+               n.item_name,
+               CASE WHEN n.rejected THEN -1 ELSE 1 END AS sign,
+               n.quantity,
+               n.subtotal
+        FROM new_lines n
+        JOIN old_lines o ON o.order_id = n.order_id AND o.line_no = n.line_no
+        WHERE n.rejected <> o.rejected
+          AND n.restaurant_owner_id IS NOT NULL
+    )
+    INSERT INTO public.item_daily_rollups AS r (
+        restaurant_owner_id, day, menu_item_id, item_name, quantity, revenue, line_count
+    )
+    SELECT restaurant_owner_id,
+           day,
+           menu_item_id,
+           MAX(item_name),  -- Placeholder for new rows; names are recomputed below
+           SUM(sign * quantity),
+           SUM(sign * subtotal),
+           SUM(sign)
+    FROM changed
+    GROUP BY 1, 2, 3
+    ON CONFLICT (restaurant_owner_id, day, menu_item_id) DO UPDATE
+    SET quantity = r.quantity + EXCLUDED.quantity,
+        revenue = r.revenue + EXCLUDED.revenue,
+        line_count = r.line_count + EXCLUDED.line_count;
+
+    DELETE FROM public.item_daily_rollups r
+    USING new_lines n
+    WHERE r.restaurant_owner_id = n.restaurant_owner_id
+      AND r.day = (n.ordered_at AT TIME ZONE public.rollup_timezone())::DATE
+      AND r.menu_item_id = n.menu_item_id
+      AND r.line_count <= 0;
+
+    -- Lines joining or leaving a day can change its latest line: re-read the name
+    UPDATE public.item_daily_rollups r
+    SET item_name = latest.item_name,
+        name_seen_at = latest.ordered_at
+    FROM (SELECT DISTINCT restaurant_owner_id,
+                 (ordered_at AT TIME ZONE public.rollup_timezone())::DATE AS day,
+                 menu_item_id
+          FROM new_lines
+          WHERE restaurant_owner_id IS NOT NULL) k
+    CROSS JOIN LATERAL (
+        SELECT li.item_name, li.ordered_at
+        FROM public.order_line_items li
+        WHERE li.restaurant_owner_id = k.restaurant_owner_id
+          AND li.menu_item_id = k.menu_item_id
+          AND li.ordered_at >= (k.day::TIMESTAMP AT TIME ZONE public.rollup_timezone())
+          AND li.ordered_at < ((k.day + 1)::TIMESTAMP AT TIME ZONE public.rollup_timezone())
+          AND NOT li.rejected
+        ORDER BY li.ordered_at DESC, li.item_name DESC
+        LIMIT 1
+    ) latest
+    WHERE r.restaurant_owner_id = k.restaurant_owner_id
+      AND r.day = k.day
+      AND r.menu_item_id = k.menu_item_id;
+
+    INSERT INTO public.item_rollup_versions AS v (restaurant_owner_id, version, updated_at)
+    SELECT DISTINCT restaurant_owner_id, 1, NOW()
+    FROM new_lines
+    WHERE restaurant_owner_id IS NOT NULL
+    ON CONFLICT (restaurant_owner_id) DO UPDATE
+    SET version = v.version + 1,
+        updated_at = EXCLUDED.updated_at;
+
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_order_line_items_rollups_rejected ON public.order_line_items;
+CREATE TRIGGER trg_order_line_items_rollups_rejected
+AFTER UPDATE ON public.order_line_items
+REFERENCING OLD TABLE AS old_lines NEW TABLE AS new_lines
+FOR EACH STATEMENT EXECUTE FUNCTION public.update_item_rollups_rejected();
+
+-- ============================================
+-- Rebuild from order_line_items (initial fill, or after changing the timezone)
+-- ============================================
+-- SELECT public.rebuild_item_rollups();               -- every owner
+-- SELECT public.rebuild_item_rollups('<owner uuid>');  -- one owner
+CREATE OR REPLACE FUNCTION public.rebuild_item_rollups(p_owner_id UUID DEFAULT NULL)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_rows INTEGER;
+BEGIN
+    DELETE FROM public.item_daily_rollups WHERE p_owner_id IS NULL OR restaurant_owner_id = p_owner_id;
+    DELETE FROM public.item_hourly_rollups WHERE p_owner_id IS NULL OR restaurant_owner_id = p_owner_id;
+
+    INSERT INTO public.item_daily_rollups (
+        restaurant_owner_id, day, menu_item_id, item_name, name_seen_at, quantity, revenue, line_count
+    )
+    SELECT restaurant_owner_id,
+           (ordered_at AT TIME ZONE public.rollup_timezone())::DATE,
+           menu_item_id,
+           (ARRAY_AGG(item_name ORDER BY ordered_at DESC, item_name DESC))[1],
+           MAX(ordered_at),
+           SUM(quantity),
+           SUM(subtotal),
+           COUNT(*)
+    FROM public.order_line_items
+    WHERE restaurant_owner_id IS NOT NULL
+      AND NOT rejected
+      AND (p_owner_id IS NULL OR restaurant_owner_id = p_owner_id)
+    GROUP BY 1, 2, 3;
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+
+    INSERT INTO public.item_hourly_rollups (
+        restaurant_owner_id, day, hour, menu_item_id, quantity
+    )
+    SELECT restaurant_owner_id,
+           (ordered_at AT TIME ZONE public.rollup_timezone())::DATE,
+           EXTRACT(HOUR FROM ordered_at AT TIME ZONE public.rollup_timezone())::SMALLINT,
+           menu_item_id,
+           SUM(quantity)
+    FROM public.order_line_items
+    WHERE restaurant_owner_id IS NOT NULL
+      AND (p_owner_id IS NULL OR restaurant_owner_id = p_owner_id)
+    GROUP BY 1, 2, 3, 4;
+
+    -- Every rebuilt owner, including ones whose rollups are now empty
+    INSERT INTO public.item_rollup_versions AS v (restaurant_owner_id, version, updated_at)
+    SELECT o.id, 1, NOW()
+    FROM public.restaurant_owners o
+    WHERE p_owner_id IS NULL OR o.id = p_owner_id
+    ON CONFLICT (restaurant_owner_id) DO UPDATE
+    SET version = v.version + 1,
+        updated_at = EXCLUDED.updated_at;
+
+    RETURN v_rows;
+END;
+$$;
+
+-- Fill the rollups from line items that already exist
+SELECT public.rebuild_item_rollups();
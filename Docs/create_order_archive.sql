@@ -0,0 +1,191 @@
+-- Archive tier for fetched_orders / order_responses
+-- Orders that were sent for delivery more than ORDER_ARCHIVE_AFTER_DAYS ago are
+-- moved (with their responses) into *_archive tables in batches by
+-- archive_sent_orders(), so the hot tables that every owner query filters stay
+-- small. Order history, exports and earnings read the *_all views, which span
+-- both tiers, once ORDER_ARCHIVE_ENABLED=true in the backend.
+-- Requires: add_pool_id_column.sql, add_order_amount_breakdown_fields.sql,
+--           add_order_responses_unique_order_id.sql
+
+-- ============================================
+-- When an order was sent for delivery
+-- ============================================
+ALTER TABLE public.fetched_orders
+ADD COLUMN IF NOT EXISTS sent_for_delivery_at TIMESTAMPTZ;
+
+COMMENT ON COLUMN public.fetched_orders.sent_for_delivery_at IS 'When sent_for_delivery became TRUE (set by trigger); drives archival';
+
+-- Stamped in the database so every writer (mark-orders-sent, scripts, COPY) sets it
+CREATE OR REPLACE FUNCTION public.stamp_sent_for_delivery_at()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF NEW.sent_for_delivery THEN
+        IF TG_OP = 'INSERT' OR NOT OLD.sent_for_delivery THEN
+            NEW.sent_for_delivery_at := COALESCE(NEW.sent_for_delivery_at, NOW());
+        END IF;
+    ELSE
+        NEW.sent_for_delivery_at := NULL;
+    END IF;
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_fetched_orders_sent_for_delivery_at ON public.fetched_orders;
+CREATE TRIGGER trg_fetched_orders_sent_for_delivery_at
+BEFORE INSERT OR UPDATE OF sent_for_delivery ON public.fetched_orders
+FOR EACH ROW EXECUTE FUNCTION public.stamp_sent_for_delivery_at();
+
+-- Orders sent before this migration: fetched_at is the closest known time
+UPDATE public.fetched_orders
+SET sent_for_delivery_at = fetched_at
+WHERE sent_for_delivery AND sent_for_delivery_at IS NULL;
+
+-- Archive candidates in age order
+CREATE INDEX IF NOT EXISTS idx_fetched_orders_sent_for_delivery_at
+ON public.fetched_orders (sent_for_delivery_at)
+WHERE sent_for_delivery;
+
+-- ============================================
+-- Archive tables
+-- ============================================
+-- Same columns as the hot tables plus archived_at. order_id is not unique here:
+-- ids are only unique per tier, and the hot table's constraint still applies.
+CREATE TABLE IF NOT EXISTS public.fetched_orders_archive (
+    id UUID PRIMARY KEY,
+    restaurant_owner_id UUID REFERENCES public.restaurant_owners(id) ON DELETE CASCADE,
+    order_id UUID NOT NULL,
+    customer_name TEXT,
+    customer_phone TEXT,
+    items JSONB NOT NULL,
+    total_amount INTEGER NOT NULL,
+    payment_status TEXT,
+    order_status TEXT,
+    fetched_at TIMESTAMPTZ,
+    created_at TIMESTAMPTZ,
+    pool_id TEXT,
+    sent_for_delivery BOOLEAN NOT NULL DEFAULT TRUE,
+    subtotal INTEGER,
+    delivery_fee INTEGER,
+    platform_fee INTEGER,
+    total_customer_paid INTEGER,
+    amount_to_collect INTEGER,
+    sent_for_delivery_at TIMESTAMPTZ,
+    archived_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS public.order_responses_archive (
+    id UUID PRIMARY KEY,
+    restaurant_owner_id UUID REFERENCES public.restaurant_owners(id) ON DELETE CASCADE,
+    order_id UUID NOT NULL,
+    item_responses JSONB,             -- NULL for decisions recorded by submit_order_decision(s) and auto-reject
+    overall_status TEXT,
+    responded_at TIMESTAMPTZ,
+    synced_to_dba BOOLEAN,
+    archived_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Archives created by an earlier version of this script required item_responses
+ALTER TABLE public.order_responses_archive ALTER COLUMN item_responses DROP NOT NULL;
+
+-- Owner history (created_at) and exports (fetched_at, id) on the archive tier
+CREATE INDEX IF NOT EXISTS idx_fetched_orders_archive_owner_created
+ON public.fetched_orders_archive (restaurant_owner_id, created_at);
+
+CREATE INDEX IF NOT EXISTS idx_fetched_orders_archive_owner_fetched_id
+ON public.fetched_orders_archive (restaurant_owner_id, fetched_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_fetched_orders_archive_order_id
+ON public.fetched_orders_archive (order_id);
+
+CREATE INDEX IF NOT EXISTS idx_order_responses_archive_order_id
+ON public.order_responses_archive (order_id);
+
+-- ============================================
+-- Views spanning both tiers (read-only)
+-- ============================================
+-- Filters on these views are pushed into both branches, so each tier uses its
+-- own indexes; ordered keyset scans become a merge of two index scans.
+CREATE OR REPLACE VIEW public.fetched_orders_all AS
+SELECT id, restaurant_owner_id, order_id, customer_name, customer_phone, items, total_amount,
+       payment_status, order_status, fetched_at, created_at, pool_id, sent_for_delivery,
+       subtotal, delivery_fee, platform_fee, total_customer_paid, amount_to_collect, sent_for_delivery_at
+FROM public.fetched_orders
+UNION ALL
+SELECT id, restaurant_owner_id, order_id, customer_name, customer_phone, items, total_amount,
+       payment_status, order_status, fetched_at, created_at, pool_id, sent_for_delivery,
+       subtotal, delivery_fee, platform_fee, total_customer_paid, amount_to_collect, sent_for_delivery_at
+FROM public.fetched_orders_archive;
+
+CREATE OR REPLACE VIEW public.order_responses_all AS
+SELECT id, restaurant_owner_id, order_id, item_responses, overall_status, responded_at, synced_to_dba
+FROM public.order_responses
+UNION ALL
+SELECT id, restaurant_owner_id, order_id, item_responses, overall_status, responded_at, synced_to_dba
+FROM public.order_responses_archive;
+
+-- ============================================
+-- Move one batch of old sent orders to the archive
+-- ============================================
+-- Rows are claimed with SKIP LOCKED so concurrent runs never move the same
+-- order twice. Responses move in the same statement, so an order and its
+-- response are always in the same tier. Returns the number of orders moved;
+-- callers repeat until it is below p_batch_size.
+CREATE OR REPLACE FUNCTION public.archive_sent_orders(
+    p_older_than_days INTEGER DEFAULT 30,
+    p_batch_size INTEGER DEFAULT 1000
+)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_moved INTEGER;
+BEGIN
+    WITH batch AS (
+        SELECT id, order_id
+        FROM public.fetched_orders
+        WHERE sent_for_delivery
+          AND sent_for_delivery_at < NOW() - make_interval(days => p_older_than_days)
+        ORDER BY sent_for_delivery_at
+        LIMIT p_batch_size
+        FOR UPDATE SKIP LOCKED
+    ),
+    moved_responses AS (
+        DELETE FROM public.order_responses r
+        USING batch b
+        WHERE r.order_id = b.order_id
+        RETURNING r.*
+    ),
+    archived_responses AS (
+        INSERT INTO public.order_responses_archive (
+            id, restaurant_owner_id, order_id, item_responses, overall_status, responded_at, synced_to_dba
+        )
+        SELECT id, restaurant_owner_id, order_id, item_responses, overall_status, responded_at, synced_to_dba
+        FROM moved_responses
+    ),
+    moved_orders AS (
+        DELETE FROM public.fetched_orders f
+        USING batch b
+        WHERE f.id = b.id
+        RETURNING f.*
+    ),
+    archived_orders AS (
+        INSERT INTO public.fetched_orders_archive (
+            id, restaurant_owner_id, order_id, customer_name, customer_phone, items, total_amount,
+            payment_status, order_status, fetched_at, created_at, pool_id, sent_for_delivery,
+            subtotal, delivery_fee, platform_fee, total_customer_paid, amount_to_collect, sent_for_delivery_at
+        )
+        SELECT id, restaurant_owner_id, order_id, customer_name, customer_phone, items, total_amount,
+               payment_status, order_status, fetched_at, created_at, pool_id, sent_for_delivery,
+               subtotal, delivery_fee, platform_fee, total_customer_paid, amount_to_collect, sent_for_delivery_at
+        FROM moved_orders
+        RETURNING 1
+    )
+    SELECT COUNT(*) INTO v_moved FROM archived_orders;
+
+    RETURN v_moved;
+END;
+$$;
+
+COMMENT ON FUNCTION public.archive_sent_orders(INTEGER, INTEGER) IS 'Move up to p_batch_size orders sent for delivery more than p_older_than_days ago (and their responses) to the archive tables';
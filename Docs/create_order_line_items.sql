@@ -0,0 +1,293 @@
+-- Normalized order line items for item analytics
+-- fetched_orders.items stays the source of truth; every inserted order is also
+-- expanded into one order_line_items row per item by a trigger, so per-item
+-- questions (top sellers, quantity by day, demand per pool) are indexed
+-- GROUP BY queries instead of unpacking JSONB in the backend.
+-- Orders stored before this migration are filled in by backfill_order_line_items()
+-- (python backfill_line_items.py). Line items are not moved by archival.
+-- rejected mirrors the order's decision (fetched_orders.order_status rejected or
+-- auto_rejected) and is kept in sync by a trigger, so sales and revenue leave out
+-- orders the restaurant turned down.
+-- Requires: add_pool_id_column.sql, create_order_archive.sql (fetched_orders_all)
+
+CREATE TABLE IF NOT EXISTS public.order_line_items (
+    order_id UUID NOT NULL,           -- fetched_orders.order_id (hot or archive tier)
+    line_no SMALLINT NOT NULL,        -- Position in fetched_orders.items (1-based)
+    restaurant_owner_id UUID REFERENCES public.restaurant_owners(id) ON DELETE CASCADE,
+    pool_id TEXT,
+    menu_item_id TEXT NOT NULL,
+    item_name TEXT NOT NULL,
+    quantity INTEGER NOT NULL,
+    unit_price INTEGER NOT NULL,      -- Paise
+    subtotal INTEGER NOT NULL,        -- Paise (unit_price * quantity when missing)
+    ordered_at TIMESTAMPTZ NOT NULL,  -- COALESCE(created_at, fetched_at)
+    rejected BOOLEAN NOT NULL DEFAULT FALSE,  -- Order rejected or auto_rejected
+    PRIMARY KEY (order_id, line_no)
+);
+
+ALTER TABLE public.order_line_items ADD COLUMN IF NOT EXISTS rejected BOOLEAN NOT NULL DEFAULT FALSE;
+
+-- Per-owner time windows over sold (not rejected) lines. INCLUDE carries every
+-- column owner_top_items / owner_item_daily read, so both can run index-only
+DROP INDEX IF EXISTS public.idx_order_line_items_owner_ordered;
+CREATE INDEX IF NOT EXISTS idx_order_line_items_owner_sold
+ON public.order_line_items (restaurant_owner_id, ordered_at)
+INCLUDE (menu_item_id, item_name, order_id, quantity, subtotal)
+WHERE NOT rejected;
+
+-- Demand per pool
+CREATE INDEX IF NOT EXISTS idx_order_line_items_owner_pool
+ON public.order_line_items (restaurant_owner_id, pool_id, menu_item_id);
+
+-- ============================================
+-- Write line items on ingestion
+-- ============================================
+-- Statement-level with a transition table: one INSERT ... SELECT per webhook
+-- insert or COPY, not one per order. Rows skipped by ON CONFLICT are not in it.
+CREATE OR REPLACE FUNCTION public.insert_order_line_items()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO public.order_line_items (
+        order_id, line_no, restaurant_owner_id, pool_id, menu_item_id, item_name,
+        quantity, unit_price, subtotal, ordered_at, rejected
+    )
+    SELECT o.order_id,
+           e.line_no,
+           o.restaurant_owner_id,
+           o.pool_id,
+           COALESCE(e.item->>'menu_item_id', ''),
+           COALESCE(e.item->>'name', ''),
+           COALESCE((e.item->>'quantity')::NUMERIC::INTEGER, 0),
+           COALESCE((e.item->>'unit_price')::NUMERIC::INTEGER, 0),
+           COALESCE(
+               NULLIF((e.item->>'subtotal')::NUMERIC::INTEGER, 0),
+               COALESCE((e.item->>'unit_price')::NUMERIC::INTEGER, 0) * COALESCE((e.item->>'quantity')::NUMERIC::INTEGER, 0)
+           ),
+           COALESCE(o.created_at, o.fetched_at, NOW()),
+           COALESCE(o.order_status IN ('rejected', 'auto_rejected'), FALSE)
+    FROM new_orders o
+    CROSS JOIN LATERAL jsonb_array_elements(
+        CASE WHEN jsonb_typeof(o.items) = 'array' THEN o.items ELSE '[]'::jsonb END
+    ) WITH ORDINALITY AS e(item, line_no)
+    ON CONFLICT (order_id, line_no) DO NOTHING;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_fetched_orders_line_items ON public.fetched_orders;
+CREATE TRIGGER trg_fetched_orders_line_items
+AFTER INSERT ON public.fetched_orders
+REFERENCING NEW TABLE AS new_orders
+FOR EACH STATEMENT EXECUTE FUNCTION public.insert_order_line_items();
+
+-- ============================================
+-- Keep line items in step with the order's decision
+-- ============================================
+-- Decisions, auto-rejects and reconciliation all write fetched_orders.order_status.
+-- Only orders whose rejected-ness changed touch their line items.
+CREATE OR REPLACE FUNCTION public.sync_order_line_items_rejected()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE public.order_line_items li
+    SET rejected = c.rejected
+    FROM (
+        SELECT n.order_id,
+               COALESCE(n.order_status IN ('rejected', 'auto_rejected'), FALSE) AS rejected
+        FROM new_orders n
+        JOIN old_orders o ON o.id = n.id
+        WHERE COALESCE(n.order_status IN ('rejected', 'auto_rejected'), FALSE)
+              <> COALESCE(o.order_status IN ('rejected', 'auto_rejected'), FALSE)
+    ) c
+    WHERE li.order_id = c.order_id
+      AND li.rejected <> c.rejected;
+    RETURN NULL;
+END;
+$$;
+
+-- Transition tables cannot be combined with UPDATE OF <column>; the function filters instead
+DROP TRIGGER IF EXISTS trg_fetched_orders_line_items_status ON public.fetched_orders;
+CREATE TRIGGER trg_fetched_orders_line_items_status
+AFTER UPDATE ON public.fetched_orders
+REFERENCING OLD TABLE AS old_orders NEW TABLE AS new_orders
+FOR EACH STATEMENT EXECUTE FUNCTION public.sync_order_line_items_rejected();
+
+-- Line items written before the rejected column existed
+UPDATE public.order_line_items li
+SET rejected = TRUE
+FROM public.fetched_orders_all o
+WHERE o.order_id = li.order_id
+  AND o.order_status IN ('rejected', 'auto_rejected')
+  AND NOT li.rejected;
+
+-- ============================================
+-- Backfill existing orders (both tiers), one keyset batch per call
+-- ============================================
+-- Pass the returned last_order_id back as p_after_order_id until done is true.
+CREATE OR REPLACE FUNCTION public.backfill_order_line_items(
+    p_after_order_id UUID DEFAULT NULL,
+    p_batch_size INTEGER DEFAULT 1000
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_result JSONB;
+BEGIN
+    WITH batch AS (
+        SELECT order_id, restaurant_owner_id, pool_id, items, created_at, fetched_at, order_status
+        FROM public.fetched_orders_all
+        WHERE p_after_order_id IS NULL OR order_id > p_after_order_id
+        ORDER BY order_id
+        LIMIT p_batch_size
+    ),
+    inserted AS (
+        INSERT INTO public.order_line_items (
+            order_id, line_no, restaurant_owner_id, pool_id, menu_item_id, item_name,
+            quantity, unit_price, subtotal, ordered_at, rejected
+        )
+        SELECT o.order_id,
+               e.line_no,
+               o.restaurant_owner_id,
+               o.pool_id,
+               COALESCE(e.item->>'menu_item_id', ''),
+               COALESCE(e.item->>'name', ''),
+               COALESCE((e.item->>'quantity')::NUMERIC::INTEGER, 0),
+               COALESCE((e.item->>'unit_price')::NUMERIC::INTEGER, 0),
+               COALESCE(
+                   NULLIF((e.item->>'subtotal')::NUMERIC::INTEGER, 0),
+                   COALESCE((e.item->>'unit_price')::NUMERIC::INTEGER, 0) * COALESCE((e.item->>'quantity')::NUMERIC::INTEGER, 0)
+               ),
+               COALESCE(o.created_at, o.fetched_at, NOW()),
+               COALESCE(o.order_status IN ('rejected', 'auto_rejected'), FALSE)
+        FROM batch o
+        CROSS JOIN LATERAL jsonb_array_elements(
+            CASE WHEN jsonb_typeof(o.items) = 'array' THEN o.items ELSE '[]'::jsonb END
+        ) WITH ORDINALITY AS e(item, line_no)
+        ON CONFLICT (order_id, line_no) DO NOTHING
+        RETURNING 1
+    )
+    SELECT jsonb_build_object(
+        'orders', (SELECT COUNT(*) FROM batch),
+        'line_items', (SELECT COUNT(*) FROM inserted),
+        -- UUIDs compare like their lowercase text form
+        'last_order_id', (SELECT MAX(order_id::TEXT) FROM batch),
+        'done', (SELECT COUNT(*) FROM batch) < p_batch_size
+    ) INTO v_result;
+
+    RETURN v_result;
+END;
+$$;
+
+-- ============================================
+-- Item analytics (GET /api/owner/items/*)
+-- ============================================
+
+-- Top items by quantity in [p_since, p_until); rejected orders are not sales
+CREATE OR REPLACE FUNCTION public.owner_top_items(
+    p_owner_id UUID,
+    p_since TIMESTAMPTZ,
+    p_until TIMESTAMPTZ,
+    p_limit INTEGER DEFAULT 20
+)
+RETURNS TABLE (
+    menu_item_id TEXT,
+    item_name TEXT,
+    total_quantity BIGINT,
+    total_revenue BIGINT,
+    order_count BIGINT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT li.menu_item_id,
+           (ARRAY_AGG(li.item_name ORDER BY li.ordered_at DESC, li.item_name DESC))[1],  -- latest name
+           SUM(li.quantity),
+           SUM(li.subtotal),
+           COUNT(DISTINCT li.order_id)
+    FROM public.order_line_items li
+    WHERE li.restaurant_owner_id = p_owner_id
+      AND li.ordered_at >= p_since
+      AND li.ordered_at < p_until
+      AND NOT li.rejected
+    GROUP BY li.menu_item_id
+    ORDER BY SUM(li.quantity) DESC, SUM(li.subtotal) DESC
+    LIMIT p_limit;
+$$;
+
+-- Quantity and revenue per local day (p_tz) and item, optionally for one item,
+-- leaving out rejected orders
+CREATE OR REPLACE FUNCTION public.owner_item_daily(
+    p_owner_id UUID,
+    p_since TIMESTAMPTZ,
+    p_until TIMESTAMPTZ,
+    p_tz TEXT DEFAULT 'Asia/Kolkata',
+    p_menu_item_id TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+    day DATE,
+    menu_item_id TEXT,
+    item_name TEXT,
+    total_quantity BIGINT,
+    total_revenue BIGINT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT (li.ordered_at AT TIME ZONE p_tz)::DATE,
+           li.menu_item_id,
+           (ARRAY_AGG(li.item_name ORDER BY li.ordered_at DESC, li.item_name DESC))[1],  -- latest name
+           SUM(li.quantity),
+           SUM(li.subtotal)
+    FROM public.order_line_items li
+    WHERE li.restaurant_owner_id = p_owner_id
+      AND li.ordered_at >= p_since
+      AND li.ordered_at < p_until
+      AND NOT li.rejected
+      AND (p_menu_item_id IS NULL OR li.menu_item_id = p_menu_item_id)
+    GROUP BY 1, 2
+    ORDER BY 1, 4 DESC;
+$$;
+
+-- Item demand for each of the owner's latest p_pools pools (everything customers
+-- ordered, rejected orders included)
+CREATE OR REPLACE FUNCTION public.owner_pool_item_demand(
+    p_owner_id UUID,
+    p_pools INTEGER DEFAULT 10
+)
+RETURNS TABLE (
+    pool_id TEXT,
+    pool_started_at TIMESTAMPTZ,
+    menu_item_id TEXT,
+    item_name TEXT,
+    total_quantity BIGINT,
+    order_count BIGINT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH pools AS (
+        SELECT li.pool_id, MIN(li.ordered_at) AS pool_started_at
+        FROM public.order_line_items li
+        WHERE li.restaurant_owner_id = p_owner_id
+          AND li.pool_id IS NOT NULL
+        GROUP BY li.pool_id
+        ORDER BY MIN(li.ordered_at) DESC
+        LIMIT p_pools
+    )
+    SELECT p.pool_id,
+           p.pool_started_at,
+           li.menu_item_id,
+           MAX(li.item_name),
+           SUM(li.quantity),
+           COUNT(DISTINCT li.order_id)
+    FROM pools p
+    JOIN public.order_line_items li
+      ON li.restaurant_owner_id = p_owner_id
+     AND li.pool_id = p.pool_id
+    GROUP BY p.pool_id, p.pool_started_at, li.menu_item_id
+    ORDER BY p.pool_started_at DESC, 5 DESC;
+$$;
@@ -0,0 +1,74 @@
+-- Race-safe repairs for the order status reconciliation job (utils/reconciliation.py)
+-- The job compares statuses from a snapshot that can be seconds old. Applying
+-- that snapshot blindly would revert an owner decision committed in between,
+-- so repairs go through this function instead: it takes the same fetched_orders
+-- row locks as submit_order_decision(s), re-reads order_responses afterwards and
+-- only writes rows whose response still matches what the job saw.
+-- Orders with an unsynced dba_sync_outbox intent are skipped for Database A:
+-- the sync worker is about to write the current status anyway.
+-- Requires: create_dba_sync_outbox.sql
+
+CREATE OR REPLACE FUNCTION public.repair_order_status_drift(
+    p_repairs JSONB  -- [{"order_id": "<uuid>", "expected": "<status>", "fix_dbb": bool, "fix_dba": bool}, ...]
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_repaired_dbb INTEGER;
+    v_queued_dba INTEGER;
+BEGIN
+    -- Lock in order_id order, like the decision functions, so a repair and a
+    -- bulk decision cannot deadlock. The statement below runs on a fresh
+    -- snapshot and sees any decision committed while we waited.
+    PERFORM 1
+    FROM public.fetched_orders fo
+    WHERE fo.order_id IN (SELECT (d->>'order_id')::UUID FROM jsonb_array_elements(p_repairs) d)
+    ORDER BY fo.order_id
+    FOR UPDATE;
+
+    WITH requested AS (
+        SELECT (d->>'order_id')::UUID AS order_id,
+               d->>'expected' AS expected,
+               COALESCE((d->>'fix_dbb')::BOOLEAN, FALSE) AS fix_dbb,
+               COALESCE((d->>'fix_dba')::BOOLEAN, FALSE) AS fix_dba
+        FROM jsonb_array_elements(p_repairs) d
+    ),
+    still_expected AS (
+        -- Repairs whose response changed since the job read it are dropped
+        SELECT q.order_id, r.overall_status, q.fix_dbb, q.fix_dba
+        FROM requested q
+        JOIN public.order_responses r ON r.order_id = q.order_id
+        WHERE r.overall_status = q.expected
+    ),
+    dbb AS (
+        UPDATE public.fetched_orders fo
+        SET order_status = c.overall_status
+        FROM still_expected c
+        WHERE fo.order_id = c.order_id
+          AND c.fix_dbb
+          AND fo.order_status IS DISTINCT FROM c.overall_status
+        RETURNING fo.order_id
+    ),
+    dba AS (
+        INSERT INTO public.dba_sync_outbox (order_id, status)
+        SELECT c.order_id, c.overall_status
+        FROM still_expected c
+        WHERE c.fix_dba
+          AND NOT EXISTS (
+              SELECT 1
+              FROM public.dba_sync_outbox p
+              WHERE p.order_id = c.order_id
+                AND p.synced_at IS NULL
+          )
+        ORDER BY c.order_id
+        RETURNING order_id
+    )
+    SELECT (SELECT COUNT(*) FROM dbb), (SELECT COUNT(*) FROM dba)
+    INTO v_repaired_dbb, v_queued_dba;
+
+    RETURN jsonb_build_object('repaired_dbb', v_repaired_dbb, 'queued_dba', v_queued_dba);
+END;
+$$;
+
+COMMENT ON FUNCTION public.repair_order_status_drift(JSONB) IS 'Apply reconciliation repairs only where order_responses still holds the expected status; returns {repaired_dbb, queued_dba}';
@@ -0,0 +1,65 @@
+-- Atomic single-order decision for POST /api/owner/submit-response
+-- Records the owner's response and updates fetched_orders.order_status in one
+-- transaction (one round trip from the backend instead of three).
+-- Requires: add_order_responses_unique_order_id.sql
+
+CREATE OR REPLACE FUNCTION public.submit_order_decision(
+    p_owner_id UUID,
+    p_order_id UUID,
+    p_decision TEXT
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_sent_for_delivery BOOLEAN;
+    v_previous_status TEXT;
+BEGIN
+    IF p_decision NOT IN ('accepted', 'rejected') THEN
+        RAISE EXCEPTION 'Decision must be accepted or rejected' USING ERRCODE = '22023';
+    END IF;
+
+    -- Lock the order row: concurrent decisions for the same order are applied
+    -- one after another instead of overwriting each other half-way
+    SELECT fo.sent_for_delivery INTO v_sent_for_delivery
+    FROM public.fetched_orders fo
+    WHERE fo.order_id = p_order_id
+      AND fo.restaurant_owner_id = p_owner_id
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Order not found' USING ERRCODE = 'P0002';
+    END IF;
+
+    SELECT r.overall_status INTO v_previous_status
+    FROM public.order_responses r
+    WHERE r.order_id = p_order_id;
+
+    -- A late tap must not overwrite an auto-rejection or a dispatched order
+    IF v_sent_for_delivery OR v_previous_status = 'auto_rejected' THEN
+        RAISE EXCEPTION 'Order is already closed' USING ERRCODE = '55000';
+    END IF;
+
+    INSERT INTO public.order_responses AS r (
+        restaurant_owner_id, order_id, overall_status, synced_to_dba, responded_at
+    )
+    VALUES (p_owner_id, p_order_id, p_decision, TRUE, NOW())
+    ON CONFLICT ON CONSTRAINT order_responses_order_id_key DO UPDATE
+    SET restaurant_owner_id = EXCLUDED.restaurant_owner_id,
+        overall_status = EXCLUDED.overall_status,
+        synced_to_dba = EXCLUDED.synced_to_dba,
+        responded_at = EXCLUDED.responded_at;
+
+    UPDATE public.fetched_orders fo
+    SET order_status = p_decision
+    WHERE fo.order_id = p_order_id;
+
+    RETURN jsonb_build_object(
+        'order_id', p_order_id,
+        'overall_status', p_decision,
+        'previous_status', v_previous_status
+    );
+END;
+$$;
+
+COMMENT ON FUNCTION public.submit_order_decision(UUID, UUID, TEXT) IS 'Record an owner decision and update fetched_orders atomically; raises P0002 (not found) or 55000 (closed)';
@@ -0,0 +1,102 @@
+-- Atomic bulk decisions for POST /api/owner/submit-responses
+-- Set-based counterpart of submit_order_decision(): the same row locks and
+-- closed-order rule (sent for delivery, or an auto_rejected response), applied
+-- to a whole batch in one transaction, so the single and bulk endpoints always
+-- agree on whether an order can still be changed.
+-- Requires: create_dba_sync_outbox.sql
+
+CREATE OR REPLACE FUNCTION public.submit_order_decisions(
+    p_owner_id UUID,
+    p_decisions JSONB  -- [{"order_id": "<uuid>", "decision": "accepted" | "rejected"}, ...]
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_result JSONB;
+BEGIN
+    IF EXISTS (
+        SELECT 1
+        FROM jsonb_array_elements(p_decisions) d
+        WHERE d->>'decision' IS NULL OR d->>'decision' NOT IN ('accepted', 'rejected')
+    ) THEN
+        RAISE EXCEPTION 'Decision must be accepted or rejected' USING ERRCODE = '22023';
+    END IF;
+
+    -- Lock the owner's order rows first, in order_id order so overlapping bulk
+    -- calls cannot deadlock. The statement below then runs on a fresh snapshot
+    -- and sees any decision committed while we waited.
+    PERFORM 1
+    FROM public.fetched_orders fo
+    WHERE fo.restaurant_owner_id = p_owner_id
+      AND fo.order_id IN (SELECT (d->>'order_id')::UUID FROM jsonb_array_elements(p_decisions) d)
+    ORDER BY fo.order_id
+    FOR UPDATE;
+
+    WITH requested AS (
+        -- The last decision for a repeated order_id wins
+        SELECT DISTINCT ON ((d.value->>'order_id')::UUID)
+               (d.value->>'order_id')::UUID AS order_id,
+               d.value->>'decision' AS decision
+        FROM jsonb_array_elements(p_decisions) WITH ORDINALITY AS d(value, position)
+        ORDER BY (d.value->>'order_id')::UUID, d.position DESC
+    ),
+    outcomes AS (
+        SELECT q.order_id,
+               q.decision,
+               CASE
+                   WHEN fo.order_id IS NULL THEN 'not_found'
+                   WHEN fo.sent_for_delivery OR r.overall_status = 'auto_rejected' THEN 'closed'
+                   WHEN r.overall_status = q.decision THEN 'unchanged'
+                   ELSE 'applied'
+               END AS outcome
+        FROM requested q
+        LEFT JOIN LATERAL (
+            SELECT o.order_id, o.sent_for_delivery
+            FROM public.fetched_orders o
+            WHERE o.order_id = q.order_id
+              AND o.restaurant_owner_id = p_owner_id
+            LIMIT 1
+        ) fo ON TRUE
+        LEFT JOIN public.order_responses r ON r.order_id = q.order_id
+    ),
+    responses AS (
+        INSERT INTO public.order_responses AS r (
+            restaurant_owner_id, order_id, overall_status, synced_to_dba, responded_at
+        )
+        SELECT p_owner_id, o.order_id, o.decision, FALSE, NOW()
+        FROM outcomes o
+        WHERE o.outcome = 'applied'
+        ON CONFLICT ON CONSTRAINT order_responses_order_id_key DO UPDATE
+        SET restaurant_owner_id = EXCLUDED.restaurant_owner_id,
+            overall_status = EXCLUDED.overall_status,
+            synced_to_dba = EXCLUDED.synced_to_dba,
+            responded_at = EXCLUDED.responded_at
+    ),
+    statuses AS (
+        UPDATE public.fetched_orders fo
+        SET order_status = o.decision
+        FROM outcomes o
+        WHERE fo.order_id = o.order_id
+          AND o.outcome = 'applied'
+    ),
+    queued AS (
+        INSERT INTO public.dba_sync_outbox (order_id, status)
+        SELECT o.order_id, o.decision
+        FROM outcomes o
+        WHERE o.outcome = 'applied'
+        ORDER BY o.order_id
+    )
+    SELECT COALESCE(jsonb_agg(jsonb_build_object(
+               'order_id', o.order_id,
+               'decision', o.decision,
+               'outcome', o.outcome
+           )), '[]'::JSONB)
+    INTO v_result
+    FROM outcomes o;
+
+    RETURN v_result;
+END;
+$$;
+
+COMMENT ON FUNCTION public.submit_order_decisions(UUID, JSONB) IS 'Record many owner decisions atomically; returns one {order_id, decision, outcome} per order (applied, unchanged, not_found, closed)';
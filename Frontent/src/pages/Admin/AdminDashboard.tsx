@@ -1,42 +1,136 @@
-import { useState, useEffect } from 'react';
-import { adminService } from '../../services/admin';
-import { RestaurantOwner, Restaurant } from '../../types/user.types';
+import { useState, useEffect, useRef } from 'react';
+import { adminService, OwnerApprovalStatus } from '../../services/admin';
+import { RestaurantOwner, Restaurant, AdminStats, BulkOwnerActionResult } from '../../types/user.types';
+
+// Owners per request; more are loaded on demand
+const OWNERS_PAGE_SIZE = 50;
 
 const AdminDashboard = () => {
   const [owners, setOwners] = useState<RestaurantOwner[]>([]);
-  const [restaurants, setRestaurants] = useState<Restaurant[]>([]);
+  const [stats, setStats] = useState<AdminStats | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
   const [success, setSuccess] = useState('');
-  const [filter, setFilter] = useState<'all' | 'pending' | 'approved' | 'rejected'>('all');
+  const [filter, setFilter] = useState<'all' | OwnerApprovalStatus>('all');
+  const [search, setSearch] = useState('');
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  // Ignore owner pages that arrive after a newer search or tab was started
+  const ownersRequest = useRef(0);
+  const ownersReady = useRef(false);
+  const lastSearch = useRef(search);
 
   // State for UID assignment
   const [selectedOwner, setSelectedOwner] = useState<string | null>(null);
   const [selectedRestaurant, setSelectedRestaurant] = useState<string>('');
+  const [restaurantQuery, setRestaurantQuery] = useState('');
+  const [restaurantResults, setRestaurantResults] = useState<Restaurant[]>([]);
+  const restaurantRequest = useRef(0);
+  // Restaurant picked per owner, so several pending owners can be approved together
+  const [pickedRestaurants, setPickedRestaurants] = useState<Record<string, Restaurant>>({});
+
+  // Multi-select for bulk approve / reject (pending owners only)
+  const [checkedOwners, setCheckedOwners] = useState<Set<string>>(new Set());
+  const [bulkBusy, setBulkBusy] = useState(false);
 
   useEffect(() => {
     console.log('AdminDashboard mounted, loading data...');
     loadData();
   }, []);
 
+  // Search and filter server-side: tab changes reload at once, typing once it pauses
+  useEffect(() => {
+    if (!ownersReady.current) {
+      ownersReady.current = true;
+      return;
+    }
+    const delay = search !== lastSearch.current ? 300 : 0;
+    lastSearch.current = search;
+    const timer = setTimeout(() => {
+      loadOwners().catch((err: any) => {
+        setError(err.response?.data?.detail || err.message || 'Failed to load owners');
+      });
+    }, delay);
+    return () => clearTimeout(timer);
+  }, [search, filter]);
+
+  // Restaurant typeahead for the open UID picker, once typing pauses
+  useEffect(() => {
+    if (!selectedOwner) return;
+    const timer = setTimeout(async () => {
+      const request = ++restaurantRequest.current;
+      try {
+        const results = await adminService.searchRestaurants(restaurantQuery.trim());
+        if (request === restaurantRequest.current) setRestaurantResults(results);
+      } catch (err: any) {
+        setError(err.response?.data?.detail || err.message || 'Failed to search restaurants');
+      }
+    }, 300);
+    return () => clearTimeout(timer);
+  }, [restaurantQuery, selectedOwner]);
+
+  const openPicker = (owner: RestaurantOwner) => {
+    const picked = pickedRestaurants[owner.id];
+    setSelectedOwner(owner.id);
+    setSelectedRestaurant(picked?.id || owner.restaurant_uid || '');
+    setRestaurantQuery(picked?.name || '');
+    setRestaurantResults([]);
+  };
+
+  const pickRestaurant = (ownerId: string, restaurant: Restaurant) => {
+    setSelectedRestaurant(restaurant.id);
+    setRestaurantQuery(restaurant.name);
+    setPickedRestaurants((picked) => ({ ...picked, [ownerId]: restaurant }));
+  };
+
+  const ownersQuery = () => ({
+    search: search.trim() || undefined,
+    approval_status: filter === 'all' ? undefined : filter,
+    limit: OWNERS_PAGE_SIZE,
+  });
+
+  // Load the first page of owners for the current search and tab
+  const loadOwners = async () => {
+    const request = ++ownersRequest.current;
+    const page = await adminService.getOwnersPage(ownersQuery());
+    if (request !== ownersRequest.current) return;
+    setOwners(page.owners);
+    setNextCursor(page.next_cursor);
+    setCheckedOwners(new Set());
+  };
+
+  const loadMoreOwners = async () => {
+    if (!nextCursor) return;
+    const request = ownersRequest.current;
+    setLoadingMore(true);
+    try {
+      const page = await adminService.getOwnersPage({ ...ownersQuery(), cursor: nextCursor });
+      if (request !== ownersRequest.current) return;
+      setOwners((loaded) => [...loaded, ...page.owners]);
+      setNextCursor(page.next_cursor);
+    } catch (err: any) {
+      setError(err.response?.data?.detail || err.message || 'Failed to load more owners');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const loadData = async () => {
     console.log('loadData called');
     setLoading(true);
     setError('');
     try {
-      console.log('Fetching owners and restaurants...');
-      const [ownersData, restaurantsData] = await Promise.all([
-        adminService.getPendingOwners(),
-        adminService.getAllRestaurants(),
+      console.log('Fetching owners and stats...');
+      const [, statsData] = await Promise.all([
+        loadOwners(),
+        adminService.getStats().catch(() => null),
       ]);
-      console.log('Received data:', { ownersData, restaurantsData });
-      setOwners(ownersData.pending_owners || []);
-      setRestaurants(restaurantsData.restaurants || []);
+      setStats(statsData);
     } catch (err: any) {
       console.error('Error loading data:', err);
       setError(err.response?.data?.detail || err.message || 'Failed to load data');
       setOwners([]);
-      setRestaurants([]);
+      setNextCursor(null);
     } finally {
       console.log('loadData finished, setting loading to false');
       setLoading(false);
@@ -57,6 +151,12 @@ const AdminDashboard = () => {
       loadData();
       setSelectedOwner(null);
       setSelectedRestaurant('');
+      setRestaurantQuery('');
+      setPickedRestaurants((picked) => {
+        const next = { ...picked };
+        delete next[ownerId];
+        return next;
+      });
     } catch (err: any) {
       setError(err.response?.data?.detail || 'Failed to approve owner');
     }
@@ -76,10 +176,92 @@ const AdminDashboard = () => {
     }
   };
 
-  const filteredOwners = (owners || []).filter((owner) => {
-    if (filter === 'all') return true;
-    return owner.approval_status === filter;
-  });
+  const toggleChecked = (ownerId: string) => {
+    setCheckedOwners((checked) => {
+      const next = new Set(checked);
+      if (next.has(ownerId)) {
+        next.delete(ownerId);
+      } else {
+        next.add(ownerId);
+      }
+      return next;
+    });
+  };
+
+  const pendingOwners = owners.filter((owner) => owner.approval_status === 'pending');
+  const allPendingChecked = pendingOwners.length > 0 && pendingOwners.every((owner) => checkedOwners.has(owner.id));
+
+  const toggleAllPending = () => {
+    setCheckedOwners(allPendingChecked ? new Set() : new Set(pendingOwners.map((owner) => owner.id)));
+  };
+
+  // Summarise per-owner bulk results; failures are grouped by message
+  const reportBulkResult = (verb: string, result: BulkOwnerActionResult) => {
+    if (result.processed_count) {
+      setSuccess(`${result.processed_count} owner(s) ${verb}`);
+    }
+    const failures = result.results.filter((item) => !item.success);
+    if (failures.length) {
+      const reasons = Array.from(new Set(failures.map((item) => item.message))).join('; ');
+      setError(`${failures.length} owner(s) could not be ${verb}: ${reasons}`);
+    }
+  };
+
+  const handleBulkApprove = async () => {
+    const ownerIds = Array.from(checkedOwners);
+    const missing = ownerIds.filter((ownerId) => !pickedRestaurants[ownerId]);
+    if (missing.length) {
+      setError(`Pick a restaurant for ${missing.length} selected owner(s) before approving`);
+      return;
+    }
+
+    setError('');
+    setSuccess('');
+    setBulkBusy(true);
+    try {
+      const result = await adminService.bulkApproveOwners(
+        ownerIds.map((ownerId) => ({ owner_id: ownerId, restaurant_uid: pickedRestaurants[ownerId].id }))
+      );
+      setPickedRestaurants({});
+      setSelectedOwner(null);
+      setSelectedRestaurant('');
+      setRestaurantQuery('');
+      await loadData();
+      reportBulkResult('approved', result);
+    } catch (err: any) {
+      setError(err.response?.data?.detail || 'Failed to approve owners');
+    } finally {
+      setBulkBusy(false);
+    }
+  };
+
+  const handleBulkReject = async () => {
+    const ownerIds = Array.from(checkedOwners);
+    if (!confirm(`Are you sure you want to reject ${ownerIds.length} selected owner(s)?`)) return;
+
+    setError('');
+    setSuccess('');
+    setBulkBusy(true);
+    try {
+      const result = await adminService.bulkRejectOwners(ownerIds);
+      await loadData();
+      reportBulkResult('rejected', result);
+    } catch (err: any) {
+      setError(err.response?.data?.detail || 'Failed to reject owners');
+    } finally {
+      setBulkBusy(false);
+    }
+  };
+
+  // Tab badges come from the server-side counts; the loaded pages are only part of the list
+  const ownerCount = (approvalStatus?: OwnerApprovalStatus) => {
+    if (!stats) return null;
+    const counts = stats.owners_by_status;
+    return approvalStatus ? counts[approvalStatus] || 0 : Object.values(counts).reduce((a, b) => a + b, 0);
+  };
+
+  const countBadge = (count: number | null) =>
+    count === null ? null : <span className="ml-1 bg-white/50 px-1.5 py-0.5 rounded-full text-xs">{count}</span>;
 
   if (loading) {
     return (
@@ -103,7 +285,7 @@ const AdminDashboard = () => {
               filter === 'all' ? 'bg-secondary text-white shadow-sm' : 'text-gray-600 hover:bg-gray-50'
             }`}
           >
-            All <span className="ml-1 bg-white/50 px-1.5 py-0.5 rounded-full text-xs">{(owners || []).length}</span>
+            All {countBadge(ownerCount())}
           </button>
           <button
             onClick={() => setFilter('pending')}
@@ -111,7 +293,7 @@ const AdminDashboard = () => {
               filter === 'pending' ? 'bg-yellow-100 text-yellow-700 shadow-sm' : 'text-gray-600 hover:bg-gray-50'
             }`}
           >
-            Pending <span className="ml-1 bg-white/50 px-1.5 py-0.5 rounded-full text-xs">{(owners || []).filter((o) => o.approval_status === 'pending').length}</span>
+            Pending {countBadge(ownerCount('pending'))}
           </button>
           <button
             onClick={() => setFilter('approved')}
@@ -119,7 +301,7 @@ const AdminDashboard = () => {
               filter === 'approved' ? 'bg-brand-100 text-brand-700 shadow-sm' : 'text-gray-600 hover:bg-gray-50'
             }`}
           >
-            Approved <span className="ml-1 bg-white/50 px-1.5 py-0.5 rounded-full text-xs">{(owners || []).filter((o) => o.approval_status === 'approved').length}</span>
+            Approved {countBadge(ownerCount('approved'))}
           </button>
           <button
             onClick={() => setFilter('rejected')}
@@ -127,7 +309,7 @@ const AdminDashboard = () => {
               filter === 'rejected' ? 'bg-red-100 text-red-700 shadow-sm' : 'text-gray-600 hover:bg-gray-50'
             }`}
           >
-            Rejected <span className="ml-1 bg-white/50 px-1.5 py-0.5 rounded-full text-xs">{(owners || []).filter((o) => o.approval_status === 'rejected').length}</span>
+            Rejected {countBadge(ownerCount('rejected'))}
           </button>
         </div>
       </div>
@@ -146,12 +328,55 @@ const AdminDashboard = () => {
         </div>
       )}
 
+      <div className="mb-4">
+        <input
+          type="search"
+          value={search}
+          onChange={(e) => setSearch(e.target.value)}
+          placeholder="Search by name, email, phone or restaurant"
+          className="w-full md:w-96 px-4 py-2 rounded-lg border border-gray-200 bg-white transition-all duration-200 focus:outline-none focus:ring-4 focus:ring-accent focus:border-primary"
+        />
+      </div>
+
+      {checkedOwners.size > 0 && (
+        <div className="glass-panel rounded-lg px-4 py-3 mb-4 flex flex-wrap items-center gap-3">
+          <span className="text-sm font-medium text-gray-700">{checkedOwners.size} selected</span>
+          <button
+            onClick={handleBulkApprove}
+            disabled={bulkBusy}
+            className="text-primary hover:text-primary-dark bg-primary/10 hover:bg-primary/20 px-3 py-1.5 rounded-md text-sm font-medium transition-colors disabled:opacity-50"
+          >
+            Approve selected
+          </button>
+          <button
+            onClick={handleBulkReject}
+            disabled={bulkBusy}
+            className="text-red-600 hover:text-red-900 bg-red-50 hover:bg-red-100 px-3 py-1.5 rounded-md text-sm font-medium transition-colors disabled:opacity-50"
+          >
+            Reject selected
+          </button>
+          <button onClick={() => setCheckedOwners(new Set())} className="text-sm text-gray-500 hover:underline">
+            Clear
+          </button>
+          <span className="text-xs text-gray-400">Approving uses the restaurant picked in each owner's UID picker</span>
+        </div>
+      )}
+
       {/* Owners Table */}
       <div className="glass-panel shadow-xl rounded-2xl overflow-hidden">
         <div className="overflow-x-auto">
           <table className="min-w-full divide-y divide-gray-200">
             <thead className="bg-gray-50/50">
               <tr>
+                <th className="pl-6 py-4 text-left">
+                  <input
+                    type="checkbox"
+                    checked={allPendingChecked}
+                    onChange={toggleAllPending}
+                    disabled={pendingOwners.length === 0}
+                    aria-label="Select all pending owners"
+                  />
+                </th>
                 <th className="px-6 py-4 text-left text-xs font-semibold text-gray-500 uppercase tracking-wider">
                   Owner Details
                 </th>
@@ -170,19 +395,29 @@ const AdminDashboard = () => {
               </tr>
             </thead>
             <tbody className="divide-y divide-gray-100">
-              {filteredOwners.length === 0 ? (
+              {owners.length === 0 ? (
                 <tr>
-                  <td colSpan={5} className="px-6 py-12 text-center text-gray-500">
+                  <td colSpan={6} className="px-6 py-12 text-center text-gray-500">
                     <div className="flex flex-col items-center justify-center">
                       <svg className="w-12 h-12 text-gray-300 mb-3" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path strokeLinecap="round" strokeLinejoin="round" strokeWidth="2" d="M12 4.354a4 4 0 110 5.292M15 21H3v-1a6 6 0 0112 0v1zm0 0h6v-1a6 6 0 00-9-5.197M13 7a4 4 0 11-8 0 4 4 0 018 0z"></path></svg>
                       <p className="text-lg font-medium">No restaurant owners found</p>
-                      <p className="text-sm text-gray-400">Try changing the filter or check back later.</p>
+                      <p className="text-sm text-gray-400">Try changing the filter or search, or check back later.</p>
                     </div>
                   </td>
                 </tr>
               ) : (
-                filteredOwners.map((owner) => (
+                owners.map((owner) => (
                   <tr key={owner.id} className="hover:bg-primary/5 transition-colors">
+                    <td className="pl-6 py-4">
+                      {owner.approval_status === 'pending' && (
+                        <input
+                          type="checkbox"
+                          checked={checkedOwners.has(owner.id)}
+                          onChange={() => toggleChecked(owner.id)}
+                          aria-label={`Select ${owner.full_name}`}
+                        />
+                      )}
+                    </td>
                     <td className="px-6 py-4">
                       <div className="flex items-center">
                         <div className="h-10 w-10 rounded-full bg-primary flex items-center justify-center text-white font-bold text-lg shadow-sm">
@@ -223,19 +458,37 @@ const AdminDashboard = () => {
                       {owner.approval_status === 'pending' || !owner.restaurant_uid ? (
                         selectedOwner === owner.id ? (
                           <div className="flex items-center space-x-2">
-                            <select
-                              value={selectedRestaurant}
-                              onChange={(e) => setSelectedRestaurant(e.target.value)}
-                              className="text-sm w-full px-3 py-2 rounded-lg border border-gray-200 bg-gray-50 transition-all duration-200 focus:outline-none focus:ring-4 focus:ring-accent focus:border-primary"
-                              autoFocus
-                            >
-                              <option value="">Select Restaurant</option>
-                              {restaurants.map((restaurant) => (
-                                <option key={restaurant.id} value={restaurant.id}>
-                                  {restaurant.name}
-                                </option>
-                              ))}
-                            </select>
+                            <div className="relative w-full">
+                              <input
+                                type="search"
+                                value={restaurantQuery}
+                                onChange={(e) => {
+                                  setRestaurantQuery(e.target.value);
+                                  setSelectedRestaurant('');
+                                }}
+                                placeholder={selectedRestaurant ? 'Current restaurant (type to change)' : 'Search restaurants'}
+                                className="text-sm w-full px-3 py-2 rounded-lg border border-gray-200 bg-gray-50 transition-all duration-200 focus:outline-none focus:ring-4 focus:ring-accent focus:border-primary"
+                                autoFocus
+                              />
+                              {!selectedRestaurant && restaurantResults.length > 0 && (
+                                <ul className="absolute z-10 mt-1 w-full max-h-60 overflow-auto bg-white border border-gray-200 rounded-lg shadow-lg">
+                                  {restaurantResults.map((restaurant) => (
+                                    <li key={restaurant.id}>
+                                      <button
+                                        type="button"
+                                        onClick={() => pickRestaurant(owner.id, restaurant)}
+                                        className="w-full text-left px-3 py-2 text-sm hover:bg-primary/5"
+                                      >
+                                        <div className="font-medium text-gray-900">{restaurant.name}</div>
+                                        {restaurant.address && (
+                                          <div className="text-xs text-gray-500 truncate">{restaurant.address}</div>
+                                        )}
+                                      </button>
+                                    </li>
+                                  ))}
+                                </ul>
+                              )}
+                            </div>
                             <button 
                               onClick={() => setSelectedOwner(null)}
                               className="text-gray-400 hover:text-gray-600"
@@ -245,19 +498,16 @@ const AdminDashboard = () => {
                           </div>
                         ) : (
                           <button
-                            onClick={() => {
-                              setSelectedOwner(owner.id);
-                              setSelectedRestaurant(owner.restaurant_uid || '');
-                            }}
+                            onClick={() => openPicker(owner)}
                             className="text-primary hover:text-primary-dark text-sm font-medium hover:underline flex items-center"
                           >
                             <svg className="w-4 h-4 mr-1" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path strokeLinecap="round" strokeLinejoin="round" strokeWidth="2" d="M15.232 5.232l3.536 3.536m-2.036-5.036a2.5 2.5 0 113.536 3.536L6.5 21.036H3v-3.572L16.732 3.732z"></path></svg>
-                            {owner.restaurant_uid ? 'Change UID' : 'Assign UID'}
+                            {pickedRestaurants[owner.id]?.name || (owner.restaurant_uid ? 'Change UID' : 'Assign UID')}
                           </button>
                         )
                       ) : (
-                        <span className="text-sm text-gray-600 font-medium bg-gray-100 px-2 py-1 rounded">
-                          {restaurants.find((r) => r.id === owner.restaurant_uid)?.name || 'Assigned'}
+                        <span className="text-sm text-gray-600 font-medium bg-gray-100 px-2 py-1 rounded" title={owner.restaurant_uid}>
+                          Assigned
                         </span>
                       )}
                     </td>
@@ -271,7 +521,7 @@ const AdminDashboard = () => {
                                   handleApprove(owner.id, selectedRestaurant);
                                 } else {
                                   setError('Please select a restaurant first');
-                                  setSelectedOwner(owner.id);
+                                  openPicker(owner);
                                 }
                               }}
                               className="text-primary hover:text-primary-dark bg-primary/10 hover:bg-primary/20 px-3 py-1.5 rounded-md transition-colors"
@@ -292,7 +542,7 @@ const AdminDashboard = () => {
                               if (selectedOwner === owner.id && selectedRestaurant) {
                                 handleApprove(owner.id, selectedRestaurant);
                               } else {
-                                setSelectedOwner(owner.id);
+                                openPicker(owner);
                               }
                             }}
                             className="text-primary hover:text-primary-dark bg-primary/10 hover:bg-primary/20 px-3 py-1.5 rounded-md transition-colors"
@@ -308,6 +558,17 @@ const AdminDashboard = () => {
             </tbody>
           </table>
         </div>
+        {nextCursor && (
+          <div className="px-6 py-4 border-t border-gray-100 text-center">
+            <button
+              onClick={loadMoreOwners}
+              disabled={loadingMore}
+              className="text-primary hover:text-primary-dark bg-primary/10 hover:bg-primary/20 px-4 py-2 rounded-md text-sm font-medium transition-colors disabled:opacity-50"
+            >
+              {loadingMore ? 'Loading...' : 'Load more owners'}
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );
@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { earningsService } from '../../services/earnings';
+import { ownerService } from '../../services/owner';
 import { EarningsSummary, PendingEarnings } from '../../types/earnings.types';
 
 const EarningsDashboard: React.FC = () => {
@@ -19,8 +20,9 @@ const EarningsDashboard: React.FC = () => {
     setError('');
 
     try {
+      const startupSummary = ownerService.takeStartupEarnings();
       const [summaryData, transactionsData] = await Promise.all([
-        earningsService.getEarningsSummary(),
+        startupSummary ?? earningsService.getEarningsSummary(),
         earningsService.getEarningsTransactions(1, 0) // Just to get pending earnings
       ]);
 
@@ -2,7 +2,8 @@ import { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import { authService } from '../../services/auth';
 import { ordersService } from '../../services/orders';
-import { CumulativeItem, CustomerOrder } from '../../types/order.types';
+import { ownerService, OwnerStatus } from '../../services/owner';
+import { CumulativeItem, CustomerOrder, FetchOrdersResponse } from '../../types/order.types';
 import CumulativeView from './CumulativeView';
 import IndividualView from './IndividualView';
 
@@ -23,9 +24,8 @@ const OrdersPage = () => {
   const [autoRejectedTriggered, setAutoRejectedTriggered] = useState(false);
 
   useEffect(() => {
-    checkOwnerStatus();
-    // Try to restore orders from backend on page load
-    restoreOrders();
+    // Status and active orders (plus earnings/profile for those pages) in one request
+    loadDashboard();
   }, []);
 
   // Calculate time remaining based on fetched_at timestamp
@@ -63,20 +63,34 @@ const OrdersPage = () => {
     return () => clearInterval(timer);
   }, [hasOrders, fetchedAt, autoRejectedTriggered]);
 
+  const showActiveOrders = (response: FetchOrdersResponse) => {
+    if (response && response.individual_orders && response.individual_orders.length > 0) {
+      const fetchTime = response.individual_orders[0]?.fetched_at || new Date().toISOString();
+      setCumulativeItems(response.cumulative_orders || []);
+      setIndividualOrders(response.individual_orders || []);
+      setFetchedAt(fetchTime);
+      setHasOrders(true);
+    } else {
+      // No orders found, clear state
+      setHasOrders(false);
+      setFetchedAt(null);
+    }
+  };
+
+  const loadDashboard = async () => {
+    try {
+      // Close orders left pending past the 10-minute mark while the app was away
+      const dashboard = await ownerService.getDashboard(true);
+      checkOwnerStatus(dashboard.status);
+      showActiveOrders(dashboard.orders);
+    } catch (err) {
+      console.error('Failed to load dashboard:', err);
+    }
+  };
+
   const restoreOrders = async () => {
     try {
-      const response = await ordersService.fetchOrders();
-      if (response && response.individual_orders && response.individual_orders.length > 0) {
-        const fetchTime = response.individual_orders[0]?.fetched_at || new Date().toISOString();
-        setCumulativeItems(response.cumulative_orders || []);
-        setIndividualOrders(response.individual_orders || []);
-        setFetchedAt(fetchTime);
-        setHasOrders(true);
-      } else {
-        // No orders found, clear state
-        setHasOrders(false);
-        setFetchedAt(null);
-      }
+      showActiveOrders(await ordersService.fetchOrders());
     } catch (err) {
       console.error('Failed to restore orders:', err);
     }
@@ -100,15 +114,10 @@ const OrdersPage = () => {
     });
   };
 
-  const checkOwnerStatus = async () => {
-    try {
-      const status = await ordersService.getOwnerStatus();
-      console.log('Owner status:', status);
-      if (status.approval_status !== 'approved' || !status.restaurant_uid) {
-        setError('Your account is not fully approved or restaurant UID is not assigned.');
-      }
-    } catch (err: any) {
-      console.error('Status check error:', err);
+  const checkOwnerStatus = (status: OwnerStatus) => {
+    console.log('Owner status:', status);
+    if (status.approval_status !== 'approved' || !status.restaurant_uid) {
+      setError('Your account is not fully approved or restaurant UID is not assigned.');
     }
   };
 
@@ -40,7 +40,7 @@ const ProfilePage = () => {
 
   const loadProfile = async () => {
     try {
-      const data = await ownerService.getProfile();
+      const data = ownerService.takeStartupProfile() ?? await ownerService.getProfile();
       setProfileData({
         full_name: data.full_name || '',
         email: data.email || '',
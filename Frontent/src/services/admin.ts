@@ -1,19 +1,30 @@
 import { api } from './api';
-import { RestaurantOwner, Restaurant } from '../types/user.types';
+import { RestaurantOwner, Restaurant, AdminStats, BulkOwnerActionResult } from '../types/user.types';
+
+export type OwnerApprovalStatus = RestaurantOwner['approval_status'];
 
 export const adminService = {
-  // Get all pending owners
-  getPendingOwners: async (): Promise<{ pending_owners: RestaurantOwner[] }> => {
-    const response = await api.get('/admin/all-owners');
-    // Backend returns array directly, wrap it in object
-    return { pending_owners: response.data || [] };
+  // Get one page of owners (server-side search and status filter); pass next_cursor back to load the following page
+  getOwnersPage: async (
+    params: { cursor?: string; search?: string; approval_status?: OwnerApprovalStatus; limit?: number } = {}
+  ): Promise<{ owners: RestaurantOwner[]; next_cursor: string | null }> => {
+    const response = await api.get('/admin/all-owners', { params });
+    return {
+      owners: response.data || [],
+      next_cursor: response.headers['x-next-cursor'] || null,
+    };
   },
 
-  // Get all restaurants from DBA
-  getAllRestaurants: async (): Promise<{ restaurants: Restaurant[] }> => {
-    const response = await api.get('/admin/all-restaurants');
-    // Backend returns array directly, wrap it in object
-    return { restaurants: response.data || [] };
+  // Get aggregated dashboard counts
+  getStats: async (): Promise<AdminStats> => {
+    const response = await api.get('/admin/stats');
+    return response.data;
+  },
+
+  // Typeahead search over DBA restaurants (name, phone, address; tolerates typos)
+  searchRestaurants: async (q: string, limit = 20): Promise<Restaurant[]> => {
+    const response = await api.get('/admin/restaurants/search', { params: { q, limit } });
+    return response.data || [];
   },
 
   // Approve owner
@@ -27,4 +38,18 @@ export const adminService = {
     const response = await api.put(`/admin/reject-owner/${ownerId}`);
     return response.data;
   },
+
+  // Approve many owners at once; returns a result per owner
+  bulkApproveOwners: async (
+    owners: { owner_id: string; restaurant_uid: string }[]
+  ): Promise<BulkOwnerActionResult> => {
+    const response = await api.post('/admin/bulk-approve-owners', { owners });
+    return response.data;
+  },
+
+  // Reject many owners at once; returns a result per owner
+  bulkRejectOwners: async (ownerIds: string[]): Promise<BulkOwnerActionResult> => {
+    const response = await api.post('/admin/bulk-reject-owners', { owner_ids: ownerIds });
+    return response.data;
+  },
 };
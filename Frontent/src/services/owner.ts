@@ -1,4 +1,6 @@
 import { api } from './api';
+import { FetchOrdersResponse } from '../types/order.types';
+import { EarningsSummary } from '../types/earnings.types';
 
 interface UpdateBankDetailsData {
   bank_account_number?: string;
@@ -7,7 +9,7 @@ interface UpdateBankDetailsData {
   upi_id?: string;
 }
 
-interface ProfileData {
+export interface ProfileData {
   full_name: string;
   email: string;
   phone: string;
@@ -21,7 +23,49 @@ interface ProfileData {
   upi_id?: string;
 }
 
+export interface OwnerStatus {
+  approval_status: string;
+  restaurant_uid: string | null;
+  restaurant_name: string;
+  message: string;
+}
+
+export interface OwnerDashboard {
+  status: OwnerStatus;
+  orders: FetchOrdersResponse;
+  earnings: EarningsSummary;
+  profile: ProfileData;
+}
+
+// Earnings and profile pages opened shortly after start-up reuse the
+// dashboard's copy once instead of requesting it again
+const DASHBOARD_REUSE_MS = 60 * 1000;
+let startupParts: { earnings?: EarningsSummary; profile?: ProfileData; loadedAt: number } | null = null;
+
+const takeStartupPart = <K extends 'earnings' | 'profile'>(key: K): OwnerDashboard[K] | null => {
+  if (!startupParts || Date.now() - startupParts.loadedAt > DASHBOARD_REUSE_MS) {
+    return null;
+  }
+  const value = startupParts[key] as OwnerDashboard[K] | undefined;
+  delete startupParts[key];
+  return value ?? null;
+};
+
 export const ownerService = {
+  // Status, active orders, earnings summary and profile in one request (app start-up).
+  // The endpoint is read-only unless autoReject is set, in which case pending orders
+  // past the 10-minute mark are auto-rejected first, as fetch-orders does.
+  getDashboard: async (autoReject: boolean = false): Promise<OwnerDashboard> => {
+    const response = await api.get('/owner/dashboard', { params: { auto_reject: autoReject } });
+    const { earnings, profile } = response.data as OwnerDashboard;
+    startupParts = { earnings, profile, loadedAt: Date.now() };
+    return response.data;
+  },
+
+  takeStartupEarnings: (): EarningsSummary | null => takeStartupPart('earnings'),
+
+  takeStartupProfile: (): ProfileData | null => takeStartupPart('profile'),
+
   // Get complete profile data
   getProfile: async (): Promise<ProfileData> => {
     const response = await api.get('/owner/profile');
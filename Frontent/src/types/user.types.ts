@@ -54,3 +54,23 @@ export interface Restaurant {
   phone: string;
   email: string;
 }
+
+export interface BulkOwnerActionResult {
+  success: boolean;
+  processed_count: number;
+  failed_count: number;
+  results: { owner_id: string; success: boolean; message: string }[];
+}
+
+export interface AdminStats {
+  owners_by_status: Record<string, number>;
+  orders_ingested_today: number;
+  decisions_today: Record<string, number>;
+  pending_by_restaurant: {
+    restaurant_owner_id: string;
+    restaurant_name: string | null;
+    pending_orders: number;
+  }[];
+  since: string;
+  generated_at: string;
+}